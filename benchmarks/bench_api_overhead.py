@@ -0,0 +1,92 @@
+"""
+Mide el costo de armar el contenedor (clientes boto3 + grafos compilados), el
+overhead por request de POST /start-etl (solo encola el job) y el tiempo hasta que
+el job figura como terminado en GET /jobs/{id}.
+
+Uso (desde la raíz del repo):
+    python benchmarks/bench_api_overhead.py --requests 200
+"""
+import argparse
+import statistics
+import time
+
+import bench_env  # noqa: F401
+from fakes import build_fake_workflow
+
+from fastapi.testclient import TestClient
+
+from application.use_cases.etl_job_manager import EtlJobManager
+from infrastructure.bootstrap.container import build_workflow
+from presentation.controllers.http_controllers.fast_api_controller import app, get_jobs
+
+
+def _payload(documents: int) -> dict:
+    return {
+        "documents": [
+            {
+                "recordId": f"record-{i}",
+                "parentId": "parent",
+                "key": f"Polizas/doc-{i}.pdf",
+                "sessionId": "session",
+                "documentType": "POLICY",
+                "periodMonth": "Mayo",
+                "periodYear": "2024",
+            }
+            for i in range(documents)
+        ]
+    }
+
+
+def bench_startup(rounds: int) -> list[float]:
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        build_workflow()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def bench_requests(requests: int, documents: int) -> tuple[list[float], list[float]]:
+    jobs = EtlJobManager(build_fake_workflow())
+    app.dependency_overrides[get_jobs] = lambda: jobs
+    payload = _payload(documents)
+    submit_timings = []
+    done_timings = []
+    with TestClient(app) as client:
+        for _ in range(requests):
+            start = time.perf_counter()
+            response = client.post("/start-etl", json=payload)
+            submit_timings.append((time.perf_counter() - start) * 1000)
+            response.raise_for_status()
+            job_id = response.json()["jobId"]
+            while client.get(f"/jobs/{job_id}").json()["status"] not in ("COMPLETED", "FAILED"):
+                time.sleep(0.001)
+            done_timings.append((time.perf_counter() - start) * 1000)
+    app.dependency_overrides.clear()
+    return submit_timings, done_timings
+
+
+def _report(name: str, timings: list[float]) -> None:
+    ordered = sorted(timings)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    print(
+        f"{name:<28} n={len(timings):<5} mean={statistics.mean(timings):8.2f} ms "
+        f"p50={statistics.median(timings):8.2f} ms p99={p99:8.2f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--startup-rounds", type=int, default=5)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--documents", type=int, default=1)
+    args = parser.parse_args()
+
+    _report("build_workflow()", bench_startup(args.startup_rounds))
+    submit_timings, done_timings = bench_requests(args.requests, args.documents)
+    _report("POST /start-etl (submit)", submit_timings)
+    _report("job terminado", done_timings)
+
+
+if __name__ == "__main__":
+    main()
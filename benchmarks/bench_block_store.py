@@ -0,0 +1,84 @@
+"""
+Compara la memoria pico y el tiempo de reconstruir el texto por página a partir
+de las respuestas de Textract con el índice de dicts (versión anterior) y con el
+store columnar `TextractBlockStore`.
+
+Uso (desde la raíz del repo):
+    python benchmarks/bench_block_store.py --pages 300
+"""
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+
+import bench_env  # noqa: F401
+from textract_blocks import generate_blocks, paginate
+
+from infrastructure.adapters.extractors.textract.helpers.extract_async_helper import ExtractAsyncHelper
+from infrastructure.adapters.extractors.textract.helpers.textract_block_store import TextractBlockStore
+
+
+def _dict_pages(payloads: list[bytes]) -> list[str]:
+    # Versión anterior: todas las respuestas en memoria más un índice por Id
+    responses = [json.loads(payload) for payload in payloads]
+    blocks = [b for r in responses for b in r.get("Blocks", [])]
+    by_id = {b["Id"]: b for b in blocks}
+    texts = []
+    for page in (b for b in blocks if b.get("BlockType") == "PAGE"):
+        seen = {page["Id"]}
+        stack = [i for rel in page.get("Relationships", []) for i in rel.get("Ids", [])]
+        while stack:
+            bid = stack.pop()
+            if bid in seen or bid not in by_id:
+                continue
+            seen.add(bid)
+            stack.extend(i for rel in by_id[bid].get("Relationships", []) for i in rel.get("Ids", []))
+        texts.append("\n".join(by_id[i].get("Text", "") for i in seen if by_id[i].get("BlockType") == "LINE"))
+    return texts
+
+
+def _store_pages(payloads: list[bytes]) -> list[str]:
+    store = TextractBlockStore()
+    for payload in payloads:
+        # Igual que el extractor: cada respuesta se suelta después de volcarla
+        store.add_blocks(json.loads(payload)["Blocks"])
+    store.finalize()
+    return [
+        ExtractAsyncHelper.extract_page_text(ExtractAsyncHelper.page_closure_ids(page, store), store)["text"]
+        for page in store.page_indices()
+    ]
+
+
+def _measure(name: str, fn, payloads: list[bytes]) -> None:
+    started = time.perf_counter()
+    texts = fn(payloads)
+    elapsed = time.perf_counter() - started
+
+    gc.collect()
+    tracemalloc.start()
+    fn(payloads)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<6} páginas={len(texts)} tiempo={elapsed * 1000:.0f} ms pico={peak / 2**20:.1f} MiB")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=300)
+    parser.add_argument("--lines", type=int, default=40)
+    parser.add_argument("--words", type=int, default=8)
+    args = parser.parse_args()
+
+    responses = paginate(generate_blocks(args.pages, args.lines, args.words))
+    store = TextractBlockStore.from_responses(responses)
+    print(f"store: {len(store)} bloques, {store.nbytes() / 2**20:.1f} MiB en columnas")
+    # Las respuestas llegan serializadas, como desde la API, y se parsean al leerlas
+    payloads = [json.dumps(response).encode() for response in responses]
+    del responses, store
+    _measure("dicts", _dict_pages, payloads)
+    _measure("store", _store_pages, payloads)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,24 @@
+"""
+Prepara el entorno de los benchmarks: agrega `src/` al path y completa las
+variables de entorno mínimas para que `AppSettings` cargue sin un `.env` real.
+"""
+import os
+import sys
+
+SRC_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+if SRC_PATH not in sys.path:
+    sys.path.insert(0, SRC_PATH)
+
+_DEFAULT_ENV = {
+    "AWS_DEFAULT_REGION": "us-east-1",
+    "AWS_ACCESS_KEY_ID": "benchmark",
+    "AWS_SECRET_ACCESS_KEY": "benchmark",
+    "BUCKET_NAME": "benchmark-bucket",
+    "SUPERVISED_ITEMS_TABLE": "benchmark-table",
+    "NOTIFICATION_QUEUE_URL": "https://sqs.us-east-1.amazonaws.com/000000000000/benchmark",
+    "AWS_KAFKA_BOOTSTRAP_SERVERS": "localhost:9092",
+    "AWS_KAFKA_TOPIC": "benchmark",
+    "AWS_KAFKA_GROUP_ID": "benchmark",
+}
+for _key, _value in _DEFAULT_ENV.items():
+    os.environ.setdefault(_key, _value)
@@ -0,0 +1,134 @@
+"""
+Compara, por documento, el costo de las operaciones del camino caliente antes y
+después de evitar revalidaciones y copias de pydantic: construcción del hijo
+transformado, lectura del resultado del grafo y armado de la metadata de Dynamo.
+Reporta tiempo medio y pico de memoria (tracemalloc).
+
+Uso (desde la raíz del repo):
+    python benchmarks/bench_hot_path_allocations.py --iterations 20000
+"""
+import argparse
+import time
+import tracemalloc
+from typing import Any, Callable
+
+import bench_env  # noqa: F401
+
+from application.use_cases.workflows.workflow_base import WorkflowBase
+from domain.models.states.etl_inscripciones_state import (
+    EtlInscripcionChild,
+    EtlInscripcionesState,
+)
+from infrastructure.adapters.loaders.dynamo_loader_document import _CONTENT_FIELDS
+
+
+def _child() -> EtlInscripcionChild:
+    return EtlInscripcionChild(
+        record_id="record",
+        document_content_total_ref="ref-total",
+        document_content_llm_ref="ref-llm",
+        extract_success=True,
+    )
+
+
+def _item() -> EtlInscripcionChild:
+    return EtlInscripcionChild(
+        record_id="record",
+        inscription_number="00012345",
+        legal_name="Empresa S.A.C.",
+        inscription_date="2024-05-01",
+    )
+
+
+def _output_raw() -> dict[str, Any]:
+    children = [_child() for _ in range(20)]
+    return {
+        "record_id": "record",
+        "children_extracted": children,
+        "children_transformed": children,
+        "extract_success": True,
+        "transform_success": True,
+        "load_success": True,
+    }
+
+
+def _measure(operation: Callable[[], Any], iterations: int) -> tuple[float, int]:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        operation()
+    elapsed_us = (time.perf_counter() - start) / iterations * 1_000_000
+
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    operation()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed_us, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    child, item, output_raw = _child(), _item(), _output_raw()
+    loaded = child.model_copy(update={"document_content_total": "x" * 64 * 1024})
+
+    def transform_before() -> EtlInscripcionChild:
+        return EtlInscripcionChild(
+            **child.model_dump(
+                exclude={"inscription_number", "legal_name", "inscription_date", "transform_success"}
+            ),
+            inscription_number=item.inscription_number,
+            legal_name=item.legal_name,
+            inscription_date=item.inscription_date,
+            transform_success=True,
+        )
+
+    def transform_after() -> EtlInscripcionChild:
+        return child.model_copy(
+            update={
+                "inscription_number": item.inscription_number,
+                "legal_name": item.legal_name,
+                "inscription_date": item.inscription_date,
+                "transform_success": True,
+            }
+        )
+
+    def result_before() -> bool:
+        output = EtlInscripcionesState.model_validate(output_raw)
+        return output.transform_success and output.load_success and output.extract_success
+
+    def result_after() -> bool:
+        return WorkflowBase._succeeded(output_raw)
+
+    def metadata_before() -> dict[str, str]:
+        new_metadata = loaded.model_dump(mode="json", exclude_none=True)
+        for key, value in new_metadata.items():
+            new_metadata[key] = str(value)
+        return new_metadata
+
+    def metadata_after() -> dict[str, str]:
+        return {
+            key: str(value)
+            for key, value in loaded.model_dump(
+                mode="json", exclude_none=True, exclude=_CONTENT_FIELDS
+            ).items()
+        }
+
+    cases = (
+        ("transform", transform_before, transform_after),
+        ("resultado", result_before, result_after),
+        ("metadata", metadata_before, metadata_after),
+    )
+    for name, before, after in cases:
+        before_us, before_peak = _measure(before, args.iterations)
+        after_us, after_peak = _measure(after, args.iterations)
+        print(
+            f"{name:<10} antes={before_us:8.2f} us/{before_peak / 1024:8.1f} KB "
+            f"después={after_us:8.2f} us/{after_peak / 1024:8.1f} KB"
+        )
+
+
+if __name__ == "__main__":
+    main()
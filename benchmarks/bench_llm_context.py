@@ -0,0 +1,61 @@
+"""
+Compara el tamaño del contexto que recibe el LLM con solo las líneas de Textract
+y con el contenido estructurado (LAYOUT + tablas en markdown o TSV), además del
+tiempo de armarlo.
+
+Uso (desde la raíz del repo):
+    python benchmarks/bench_llm_context.py --pages 50 --rows 15
+"""
+import argparse
+import time
+
+import bench_env  # noqa: F401
+from textract_blocks import generate_structured_blocks, paginate
+
+from infrastructure.adapters.extractors.textract.helpers.extract_async_helper import ExtractAsyncHelper
+from infrastructure.adapters.extractors.textract.helpers.structured_content_helper import StructuredContentHelper
+from infrastructure.adapters.extractors.textract.helpers.textract_block_store import TextractBlockStore
+
+
+def _token_counter():
+    try:
+        import tiktoken
+    except ImportError:
+        # Aproximación habitual cuando tiktoken no está instalado
+        return lambda text: len(text) // 4
+    encoding = tiktoken.get_encoding("cl100k_base")
+    return lambda text: len(encoding.encode(text))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=50)
+    parser.add_argument("--paragraphs", type=int, default=3)
+    parser.add_argument("--tables", type=int, default=1)
+    parser.add_argument("--rows", type=int, default=15)
+    parser.add_argument("--columns", type=int, default=4)
+    args = parser.parse_args()
+
+    store = TextractBlockStore.from_responses(paginate(generate_structured_blocks(
+        args.pages, args.paragraphs, args.tables, args.rows, args.columns,
+    )))
+    closures = [ExtractAsyncHelper.page_closure_ids(page, store) for page in store.page_indices()]
+    count_tokens = _token_counter()
+
+    renderers = {
+        "text": lambda ids: ExtractAsyncHelper.extract_page_text(ids, store)["text"],
+        "markdown": lambda ids: StructuredContentHelper.render_page(ids, store, "markdown"),
+        "tsv": lambda ids: StructuredContentHelper.render_page(ids, store, "tsv"),
+    }
+    for name, render in renderers.items():
+        started = time.perf_counter()
+        content = "\n\n".join(render(ids) for ids in closures)
+        elapsed = time.perf_counter() - started
+        print(
+            f"{name:<8} caracteres={len(content):>8} tokens={count_tokens(content):>7} "
+            f"tiempo={elapsed * 1000:.0f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Compara la latencia de extraer un PDF digital con la capa de texto embebida
+(PdfTextExtractorDocument) contra pasar por Textract, simulado con la latencia
+típica de un job asíncrono (inicio + al menos un poll de 5 s). También mide el
+costo extra de revisar un PDF escaneado antes de delegarlo a Textract.
+
+Uso (desde la raíz del repo):
+    python benchmarks/bench_pdf_text.py --pages 30 --documents 20 --textract-latency 6
+"""
+import argparse
+import asyncio
+import io
+import statistics
+import time
+from typing import Any
+
+import bench_env  # noqa: F401
+from fakes import FakeExtractorDocument
+
+from domain.models.enums.document_type import DocumentType
+from domain.models.states.document_contract_state import DocumentContractState
+from infrastructure.adapters.extractors.pdf.pdf_text_extractor_document import PdfTextExtractorDocument
+
+_LINE = "La presente póliza cubre los riesgos descritos en las condiciones particulares"
+
+
+def build_pdf(pages: int, lines_per_page: int = 40, with_text: bool = True) -> bytes:
+    """PDF mínimo con una fuente estándar; sin texto simula un documento escaneado."""
+    objects: list[bytes] = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"",  # /Pages se completa al final
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    kids: list[int] = []
+    for page in range(pages):
+        if with_text:
+            body = "BT /F1 9 Tf 40 800 Td 11 TL " + " ".join(
+                f"({_LINE} {page + 1}.{line}) Tj T*" for line in range(lines_per_page)
+            ) + " ET"
+        else:
+            body = "q Q"
+        stream = body.encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id
+        )
+        kids.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % kid for kid in kids), pages
+    )
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n%s\nendobj\n" % (number, body))
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b"%010d 00000 n \n" % offset)
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    return out.getvalue()
+
+
+class _FakeBody:
+    def __init__(self, content: bytes):
+        self._content = content
+
+    def iter_chunks(self, chunk_size: int):
+        for start in range(0, len(self._content), chunk_size):
+            yield self._content[start:start + chunk_size]
+
+
+class FakeS3Client:
+    def __init__(self, objects: dict[str, bytes]):
+        self._objects = objects
+
+    def get_object(self, Bucket: str, Key: str) -> dict[str, Any]:
+        return {"Body": _FakeBody(self._objects[Key])}
+
+
+async def _run(extractor, documents: int, key: str) -> list[float]:
+    async def one(index: int) -> float:
+        document = DocumentContractState(
+            record_id=f"pdf-{index}", parent_id="bench", key=key, session_id="bench",
+            document_type=DocumentType.POLICY, period_month="Mayo", period_year="2024",
+        )
+        started = time.perf_counter()
+        await extractor.extract_pipeline(document_data=document, origin="polizas")
+        return time.perf_counter() - started
+
+    return list(await asyncio.gather(*(one(i) for i in range(documents))))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=30)
+    parser.add_argument("--documents", type=int, default=20)
+    parser.add_argument("--textract-latency", type=float, default=6.0)
+    args = parser.parse_args()
+
+    s3 = FakeS3Client({
+        "digital.pdf": build_pdf(args.pages),
+        "scanned.pdf": build_pdf(args.pages, with_text=False),
+    })
+    textract = FakeExtractorDocument(pages=args.pages, latency=args.textract_latency)
+    pdf_text = PdfTextExtractorDocument(textract, s3_client=s3)
+
+    scenarios = {
+        "textract (digital)": (textract, "digital.pdf"),
+        "pdf_text (digital)": (pdf_text, "digital.pdf"),
+        "pdf_text (escaneado)": (pdf_text, "scanned.pdf"),
+    }
+    for name, (extractor, key) in scenarios.items():
+        latencies = sorted(asyncio.run(_run(extractor, args.documents, key)))
+        print(
+            f"{name:<22} p50={statistics.median(latencies) * 1000:8.1f} ms "
+            f"max={latencies[-1] * 1000:8.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
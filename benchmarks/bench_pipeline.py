@@ -0,0 +1,98 @@
+"""
+Compara la ejecución secuencial por documento (un cupo por etapa) contra el
+pipeline por etapas, con latencias simuladas de Textract y Bedrock.
+
+Uso (desde la raíz del repo):
+    python benchmarks/bench_pipeline.py --documents 40 --extract-latency 0.2 --transform-latency 0.3
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import bench_env  # noqa: F401
+from fakes import (
+    FakeExtractorDocument,
+    FakeLoaderDocument,
+    FakeLoaderMetadata,
+    FakeNotification,
+    FakeTransformerDocument,
+)
+
+from application.use_cases.workflow_orchestator import WorkflowOrchestator
+from application.use_cases.workflows.stage_limits import StageLimits
+from domain.models.enums.document_type import DocumentType
+from domain.models.states.document_contract_state import DocumentContractState
+from infrastructure.adapters.content_stores.in_memory_content_store import InMemoryContentStore
+from infrastructure.adapters.telemetry.in_memory_telemetry import InMemoryTelemetry
+
+
+def _documents(count: int) -> list[DocumentContractState]:
+    return [
+        DocumentContractState(
+            record_id=f"record-{i}",
+            parent_id="parent",
+            key=f"Polizas/doc-{i}.pdf",
+            session_id="session",
+            document_type=DocumentType.POLICY,
+            period_month="Mayo",
+            period_year="2024",
+        )
+        for i in range(count)
+    ]
+
+
+async def _run(
+    limits: StageLimits, telemetry: InMemoryTelemetry, args: argparse.Namespace
+) -> tuple[float, int]:
+    orchestrator = WorkflowOrchestator(
+        FakeExtractorDocument(latency=args.extract_latency),
+        FakeTransformerDocument(latency=args.transform_latency),
+        FakeLoaderMetadata(),
+        FakeLoaderDocument(),
+        FakeNotification(),
+        InMemoryContentStore(),
+        stage_limits=limits,
+        telemetry=telemetry,
+    )
+    start = time.perf_counter()
+    results = await orchestrator.execute(DocumentType.POLICY, _documents(args.documents))
+    return time.perf_counter() - start, len(results)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--documents", type=int, default=40)
+    parser.add_argument("--extract-latency", type=float, default=0.2)
+    parser.add_argument("--transform-latency", type=float, default=0.3)
+    parser.add_argument("--extract-concurrency", type=int, default=4)
+    parser.add_argument("--transform-concurrency", type=int, default=4)
+    parser.add_argument("--load-concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    cases = (
+        ("secuencial", StageLimits(1, 1, 1, max_documents=1)),
+        (
+            "pipeline",
+            StageLimits(
+                args.extract_concurrency,
+                args.transform_concurrency,
+                args.load_concurrency,
+                max_documents=args.extract_concurrency + args.transform_concurrency + args.load_concurrency,
+            ),
+        ),
+    )
+    for name, limits in cases:
+        telemetry = InMemoryTelemetry()
+        elapsed, completed = await _run(limits, telemetry, args)
+        print(
+            f"{name:<11} documentos={completed}/{args.documents} "
+            f"tiempo={elapsed:.2f} s throughput={completed / elapsed:.1f} doc/s"
+        )
+        for stage in ("extract", "transform", "load"):
+            durations = telemetry.values("etl.stage.duration", stage=stage)
+            print(f"{'':<11} {stage:<9} p50={statistics.median(durations) * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,122 @@
+"""
+Reproduce documentos reales grabados (ETL_REPLAY_MODE=record) sin llamar a AWS:
+corre el extractor de Textract y el transformer de Bedrock sobre los fixtures,
+a la velocidad grabada o acelerada, y opcionalmente perfila con cProfile.
+
+Grabar (con credenciales, corriendo el worker o la API normalmente):
+    ETL_REPLAY_MODE=record ETL_REPLAY_FIXTURES_DIR=.fixtures python src/main.py worker
+
+Reproducir (desde la raíz del repo):
+    python benchmarks/bench_replay.py --fixtures .fixtures --origin polizas --speed 0 --profile
+"""
+import argparse
+import asyncio
+import cProfile
+import glob
+import gzip
+import json
+import os
+import pstats
+import statistics
+import time
+
+
+def _recorded_documents(fixtures_dir: str) -> list[str]:
+    keys = []
+    for path in sorted(glob.glob(os.path.join(fixtures_dir, "textract", "*.json.gz"))):
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            keys.append(json.load(f)["document_key"])
+    return keys
+
+
+async def _run(args: argparse.Namespace, document_keys: list[str]) -> list[float]:
+    from anyio import to_thread
+
+    from domain.models.enums.document_type import DocumentType
+    from domain.models.states.document_contract_state import DocumentContractState
+    from infrastructure.adapters.extractors.textract.textract_extractor_document import (
+        TextractExtractorDocument,
+    )
+    from infrastructure.adapters.replay.bedrock_replay import ReplayBedrockRuntimeClient
+    from infrastructure.adapters.replay.fixture_store import FixtureStore
+    from infrastructure.adapters.replay.textract_replay import ReplayTextractClient
+    from infrastructure.adapters.transformers.bed_rock_transformer_document import (
+        BedRockTransformerDocument,
+    )
+
+    store = FixtureStore(args.fixtures)
+    # Los fixtures solo cubren la API asíncrona de Textract
+    extractor = TextractExtractorDocument(
+        client=ReplayTextractClient(store, args.speed), triage=False, sync_api=False
+    )
+    transformer = (
+        None if args.extract_only
+        else BedRockTransformerDocument(client=ReplayBedrockRuntimeClient(store, args.speed))
+    )
+    llm_caller = getattr(transformer, f"llm_caller_{args.origin}", None)
+    sem = asyncio.Semaphore(args.concurrency)
+    latencies: list[float] = []
+
+    async def one(index: int, document_key: str) -> None:
+        document = DocumentContractState(
+            record_id=f"replay-{index}",
+            parent_id="replay",
+            key=document_key.split("/", 1)[1],
+            session_id="replay",
+            document_type=DocumentType.POLICY,
+            period_month="Mayo",
+            period_year="2024",
+        )
+        async with sem:
+            started = time.perf_counter()
+            items = await extractor.extract_pipeline(document_data=document, origin=args.origin)
+            if llm_caller is not None:
+                for item in items:
+                    await to_thread.run_sync(llm_caller, item.document_content_llm or "")
+            latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(one(i, key) for i, key in enumerate(document_keys)))
+    return latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fixtures", default=".fixtures")
+    parser.add_argument("--origin", choices=("polizas", "inscripciones", "tasaciones"), default="polizas")
+    parser.add_argument("--speed", type=float, default=0.0, help="1 = tiempos grabados, 0 = sin esperas")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=1, help="Veces que se reproduce cada documento")
+    parser.add_argument("--extract-only", action="store_true")
+    parser.add_argument("--profile", action="store_true")
+    args = parser.parse_args()
+
+    document_keys = _recorded_documents(args.fixtures) * args.repeat
+    if not document_keys:
+        raise SystemExit(f"No hay fixtures de textract en {args.fixtures}")
+    # El bucket del fixture tiene que coincidir con el que usa el extractor
+    os.environ["BUCKET_NAME"] = document_keys[0].split("/", 1)[0]
+
+    import bench_env  # noqa: F401
+
+    profiler = cProfile.Profile() if args.profile else None
+    start = time.perf_counter()
+    if profiler:
+        profiler.enable()
+    latencies = asyncio.run(_run(args, document_keys))
+    if profiler:
+        profiler.disable()
+    elapsed = time.perf_counter() - start
+
+    ordered = sorted(latencies)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    print(
+        f"documentos={len(latencies)} tiempo={elapsed:.2f} s "
+        f"throughput={len(latencies) / elapsed:.1f} doc/s "
+        f"p50={statistics.median(ordered) * 1000:.1f} ms p99={p99 * 1000:.1f} ms"
+    )
+    if profiler:
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(25)
+
+
+if __name__ == "__main__":
+    main()
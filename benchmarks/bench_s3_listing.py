@@ -0,0 +1,120 @@
+"""
+Mide el listado de un prefijo con años de carpetas mensuales ("Mayo 2023/", ...)
+contra un S3 simulado con latencia por página: listado serial (una carpeta a la
+vez), carpetas en paralelo y re-escaneo con la caché de listado ya poblada.
+
+Uso (desde la raíz del repo):
+    python benchmarks/bench_s3_listing.py --years 5 --objects 3000 --page-latency 0.08
+"""
+import argparse
+import bisect
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterator
+
+import bench_env  # noqa: F401
+
+from domain.models.enums.document_type import DocumentType
+from infrastructure.adapters.pollers.s3_listing_cache import S3ListingCache
+from infrastructure.adapters.pollers.s3_poller_document import S3PollerDocument
+
+_MONTHS = (
+    "Enero", "Febrero", "Marzo", "Abril", "Mayo", "Junio", "Julio",
+    "Agosto", "Septiembre", "Octubre", "Noviembre", "Diciembre",
+)
+_MAX_KEYS = 1000
+
+
+class _FakePaginator:
+    def __init__(self, keys: list[dict[str, Any]], latency: float):
+        self._keys = sorted(keys, key=lambda obj: obj["Key"])
+        self._names = [obj["Key"] for obj in self._keys]
+        self._latency = latency
+
+    def paginate(self, Bucket: str, Prefix: str, Delimiter: str | None = None) -> Iterator[dict[str, Any]]:
+        # Claves ordenadas, como en S3: el prefijo es un rango contiguo
+        start = bisect.bisect_left(self._names, Prefix)
+        end = bisect.bisect_left(self._names, Prefix + "\U0010ffff")
+        matching = self._keys[start:end]
+        if Delimiter:
+            folders = sorted({
+                Prefix + obj["Key"][len(Prefix):].split(Delimiter, 1)[0] + Delimiter
+                for obj in matching if Delimiter in obj["Key"][len(Prefix):]
+            })
+            files = [obj for obj in matching if Delimiter not in obj["Key"][len(Prefix):]]
+            time.sleep(self._latency)
+            yield {"CommonPrefixes": [{"Prefix": folder} for folder in folders], "Contents": files}
+            return
+        for start in range(0, max(len(matching), 1), _MAX_KEYS):
+            time.sleep(self._latency)
+            yield {"Contents": matching[start:start + _MAX_KEYS]}
+
+
+class FakeS3Client:
+    """list_objects_v2 paginado de 1000 en 1000, con `latency` segundos por página."""
+
+    def __init__(self, keys: list[dict[str, Any]], latency: float):
+        self._paginator = _FakePaginator(keys, latency)
+
+    def get_paginator(self, operation: str) -> _FakePaginator:
+        return self._paginator
+
+
+def build_keys(years: int, objects_per_month: int) -> list[dict[str, Any]]:
+    """Una carpeta por mes; un tercio de los objetos no son PDF (adjuntos, metadatos)."""
+    now = datetime.now(timezone.utc)
+    keys: list[dict[str, Any]] = []
+    for year in range(now.year - years, now.year):
+        for month_index, month in enumerate(_MONTHS):
+            modified = datetime(year, month_index + 1, 28, tzinfo=timezone.utc)
+            for n in range(objects_per_month):
+                extension = "json" if n % 3 == 0 else "pdf"
+                keys.append({"Key": f"Pólizas/{month} {year}/doc-{n}.{extension}", "LastModified": modified})
+    # Un mes con actividad reciente, que la caché vuelve a listar al vencer su vigencia
+    for n in range(objects_per_month):
+        keys.append({"Key": f"Pólizas/Enero {now.year}/doc-{n}.pdf", "LastModified": now - timedelta(hours=1)})
+    return keys
+
+
+def _scan(poller: S3PollerDocument) -> tuple[int, float]:
+    started = time.perf_counter()
+    count = sum(1 for _ in poller.iter_file_names("bucket", "Pólizas/", DocumentType.POLICY, "bench", "bench"))
+    return count, time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--objects", type=int, default=3000, help="Objetos por carpeta mensual")
+    parser.add_argument("--page-latency", type=float, default=0.08)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    s3 = FakeS3Client(build_keys(args.years, args.objects), args.page_latency)
+
+    serial = S3PollerDocument(s3_client=s3)
+    serial.settings = serial.settings.model_copy(update={"list_concurrency": 1})
+    parallel = S3PollerDocument(s3_client=s3)
+    parallel.settings = parallel.settings.model_copy(update={"list_concurrency": args.concurrency})
+
+    with tempfile.TemporaryDirectory() as directory:
+        # Vigencia 0: solo las carpetas estables (sin cambios en 30 días) salen de la caché
+        cache = S3ListingCache(os.path.join(directory, "listing.json"), ttl_seconds=0, stable_days=30)
+        cached = S3PollerDocument(s3_client=s3, listing_cache=cache)
+        cached.settings = parallel.settings
+
+        scenarios = {
+            "serial": serial,
+            f"paralelo x{args.concurrency}": parallel,
+            "caché (primer escaneo)": cached,
+            "caché (re-escaneo)": cached,
+        }
+        for name, poller in scenarios.items():
+            count, elapsed = _scan(poller)
+            print(f"{name:<24} {count:>8} documentos {elapsed:8.2f} s")
+
+
+if __name__ == "__main__":
+    main()
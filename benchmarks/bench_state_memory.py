@@ -0,0 +1,72 @@
+"""
+Mide la memoria de Python (tracemalloc) al procesar una inscripción grande con
+cada backend del almacén de contenido: el estado del grafo solo lleva handles y
+el texto de cada página vive en el almacén.
+
+Uso (desde la raíz del repo):
+    python benchmarks/bench_state_memory.py --pages 500
+"""
+import argparse
+import asyncio
+import tracemalloc
+
+import bench_env  # noqa: F401
+from fakes import (
+    FakeExtractorDocument,
+    FakeLoaderDocument,
+    FakeLoaderMetadata,
+    FakeTransformerDocument,
+)
+
+from application.ports.content_store_port import ContentStorePort
+from application.use_cases.workflows.workflow_inscripciones import WorkflowInscripciones
+from domain.models.enums.document_type import DocumentType
+from domain.models.states.document_contract_state import DocumentContractState
+from infrastructure.adapters.content_stores.in_memory_content_store import InMemoryContentStore
+from infrastructure.adapters.content_stores.temp_file_content_store import TempFileContentStore
+
+
+async def _run(store: ContentStorePort, pages: int, page_text: str) -> tuple[int, int, bool]:
+    workflow = WorkflowInscripciones(
+        FakeExtractorDocument(pages=pages, page_text=page_text),
+        FakeTransformerDocument(),
+        FakeLoaderMetadata(),
+        FakeLoaderDocument(),
+        store,
+    )
+    document = DocumentContractState(
+        record_id="record",
+        parent_id="parent",
+        key="Inscripciones/doc.pdf",
+        session_id="session",
+        document_type=DocumentType.REGISTRATION,
+        period_month="Mayo",
+        period_year="2024",
+    )
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    success = await workflow.execute(document)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current, peak, success
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=500)
+    parser.add_argument("--page-kb", type=int, default=4)
+    args = parser.parse_args()
+
+    page_text = ("x" * 79 + "\n") * (args.page_kb * 1024 // 80)
+    raw_mb = len(page_text) * args.pages / 1024 / 1024
+    print(f"pages={args.pages} texto total={raw_mb:.1f} MB")
+    for name, store in (("memory", InMemoryContentStore()), ("file", TempFileContentStore())):
+        current, peak, success = await _run(store, args.pages, page_text)
+        print(
+            f"{name:<8} ok={success} peak={peak / 1024 / 1024:8.1f} MB "
+            f"retenido={current / 1024 / 1024:8.1f} MB"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,279 @@
+"""
+Suite offline: corre el pipeline de punta a punta con los puertos fake (latencias
+y tasas de error configurables) y reporta docs/s, latencia p50/p99 por documento
+y el pico de RSS. Cada escenario corre en su propio proceso para que el pico de
+memoria no se mezcle entre escenarios.
+
+Escenarios:
+    polizas        WorkflowOrchestator.execute con documentos de pólizas
+    inscripciones  WorkflowOrchestator.execute con inscripciones de varias páginas
+    textract       Parseo de bloques del extractor real con respuestas sintéticas
+    kafka          KafkaEventController con un consumer en memoria
+
+Uso (desde la raíz del repo):
+    python benchmarks/bench_suite.py --documents 200 --save resultados.json
+    python benchmarks/bench_suite.py --baseline resultados.json --max-regression 0.15
+"""
+import argparse
+import asyncio
+import json
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any
+
+import bench_env  # noqa: F401
+from fakes import FakeBehavior, build_fake_workflow
+
+from application.use_cases.workflows.stage_limits import StageLimits
+from domain.models.enums.document_type import DocumentType
+from domain.models.states.document_contract_state import DocumentContractState
+from infrastructure.adapters.telemetry.in_memory_telemetry import InMemoryTelemetry
+
+SCENARIOS = ("polizas", "inscripciones", "textract", "kafka")
+
+
+def _behavior(latency: float, args: argparse.Namespace, seed: int) -> FakeBehavior:
+    return FakeBehavior(
+        latency=latency,
+        jitter=latency * args.jitter,
+        error_rate=args.error_rate,
+        seed=seed,
+    )
+
+
+def _fake_workflow(args: argparse.Namespace, telemetry: InMemoryTelemetry, pages: int):
+    return build_fake_workflow(
+        extract=_behavior(args.extract_latency, args, 1),
+        transform=_behavior(args.transform_latency, args, 2),
+        load=_behavior(args.load_latency, args, 3),
+        notify=_behavior(args.notify_latency, args, 4),
+        pages=pages,
+        stage_limits=StageLimits(
+            args.extract_concurrency,
+            args.transform_concurrency,
+            args.load_concurrency,
+            args.max_documents,
+        ),
+        telemetry=telemetry,
+    )
+
+
+def _documents(count: int, document_type: DocumentType) -> list[DocumentContractState]:
+    return [
+        DocumentContractState(
+            record_id=f"record-{i}",
+            parent_id="parent",
+            key=f"Documentos/doc-{i}.pdf",
+            session_id="session",
+            document_type=document_type,
+            period_month="Mayo",
+            period_year="2024",
+        )
+        for i in range(count)
+    ]
+
+
+def _report(
+    scenario: str, documents: int, completed: int, elapsed: float, latencies: list[float]
+) -> dict[str, Any]:
+    ordered = sorted(latencies)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] if ordered else 0.0
+    return {
+        "scenario": scenario,
+        "documents": documents,
+        "completed": completed,
+        "elapsed_s": round(elapsed, 3),
+        "docs_per_s": round(completed / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(statistics.median(ordered) * 1000, 2) if ordered else 0.0,
+        "p99_ms": round(p99 * 1000, 2),
+        # ru_maxrss está en KB en Linux
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+
+# ------------------------------ Escenarios ------------------------------
+async def _run_orchestrator(
+    scenario: str, document_type: DocumentType, pages: int, args: argparse.Namespace
+) -> dict[str, Any]:
+    telemetry = InMemoryTelemetry()
+    orchestrator = _fake_workflow(args, telemetry, pages)
+    start = time.perf_counter()
+    results = await orchestrator.execute(document_type, _documents(args.documents, document_type))
+    elapsed = time.perf_counter() - start
+    return _report(
+        scenario, args.documents, len(results), elapsed, telemetry.values("etl.document.duration")
+    )
+
+
+async def _run_textract(args: argparse.Namespace) -> dict[str, Any]:
+    from textract_blocks import FakeTextractClient
+    from infrastructure.adapters.extractors.textract.textract_extractor_document import (
+        TextractExtractorDocument,
+    )
+
+    # Sin triage ni API síncrona el extractor no toca S3: todo va por el job asíncrono
+    extractor = TextractExtractorDocument(
+        client=FakeTextractClient(pages=args.pages), triage=False, sync_api=False
+    )
+    documents = _documents(args.documents, DocumentType.POLICY)
+    sem = asyncio.Semaphore(args.extract_concurrency)
+    latencies: list[float] = []
+
+    async def one(document: DocumentContractState) -> bool:
+        async with sem:
+            started = time.perf_counter()
+            items = await extractor.extract_pipeline(document_data=document, origin="polizas")
+            latencies.append(time.perf_counter() - started)
+            return bool(items)
+
+    start = time.perf_counter()
+    outcomes = await asyncio.gather(*(one(document) for document in documents))
+    elapsed = time.perf_counter() - start
+    return _report("textract", args.documents, sum(outcomes), elapsed, latencies)
+
+
+async def _run_kafka(args: argparse.Namespace) -> dict[str, Any]:
+    from fake_kafka import FakeConsumer, FakeProducer
+    from presentation.controllers.event_controllers import kafka_event_controller
+    from presentation.controllers.event_controllers.kafka_event_controller import (
+        KafkaEventController,
+    )
+
+    telemetry = InMemoryTelemetry()
+    consumer = FakeConsumer(args.documents, partitions=args.partitions)
+
+    async def create_consumer(listener=None) -> FakeConsumer:
+        return consumer
+
+    async def create_dlq_producer() -> FakeProducer:
+        return FakeProducer()
+
+    # El controller arma su orquestador y su telemetría desde el contenedor
+    kafka_event_controller.build_workflow = lambda: _fake_workflow(args, telemetry, args.pages)
+    kafka_event_controller.get_telemetry = lambda: telemetry
+    KafkaEventController.create_consumer = staticmethod(create_consumer)
+    KafkaEventController.create_dlq_producer = staticmethod(create_dlq_producer)
+
+    controller = KafkaEventController(max_concurrency=args.max_documents)
+    start = time.perf_counter()
+    await controller.start()
+    while not consumer.fully_committed() and time.perf_counter() - start < args.timeout:
+        await asyncio.sleep(0.01)
+    elapsed = time.perf_counter() - start
+    await controller.stop()
+    return _report(
+        "kafka",
+        args.documents,
+        controller.metrics["processed"],
+        elapsed,
+        telemetry.values("etl.kafka.message.duration"),
+    )
+
+
+async def _run_scenario(scenario: str, args: argparse.Namespace) -> dict[str, Any]:
+    if scenario == "polizas":
+        return await _run_orchestrator(scenario, DocumentType.POLICY, args.pages, args)
+    if scenario == "inscripciones":
+        return await _run_orchestrator(scenario, DocumentType.REGISTRATION, args.pages, args)
+    if scenario == "textract":
+        return await _run_textract(args)
+    return await _run_kafka(args)
+
+
+# ------------------------------ Suite ------------------------------
+def _run_isolated(scenario: str, argv: list[str]) -> dict[str, Any]:
+    output = subprocess.run(
+        [sys.executable, __file__, *argv, "--scenario", scenario, "--json"],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def _regressions(
+    reports: list[dict[str, Any]], baseline: list[dict[str, Any]], max_regression: float
+) -> list[str]:
+    previous = {report["scenario"]: report for report in baseline}
+    found: list[str] = []
+    for report in reports:
+        before = previous.get(report["scenario"])
+        if before is None:
+            continue
+        if report["docs_per_s"] < before["docs_per_s"] * (1 - max_regression):
+            found.append(
+                f"{report['scenario']}: docs/s {before['docs_per_s']} -> {report['docs_per_s']}"
+            )
+        if report["p99_ms"] > before["p99_ms"] * (1 + max_regression):
+            found.append(f"{report['scenario']}: p99 {before['p99_ms']} -> {report['p99_ms']} ms")
+    return found
+
+
+def _parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", choices=SCENARIOS, action="append")
+    parser.add_argument("--documents", type=int, default=200)
+    parser.add_argument("--pages", type=int, default=5)
+    parser.add_argument("--partitions", type=int, default=4)
+    parser.add_argument("--extract-latency", type=float, default=0.05)
+    parser.add_argument("--transform-latency", type=float, default=0.08)
+    parser.add_argument("--load-latency", type=float, default=0.01)
+    parser.add_argument("--notify-latency", type=float, default=0.005)
+    parser.add_argument("--jitter", type=float, default=0.2, help="Desviación relativa a la latencia")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--extract-concurrency", type=int, default=4)
+    parser.add_argument("--transform-concurrency", type=int, default=4)
+    parser.add_argument("--load-concurrency", type=int, default=8)
+    parser.add_argument("--max-documents", type=int, default=16)
+    parser.add_argument("--timeout", type=float, default=300.0)
+    parser.add_argument("--json", action="store_true", help="Imprime el reporte como JSON")
+    parser.add_argument("--save", help="Guarda los reportes como línea base")
+    parser.add_argument("--baseline", help="Compara contra una línea base guardada")
+    parser.add_argument("--max-regression", type=float, default=0.15)
+    return parser.parse_args(argv)
+
+
+def main() -> None:
+    argv = sys.argv[1:]
+    args = _parse_args(argv)
+
+    if args.json:
+        # Modo proceso hijo: un solo escenario
+        report = asyncio.run(_run_scenario(args.scenario[0], args))
+        print(json.dumps(report))
+        return
+
+    scenarios = args.scenario or list(SCENARIOS)
+    child_argv = [
+        arg for arg in argv if arg not in scenarios and arg != "--scenario"
+    ]
+    for flag in ("--save", "--baseline"):
+        if flag in child_argv:
+            index = child_argv.index(flag)
+            del child_argv[index:index + 2]
+
+    reports = [_run_isolated(scenario, child_argv) for scenario in scenarios]
+    print(f"{'escenario':<14}{'docs':>8}{'ok':>8}{'docs/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'RSS MB':>9}")
+    for report in reports:
+        print(
+            f"{report['scenario']:<14}{report['documents']:>8}{report['completed']:>8}"
+            f"{report['docs_per_s']:>10}{report['p50_ms']:>10}{report['p99_ms']:>10}"
+            f"{report['peak_rss_mb']:>9}"
+        )
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(reports, f, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            found = _regressions(reports, json.load(f), args.max_regression)
+        if found:
+            print("Regresiones:\n  " + "\n  ".join(found))
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Consumer de Kafka en memoria con la interfaz que usa KafkaEventController
+(getmany, pause/resume, commit, stop), para correr el controller de punta a punta
+sin broker.
+"""
+import asyncio
+import json
+from dataclasses import dataclass
+from typing import Any
+
+from aiokafka import TopicPartition
+
+
+@dataclass
+class FakeRecord:
+    topic: str
+    partition: int
+    offset: int
+    key: bytes | None
+    value: bytes | None
+
+
+def document_message(index: int, document_type: str = "POLICY") -> bytes:
+    return json.dumps(
+        {
+            "recordId": f"record-{index}",
+            "parentId": "parent",
+            "key": f"Documentos/doc-{index}.pdf",
+            "sessionId": "session",
+            "documentType": document_type,
+            "periodMonth": "Mayo",
+            "periodYear": "2024",
+        }
+    ).encode("utf-8")
+
+
+class FakeConsumer:
+    def __init__(
+        self,
+        messages: int,
+        partitions: int = 4,
+        topic: str = "benchmark",
+        document_type: str = "POLICY",
+        invalid_every: int = 0,
+    ):
+        self._records: dict[TopicPartition, list[FakeRecord]] = {
+            TopicPartition(topic, p): [] for p in range(partitions)
+        }
+        tps = list(self._records)
+        for index in range(messages):
+            tp = tps[index % partitions]
+            records = self._records[tp]
+            value = (
+                b"{invalid"
+                if invalid_every and index % invalid_every == invalid_every - 1
+                else document_message(index, document_type)
+            )
+            records.append(FakeRecord(topic, tp.partition, len(records), None, value))
+        self._positions: dict[TopicPartition, int] = {tp: 0 for tp in tps}
+        self._paused: set[TopicPartition] = set()
+        self.committed: dict[TopicPartition, int] = {}
+        self.pauses = 0
+
+    @property
+    def end_offsets(self) -> dict[TopicPartition, int]:
+        return {tp: len(records) for tp, records in self._records.items() if records}
+
+    def fully_committed(self) -> bool:
+        return all(self.committed.get(tp) == end for tp, end in self.end_offsets.items())
+
+    async def getmany(self, timeout_ms: int = 0, max_records: int | None = None) -> dict[TopicPartition, list[FakeRecord]]:
+        batches: dict[TopicPartition, list[FakeRecord]] = {}
+        for tp, records in self._records.items():
+            if tp in self._paused:
+                continue
+            position = self._positions[tp]
+            batch = records[position:position + (max_records or len(records))]
+            if batch:
+                batches[tp] = batch
+                self._positions[tp] = position + len(batch)
+        if not batches:
+            await asyncio.sleep(min(timeout_ms, 10) / 1000)
+        else:
+            await asyncio.sleep(0)
+        return batches
+
+    def pause(self, *partitions: TopicPartition) -> None:
+        self.pauses += 1
+        self._paused.update(partitions)
+
+    def resume(self, *partitions: TopicPartition) -> None:
+        self._paused.difference_update(partitions)
+
+    async def commit(self, offsets: dict[TopicPartition, Any]) -> None:
+        self.committed.update(offsets)
+
+    async def stop(self) -> None:
+        return None
+
+
+class FakeProducer:
+    """Productor del DLQ en memoria: guarda los mensajes publicados."""
+
+    def __init__(self):
+        self.sent: list[tuple[str | None, bytes | None]] = []
+
+    async def send_and_wait(self, topic: str | None, value: bytes | None = None, **kwargs: Any) -> None:
+        self.sent.append((topic, value))
+
+    async def stop(self) -> None:
+        return None
@@ -0,0 +1,194 @@
+"""
+Implementaciones locales de los puertos para medir el pipeline sin AWS.
+
+Cada fake recibe un `FakeBehavior` con la latencia (media y dispersión) y la
+tasa de error de su servicio, para simular Textract, Bedrock, Dynamo, S3 y SQS.
+"""
+import asyncio
+import random
+import time
+from dataclasses import dataclass, field
+
+import bench_env  # noqa: F401
+
+from application.ports.extractor_document_port import ExtractorDocumentPort
+from application.ports.loader_document_port import LoaderDocumentPort
+from application.ports.loader_metadata_port import LoaderMetadataPort
+from application.ports.notification_port import NotificationPort
+from application.ports.telemetry_port import TelemetryPort
+from application.ports.transform_document_port import TransformDocumentPort
+from application.use_cases.workflow_orchestator import WorkflowOrchestator
+from application.use_cases.workflows.stage_limits import StageLimits
+from domain.models.notification import Notification
+from domain.models.states.document_contract_state import DocumentContractState
+from domain.models.states.etl_base_state import EtlBaseState
+from domain.models.states.etl_inscripciones_state import EtlInscripcionChild
+from domain.models.states.etl_polizas_state import EtlPolizasState
+from domain.models.states.etl_tasaciones_state import EtlTasacionesState
+from infrastructure.adapters.content_stores.in_memory_content_store import InMemoryContentStore
+
+
+class FakeServiceError(Exception):
+    """Error simulado de un servicio externo."""
+
+
+@dataclass
+class FakeBehavior:
+    """
+    latency: segundos medios por llamada; jitter: desviación estándar (normal,
+    truncada en 0); error_rate: probabilidad de que la llamada falle.
+    """
+
+    latency: float = 0.0
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    seed: int | None = None
+    _rng: random.Random = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self._rng = random.Random(self.seed)
+
+    def delay(self) -> float:
+        if not self.jitter:
+            return self.latency
+        return max(0.0, self._rng.gauss(self.latency, self.jitter))
+
+    def check(self, service: str) -> None:
+        if self.error_rate and self._rng.random() < self.error_rate:
+            raise FakeServiceError(f"Falla simulada de {service}")
+
+    async def wait(self, service: str) -> None:
+        seconds = self.delay()
+        if seconds:
+            await asyncio.sleep(seconds)
+        self.check(service)
+
+    def block(self, service: str) -> None:
+        # Bloqueante a propósito: los puertos síncronos se llaman desde worker threads
+        seconds = self.delay()
+        if seconds:
+            time.sleep(seconds)
+        self.check(service)
+
+
+class FakeExtractorDocument(ExtractorDocumentPort):
+    def __init__(
+        self,
+        pages: int = 5,
+        page_text: str = "Lorem ipsum dolor sit amet\n" * 40,
+        latency: float = 0.0,
+        behavior: FakeBehavior | None = None,
+    ):
+        self.pages = pages
+        self.page_text = page_text
+        self.behavior = behavior or FakeBehavior(latency=latency)
+
+    async def extract_pipeline(
+        self, document_data: DocumentContractState, origin: str, content: bytes | None = None
+    ) -> list[EtlBaseState]:
+        await self.behavior.wait("textract")
+        if origin == "inscripciones":
+            return [
+                EtlBaseState(
+                    record_id=document_data.record_id,
+                    extract_success=True,
+                    document_content_total=self.page_text,
+                    document_content_llm=self.page_text,
+                )
+                for _ in range(self.pages)
+            ]
+        text = "\n\n".join(self.page_text for _ in range(self.pages))
+        return [
+            EtlBaseState(
+                record_id=document_data.record_id,
+                extract_success=True,
+                document_content_total=text,
+                document_content_llm=text,
+            )
+        ]
+
+
+class FakeTransformerDocument(TransformDocumentPort):
+    def __init__(self, latency: float = 0.0, behavior: FakeBehavior | None = None):
+        self.behavior = behavior or FakeBehavior(latency=latency)
+
+    def llm_caller_polizas(self, context: str) -> EtlPolizasState | None:
+        self.behavior.block("bedrock")
+        return EtlPolizasState(
+            record_id="llm",
+            policy_number="P-0001",
+            policy_name="EMPRESA S.A.C.",
+            policy_start_date="01/01/2024",
+            policy_end_date="31/12/2024",
+        )
+
+    def llm_caller_inscripciones(self, context: str) -> EtlInscripcionChild | None:
+        self.behavior.block("bedrock")
+        return EtlInscripcionChild(
+            record_id="llm",
+            inscription_number="11223344",
+            legal_name="BANCO S.A.",
+            inscription_date="06/12/2021",
+        )
+
+    def llm_caller_tasaciones(self, context: str) -> EtlTasacionesState | None:
+        self.behavior.block("bedrock")
+        return EtlTasacionesState(
+            record_id="llm",
+            expert_warranty_name="ING. PERITO",
+            tasacion_date="01/02/2024",
+            commercial_value="100000",
+            realization_value="80000",
+            tasacion_owner="PROPIETARIO",
+        )
+
+
+class FakeLoaderMetadata(LoaderMetadataPort):
+    def __init__(self, behavior: FakeBehavior | None = None):
+        self.behavior = behavior or FakeBehavior()
+
+    def save_metadata(self, document_type: str, data: list[EtlBaseState]) -> None:
+        self.behavior.block("dynamodb")
+
+    def find_record_id(self, key: str) -> str | None:
+        self.behavior.block("dynamodb")
+        return f"record-{key}"
+
+
+class FakeLoaderDocument(LoaderDocumentPort):
+    def __init__(self, behavior: FakeBehavior | None = None):
+        self.behavior = behavior or FakeBehavior()
+
+    def save_document(self, key: str, data: bytes) -> None:
+        self.behavior.block("s3")
+
+
+class FakeNotification(NotificationPort):
+    def __init__(self, behavior: FakeBehavior | None = None):
+        self.behavior = behavior or FakeBehavior()
+        self.sent = 0
+
+    async def notify(self, messages: list[Notification]) -> None:
+        await self.behavior.wait("sqs")
+        self.sent += len(messages)
+
+
+def build_fake_workflow(
+    extract: FakeBehavior | None = None,
+    transform: FakeBehavior | None = None,
+    load: FakeBehavior | None = None,
+    notify: FakeBehavior | None = None,
+    pages: int = 5,
+    stage_limits: StageLimits | None = None,
+    telemetry: TelemetryPort | None = None,
+) -> WorkflowOrchestator:
+    return WorkflowOrchestator(
+        FakeExtractorDocument(pages=pages, behavior=extract),
+        FakeTransformerDocument(behavior=transform),
+        FakeLoaderMetadata(behavior=load),
+        FakeLoaderDocument(behavior=load),
+        FakeNotification(behavior=notify),
+        InMemoryContentStore(),
+        stage_limits=stage_limits,
+        telemetry=telemetry,
+    )
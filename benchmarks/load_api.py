@@ -0,0 +1,137 @@
+"""
+Prueba de carga de la API con los puertos reemplazados por fakes: levanta uvicorn
+en este proceso (con la misma configuración de `ApiSettings`) y dispara requests
+concurrentes a POST /start-etl. Cada request sigue su job por /jobs/{id}/events
+hasta que termina, así el throughput es de jobs completados y no solo aceptados;
+también se reporta la latencia del 202 por separado.
+
+Requiere httpx, dependencia solo de los benchmarks (benchmarks/requirements.txt).
+
+Uso (desde la raíz del repo):
+    pip install -r benchmarks/requirements.txt
+    python benchmarks/load_api.py --requests 2000 --concurrency 64
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+import bench_env  # noqa: F401
+from fakes import build_fake_workflow
+
+import httpx
+import uvicorn
+
+from infrastructure.config.app_settings import get_app_settings
+from presentation.controllers.http_controllers import fast_api_controller
+
+
+def _payload(documents: int) -> dict:
+    return {
+        "documents": [
+            {
+                "recordId": f"record-{i}",
+                "parentId": "parent",
+                "key": f"Polizas/doc-{i}.pdf",
+                "sessionId": "session",
+                "documentType": "POLICY",
+                "periodMonth": "Mayo",
+                "periodYear": "2024",
+            }
+            for i in range(documents)
+        ]
+    }
+
+
+async def _load(
+    base_url: str, requests: int, concurrency: int, documents: int
+) -> tuple[list[float], list[float], int, int]:
+    """Retorna (latencias del 202, latencias hasta el job terminado, jobs fallidos, rechazados con 429)."""
+    payload = _payload(documents)
+    accepted: list[float] = []
+    completed: list[float] = []
+    failed = 0
+    rejected = 0
+    sem = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=None) as client:
+        async def one() -> None:
+            nonlocal failed, rejected
+            async with sem:
+                start = time.perf_counter()
+                response = await client.post("/start-etl", json=payload)
+                if response.status_code == 429:
+                    rejected += 1
+                    return
+                accepted.append((time.perf_counter() - start) * 1000)
+                response.raise_for_status()
+                job_id = response.json()["jobId"]
+                # El stream se cierra cuando el job termina; el último evento trae su estado final
+                last = None
+                async with client.stream("GET", f"/jobs/{job_id}/events") as events:
+                    async for line in events.aiter_lines():
+                        if line.startswith("data: "):
+                            last = json.loads(line.removeprefix("data: "))
+                completed.append((time.perf_counter() - start) * 1000)
+                if last is None or last["status"] != "COMPLETED":
+                    failed += 1
+
+        await asyncio.gather(*(one() for _ in range(requests)))
+    return accepted, completed, failed, rejected
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--documents", type=int, default=1)
+    parser.add_argument("--port", type=int, default=9191)
+    args = parser.parse_args()
+
+    # El lifespan de la API arma el orquestador con los puertos fake
+    fast_api_controller.build_workflow = build_fake_workflow
+    api_settings = get_app_settings().api_settings
+    server = uvicorn.Server(
+        uvicorn.Config(
+            fast_api_controller.app,
+            host="127.0.0.1",
+            port=args.port,
+            loop="none",
+            http=api_settings.http,
+            timeout_keep_alive=api_settings.timeout_keep_alive,
+            backlog=api_settings.backlog,
+            log_level="warning",
+        )
+    )
+    server_task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+
+    start = time.perf_counter()
+    accepted, completed, failed, rejected = await _load(
+        f"http://127.0.0.1:{args.port}", args.requests, args.concurrency, args.documents
+    )
+    elapsed = time.perf_counter() - start
+
+    server.should_exit = True
+    await server_task
+
+    print(
+        f"jobs={len(completed)} fallidos={failed} rechazados={rejected} concurrency={args.concurrency} "
+        f"throughput={len(completed) / elapsed:.1f} jobs/s "
+        f"({len(completed) * args.documents / elapsed:.1f} docs/s)"
+    )
+    print(f"aceptado (202):  {_percentiles(accepted)}")
+    print(f"job terminado:   {_percentiles(completed)}")
+
+
+def _percentiles(timings: list[float]) -> str:
+    ordered = sorted(timings)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    return f"p50={statistics.median(ordered):.2f} ms p99={p99:.2f} ms"
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,165 @@
+"""
+Generador de respuestas sintéticas de Textract (GetDocumentAnalysis) con la
+forma real: bloques PAGE → LINE → WORD enlazados por Relationships y paginados
+con NextToken. `FakeTextractClient` reemplaza al cliente boto3 del extractor para
+medir el parseo de bloques sin llamar a AWS.
+"""
+import itertools
+import random
+from typing import Any
+
+_WORDS = (
+    "póliza", "número", "vigencia", "desde", "hasta", "contratante", "razón",
+    "social", "inscripción", "partida", "registral", "tasación", "perito",
+    "valor", "comercial", "realización", "soles", "fecha", "S.A.C.", "2024",
+)
+
+
+def _geometry(rng: random.Random) -> dict[str, Any]:
+    left, top = rng.random() * 0.8, rng.random() * 0.9
+    width, height = rng.random() * 0.2, 0.01
+    return {
+        "BoundingBox": {"Width": width, "Height": height, "Left": left, "Top": top},
+        "Polygon": [
+            {"X": left, "Y": top},
+            {"X": left + width, "Y": top},
+            {"X": left + width, "Y": top + height},
+            {"X": left, "Y": top + height},
+        ],
+    }
+
+
+def generate_blocks(
+    pages: int,
+    lines_per_page: int = 40,
+    words_per_line: int = 8,
+    seed: int = 0,
+) -> list[dict[str, Any]]:
+    """Bloques de un documento completo, en el orden en que los entrega Textract."""
+    rng = random.Random(seed)
+    ids = (f"b-{n}" for n in itertools.count())
+    blocks: list[dict[str, Any]] = []
+    for page_number in range(1, pages + 1):
+        page = {"Id": next(ids), "BlockType": "PAGE", "Page": page_number}
+        blocks.append(page)
+        line_ids: list[str] = []
+        for _ in range(lines_per_page):
+            words = [
+                {
+                    "Id": next(ids),
+                    "BlockType": "WORD",
+                    "Page": page_number,
+                    "Text": rng.choice(_WORDS),
+                    "Confidence": 99.0,
+                    "Geometry": _geometry(rng),
+                }
+                for _ in range(words_per_line)
+            ]
+            line = {
+                "Id": next(ids),
+                "BlockType": "LINE",
+                "Page": page_number,
+                "Text": " ".join(word["Text"] for word in words),
+                "Confidence": 99.0,
+                "Geometry": _geometry(rng),
+                "Relationships": [{"Type": "CHILD", "Ids": [word["Id"] for word in words]}],
+            }
+            line_ids.append(line["Id"])
+            blocks.append(line)
+            blocks.extend(words)
+        page["Relationships"] = [{"Type": "CHILD", "Ids": line_ids}]
+    return blocks
+
+
+def generate_structured_blocks(
+    pages: int,
+    paragraphs: int = 3,
+    tables_per_page: int = 1,
+    rows: int = 10,
+    columns: int = 4,
+    seed: int = 0,
+) -> list[dict[str, Any]]:
+    """
+    Documento con la salida de TABLES y LAYOUT: cabecera, título, párrafos, una
+    tabla por LAYOUT_TABLE (con una celda combinada en la primera columna) y
+    número de página. Textract entrega una LINE por celda, como en los PDFs reales.
+    """
+    rng = random.Random(seed)
+    ids = (f"s-{n}" for n in itertools.count())
+    blocks: list[dict[str, Any]] = []
+
+    def block(kind: str, page_number: int, **fields: Any) -> dict[str, Any]:
+        item = {"Id": next(ids), "BlockType": kind, "Page": page_number, "Geometry": _geometry(rng), **fields}
+        blocks.append(item)
+        return item
+
+    def line(page_number: int, words: int) -> dict[str, Any]:
+        line_block = block("LINE", page_number)
+        word_blocks = [block("WORD", page_number, Text=rng.choice(_WORDS)) for _ in range(words)]
+        line_block["Text"] = " ".join(word["Text"] for word in word_blocks)
+        line_block["Relationships"] = [{"Type": "CHILD", "Ids": [word["Id"] for word in word_blocks]}]
+        return line_block
+
+    def layout(kind: str, page_number: int, lines: list[dict[str, Any]]) -> dict[str, Any]:
+        return block(kind, page_number, Relationships=[{"Type": "CHILD", "Ids": [item["Id"] for item in lines]}])
+
+    for page_number in range(1, pages + 1):
+        page = block("PAGE", page_number)
+        children: list[str] = []
+        children.append(layout("LAYOUT_HEADER", page_number, [line(page_number, 6)])["Id"])
+        children.append(layout("LAYOUT_TITLE", page_number, [line(page_number, 4)])["Id"])
+        for _ in range(paragraphs):
+            children.append(layout("LAYOUT_TEXT", page_number, [line(page_number, 10) for _ in range(4)])["Id"])
+        for _ in range(tables_per_page):
+            cells: list[dict[str, Any]] = []
+            cell_lines: list[dict[str, Any]] = []
+            for row in range(1, rows + 1):
+                for column in range(1, columns + 1):
+                    cell_line = line(page_number, rng.randint(1, 2))
+                    cell_lines.append(cell_line)
+                    cells.append(block(
+                        "CELL", page_number, RowIndex=row, ColumnIndex=column, RowSpan=1, ColumnSpan=1,
+                        EntityTypes=["COLUMN_HEADER"] if row == 1 else [],
+                        Relationships=[{"Type": "CHILD", "Ids": cell_line["Relationships"][0]["Ids"]}],
+                    ))
+            table_layout = layout("LAYOUT_TABLE", page_number, cell_lines)
+            table_layout["Geometry"] = {"BoundingBox": {"Left": 0.0, "Top": 0.0, "Width": 1.0, "Height": 1.0}}
+            merged = block(
+                "MERGED_CELL", page_number, RowIndex=2, ColumnIndex=1, RowSpan=2, ColumnSpan=1,
+                Relationships=[{"Type": "CHILD", "Ids": [cells[columns]["Id"], cells[2 * columns]["Id"]]}],
+            )
+            table = block("TABLE", page_number, Relationships=[
+                {"Type": "CHILD", "Ids": [cell["Id"] for cell in cells]},
+                {"Type": "MERGED_CELL", "Ids": [merged["Id"]]},
+            ])
+            children.extend((table_layout["Id"], table["Id"]))
+        children.append(layout("LAYOUT_PAGE_NUMBER", page_number, [line(page_number, 1)])["Id"])
+        page["Relationships"] = [{"Type": "CHILD", "Ids": children}]
+    return blocks
+
+
+def paginate(blocks: list[dict[str, Any]], max_results: int = 1000) -> list[dict[str, Any]]:
+    """Parte los bloques en respuestas de GetDocumentAnalysis enlazadas con NextToken."""
+    responses: list[dict[str, Any]] = []
+    for start in range(0, max(len(blocks), 1), max_results):
+        responses.append({"JobStatus": "SUCCEEDED", "Blocks": blocks[start:start + max_results]})
+    for index, response in enumerate(responses[:-1]):
+        response["NextToken"] = str(index + 1)
+    return responses
+
+
+class FakeTextractClient:
+    """Responde start/get_document_analysis con un documento sintético ya terminado."""
+
+    def __init__(self, pages: int = 5, lines_per_page: int = 40, words_per_line: int = 8):
+        self._responses = paginate(generate_blocks(pages, lines_per_page, words_per_line))
+
+    def start_document_analysis(self, **kwargs: Any) -> dict[str, Any]:
+        return {"JobId": "fake-job"}
+
+    def get_document_analysis(self, JobId: str, NextToken: str | None = None) -> dict[str, Any]:
+        return self._responses[int(NextToken) if NextToken else 0]
+
+    # Perfiles sin features (solo texto) usan la detección de texto
+    start_document_text_detection = start_document_analysis
+    get_document_text_detection = get_document_analysis
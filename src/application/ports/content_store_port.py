@@ -0,0 +1,30 @@
+from abc import ABC, abstractmethod
+
+
+class ContentStorePort(ABC):
+    """Guarda el texto de los documentos fuera del estado del grafo; el estado solo lleva el handle."""
+
+    @property
+    def durable(self) -> bool:
+        """True si los handles siguen siendo válidos después de reiniciar el proceso."""
+        return False
+
+    @abstractmethod
+    def put(self, text: str) -> str:
+        ...
+
+    @abstractmethod
+    def read(self, handle: str) -> str:
+        ...
+
+    @abstractmethod
+    def read_bytes(self, handle: str) -> bytes:
+        ...
+
+    @abstractmethod
+    def exists(self, handle: str) -> bool:
+        ...
+
+    @abstractmethod
+    def delete(self, handle: str) -> None:
+        ...
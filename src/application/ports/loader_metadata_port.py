@@ -6,3 +6,8 @@ class LoaderMetadataPort(ABC):
     @abstractmethod
     def save_metadata(self, document_type: str, data: list[EtlBaseState]) -> None:
         ...
+
+    @abstractmethod
+    def find_record_id(self, key: str) -> str | None:
+        """record_id del registro existente para la clave S3 del documento, o None si no hay."""
+        ...
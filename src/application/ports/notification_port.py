@@ -1,8 +1,18 @@
 from abc import ABC, abstractmethod
 from domain.models.notification import Notification
 
+class NotificationDeliveryError(Exception):
+    """Parte de las notificaciones no se entregó; `failed_ids` son los Notification.id pendientes."""
+
+    def __init__(self, failed_ids: set[str], reason: str):
+        super().__init__(f"{len(failed_ids)} notificaciones sin entregar: {reason}")
+        self.failed_ids = failed_ids
+
+
 class NotificationPort(ABC):
     @abstractmethod
-    def notify(self, messages: list[Notification]) -> None:
+    async def notify(self, messages: list[Notification]) -> None:
         ...
-    
\ No newline at end of file
+
+    async def aclose(self) -> None:
+        """Despacha lo pendiente y libera el recurso subyacente; por defecto no hace nada."""
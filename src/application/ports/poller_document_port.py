@@ -1,10 +1,30 @@
 from abc import ABC, abstractmethod
+from typing import Iterator
 
+from domain.models.enums.document_type import DocumentType
 from domain.models.states.document_contract_state import DocumentContractState
 
 
 class PollerDocumentPort(ABC):
     @abstractmethod
-    def get_file_names(self, bucket_name: str, prefix_path: str, document_type: str = "pdf",
-                       position: int | None = None) -> list[DocumentContractState]:
+    def iter_file_names(self, bucket_name: str, prefix_path: str, flow: DocumentType,
+                        session_id: str, parent_id: str,
+                        document_type: str = "pdf") -> Iterator[DocumentContractState]:
+        """
+        Recorre los documentos del prefijo a medida que se listan, sin armar la
+        lista completa en memoria. `document_type` es la extensión a buscar.
+        """
         ...
+
+    def get_file_names(self, bucket_name: str, prefix_path: str, flow: DocumentType,
+                       session_id: str, parent_id: str, document_type: str = "pdf",
+                       position: int | None = None) -> list[DocumentContractState]:
+        # El listado puede llegar en cualquier orden; se ordena por clave, como lo entrega S3,
+        # para que `position` siempre apunte al mismo documento
+        documents = sorted(
+            self.iter_file_names(bucket_name, prefix_path, flow, session_id, parent_id, document_type),
+            key=lambda document: document.key,
+        )
+        if position is not None:
+            return documents[position:position + 1]
+        return documents
@@ -0,0 +1,16 @@
+from abc import ABC, abstractmethod
+
+
+class ProcessedManifestPort(ABC):
+    """Registro de las claves de documentos ya procesados, para que un backfill no los repita."""
+
+    @abstractmethod
+    def contains(self, key: str) -> bool:
+        ...
+
+    @abstractmethod
+    def add(self, key: str) -> None:
+        ...
+
+    def close(self) -> None:
+        """Libera el recurso subyacente; por defecto no hace nada."""
@@ -0,0 +1,65 @@
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager, nullcontext
+from typing import ContextManager, Iterator, Mapping
+
+Attributes = Mapping[str, str]
+
+
+class TelemetryPort(ABC):
+    """
+    Métricas y trazas del pipeline. Los nombres siguen la convención
+    `etl.<componente>.<medida>` y las duraciones se registran en segundos.
+    """
+
+    @abstractmethod
+    def record(self, name: str, value: float, attributes: Attributes | None = None) -> None:
+        """Registra un valor en un histograma (duraciones, tokens)."""
+        ...
+
+    @abstractmethod
+    def increment(self, name: str, value: int = 1, attributes: Attributes | None = None) -> None:
+        """Suma a un contador monotónico (reintentos, errores)."""
+        ...
+
+    @abstractmethod
+    def adjust(self, name: str, delta: int, attributes: Attributes | None = None) -> None:
+        """Suma o resta a un contador que sube y baja (en vuelo, profundidad de colas)."""
+        ...
+
+    @abstractmethod
+    def span(self, name: str, attributes: Attributes | None = None) -> ContextManager[None]:
+        ...
+
+    @contextmanager
+    def timer(self, name: str, attributes: Attributes | None = None) -> Iterator[None]:
+        """
+        Mide un bloque: registra `<name>.duration`, mantiene `<name>.in_flight` y
+        cuenta `<name>.errors` si el bloque termina con una excepción.
+        """
+        self.adjust(f"{name}.in_flight", 1, attributes)
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            self.increment(f"{name}.errors", 1, attributes)
+            raise
+        finally:
+            self.record(f"{name}.duration", time.perf_counter() - start, attributes)
+            self.adjust(f"{name}.in_flight", -1, attributes)
+
+
+class NullTelemetry(TelemetryPort):
+    """Implementación vacía para cuando la telemetría está deshabilitada."""
+
+    def record(self, name: str, value: float, attributes: Attributes | None = None) -> None:
+        return None
+
+    def increment(self, name: str, value: int = 1, attributes: Attributes | None = None) -> None:
+        return None
+
+    def adjust(self, name: str, delta: int, attributes: Attributes | None = None) -> None:
+        return None
+
+    def span(self, name: str, attributes: Attributes | None = None) -> ContextManager[None]:
+        return nullcontext()
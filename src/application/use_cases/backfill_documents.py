@@ -0,0 +1,142 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Iterator
+
+import anyio
+
+from application.ports.loader_metadata_port import LoaderMetadataPort
+from application.ports.poller_document_port import PollerDocumentPort
+from application.ports.processed_manifest_port import ProcessedManifestPort
+from application.use_cases.workflow_orchestator import WorkflowOrchestator
+from domain.models.enums.document_type import DocumentType
+from domain.models.states.document_contract_state import DocumentContractState
+
+
+@dataclass
+class BackfillReport:
+    discovered: int = 0
+    skipped: int = 0
+    unmatched: int = 0
+    succeeded: int = 0
+    failed: int = 0
+
+
+class BackfillDocuments:
+    """
+    Reprocesa documentos históricos directamente desde el bucket, sin mensajes de
+    Kafka: el poller lista el prefijo como generador, se descartan las claves que
+    ya están en el manifiesto y los documentos pasan al orquestador en lotes.
+
+    Se mantienen `concurrent_batches` lotes en vuelo para que el pipeline no se
+    vacíe mientras termina la cola de un lote; la concurrencia real por etapa la
+    siguen limitando los StageLimits del orquestador. Cada documento se agrega al
+    manifiesto recién cuando el orquestador confirma su resultado: cargado y, si
+    `notify`, notificado.
+
+    La carga actualiza un registro supervisado que ya debe existir: antes de
+    procesar, el record_id de cada documento se resuelve desde su clave S3 y los
+    que no tienen registro se omiten (sin pagar Textract ni Bedrock). No quedan en
+    el manifiesto, así que una nueva corrida los vuelve a buscar.
+
+    Por defecto no se envían notificaciones: el backfill no parte de un mensaje del
+    servicio que consume insert-metadata.
+    """
+
+    def __init__(
+        self,
+        poller: PollerDocumentPort,
+        orchestrator: WorkflowOrchestator,
+        manifest: ProcessedManifestPort,
+        records: LoaderMetadataPort,
+        batch_size: int = 50,
+        concurrent_batches: int = 2,
+    ):
+        self.logger = logging.getLogger("app.workflows")
+        self._poller = poller
+        self._orchestrator = orchestrator
+        self._manifest = manifest
+        self._records = records
+        self._batch_size = max(1, batch_size)
+        self._concurrent_batches = max(1, concurrent_batches)
+
+    async def run(
+        self,
+        bucket_name: str,
+        prefix_path: str,
+        flow: DocumentType,
+        session_id: str,
+        parent_id: str,
+        limit: int | None = None,
+        notify: bool = False,
+    ) -> BackfillReport:
+        report = BackfillReport()
+        documents = self._poller.iter_file_names(bucket_name, prefix_path, flow, session_id, parent_id)
+        in_flight = asyncio.Semaphore(self._concurrent_batches)
+        tasks: set[asyncio.Task] = set()
+
+        async def on_result(document: DocumentContractState, success: bool) -> None:
+            if success:
+                report.succeeded += 1
+                self._manifest.add(document.key)
+            else:
+                report.failed += 1
+
+        async def run_batch(batch: list[DocumentContractState]) -> None:
+            try:
+                await self._orchestrator.execute(flow, batch, on_result=on_result, notify=notify)
+            finally:
+                in_flight.release()
+
+        while limit is None or report.discovered < limit:
+            remaining = self._batch_size if limit is None else min(self._batch_size, limit - report.discovered)
+            # El listado es boto3 bloqueante: cada lote se arma en un hilo
+            batch, skipped, unmatched = await anyio.to_thread.run_sync(
+                self._next_batch, documents, remaining
+            )
+            report.skipped += skipped
+            report.unmatched += unmatched
+            if not batch:
+                break
+            report.discovered += len(batch)
+            self.logger.info(
+                "Backfill: lote de %d documentos (%d descubiertos, %d ya procesados, %d sin registro)",
+                len(batch), report.discovered, report.skipped, report.unmatched,
+            )
+            await in_flight.acquire()
+            task = asyncio.create_task(run_batch(batch))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+        if tasks:
+            await asyncio.gather(*tasks)
+        self.logger.info(
+            "Backfill terminado: %d descubiertos, %d omitidos, %d sin registro, %d cargados, %d fallidos",
+            report.discovered, report.skipped, report.unmatched, report.succeeded, report.failed,
+        )
+        return report
+
+    async def aclose(self) -> None:
+        self._manifest.close()
+        await self._orchestrator.aclose()
+
+    def _next_batch(
+        self, documents: Iterator[DocumentContractState], size: int
+    ) -> tuple[list[DocumentContractState], int, int]:
+        """Retorna (lote con el record_id real, ya procesados, sin registro)."""
+        batch: list[DocumentContractState] = []
+        skipped = 0
+        unmatched = 0
+        for document in documents:
+            if self._manifest.contains(document.key):
+                skipped += 1
+                continue
+            record_id = self._records.find_record_id(document.key)
+            if record_id is None:
+                unmatched += 1
+                self.logger.warning("Backfill: %s no tiene registro supervisado, se omite", document.key)
+                continue
+            batch.append(document.model_copy(update={"record_id": record_id}))
+            if len(batch) >= size:
+                break
+        return batch, skipped, unmatched
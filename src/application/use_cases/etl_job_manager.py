@@ -0,0 +1,212 @@
+import asyncio
+import logging
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import AsyncIterator
+
+from application.use_cases.workflow_orchestator import WorkflowOrchestator
+from domain.models.enums.document_type import DocumentType
+from domain.models.enums.job_status import JobStatus
+from domain.models.etl_job import EtlJob, EtlJobDocument
+from domain.models.states.document_contract_state import DocumentContractState
+
+
+class JobQueueFullError(Exception):
+    """La cola de jobs está llena; el cliente debe reintentar más tarde."""
+
+
+class JobManagerClosedError(Exception):
+    """El servicio se está deteniendo y no acepta jobs nuevos."""
+
+
+class EtlJobManager:
+    """
+    Ejecuta lotes de documentos como jobs en segundo plano.
+
+    `submit` registra el job y retorna de inmediato; un número fijo de workers
+    (max_concurrent_jobs) toma los jobs de la cola y los corre en el orquestador.
+    La cola admite hasta `max_queued_jobs` jobs en espera: con la cola llena
+    `submit` lanza JobQueueFullError en lugar de retener más documentos en memoria.
+    El estado de cada documento se actualiza apenas termina su workflow y se
+    publica a quienes estén observando el job.
+    """
+
+    def __init__(
+        self,
+        orchestrator: WorkflowOrchestator,
+        max_concurrent_jobs: int = 4,
+        max_retained_jobs: int = 1000,
+        max_queued_jobs: int = 100,
+        drain_timeout: float = 120.0,
+    ):
+        self.logger = logging.getLogger("app.workflows")
+        self._orchestrator = orchestrator
+        self._max_concurrent_jobs = max(1, max_concurrent_jobs)
+        self._max_retained_jobs = max_retained_jobs
+        self._drain_timeout = drain_timeout
+        self._jobs: OrderedDict[str, EtlJob] = OrderedDict()
+        self._inputs: dict[str, list[DocumentContractState]] = {}
+        self._watchers: dict[str, set[asyncio.Queue[EtlJob]]] = {}
+        self._queue: asyncio.Queue[str] = asyncio.Queue(maxsize=max(1, max_queued_jobs))
+        self._workers: list[asyncio.Task] = []
+        self._closing = False
+
+    def start(self) -> None:
+        if self._workers:
+            return
+        self._workers = [
+            asyncio.create_task(self._worker(), name=f"etl-job-worker-{i}")
+            for i in range(self._max_concurrent_jobs)
+        ]
+
+    async def aclose(self) -> None:
+        """
+        Drenado: deja de aceptar jobs y espera hasta `drain_timeout` a que terminen
+        los que están en curso y en cola. Los que siguen pendientes al vencer el
+        plazo se cancelan y quedan en FAILED, con su estado final publicado.
+        """
+        self._closing = True
+        if self._workers:
+            self.logger.info(f"Drenando jobs en curso y {self._queue.qsize()} en cola")
+            try:
+                await asyncio.wait_for(self._queue.join(), timeout=self._drain_timeout)
+            except asyncio.TimeoutError:
+                self.logger.warning("Se agotó el tiempo de drenado; se cancelan los jobs pendientes")
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        while not self._queue.empty():
+            job = self._jobs.get(self._queue.get_nowait())
+            if job is not None:
+                self._abort(job, "Cancelado por el apagado del servicio")
+
+    def submit(self, documents: list[DocumentContractState]) -> EtlJob:
+        if self._closing:
+            raise JobManagerClosedError("El servicio se está deteniendo")
+        if self._queue.full():
+            raise JobQueueFullError(f"Hay {self._queue.qsize()} jobs en espera")
+        job = EtlJob(
+            id=str(uuid.uuid4()),
+            session_id=documents[0].session_id if documents else None,
+            created_at=datetime.now(timezone.utc),
+            documents=[
+                EtlJobDocument(
+                    record_id=doc.record_id,
+                    parent_id=doc.parent_id,
+                    document_type=doc.document_type,
+                )
+                for doc in documents
+            ],
+        )
+        self._jobs[job.id] = job
+        self._inputs[job.id] = documents
+        self._evict_finished()
+        self._queue.put_nowait(job.id)
+        self.start()
+        return job
+
+    def get(self, job_id: str) -> EtlJob | None:
+        return self._jobs.get(job_id)
+
+    async def watch(self, job_id: str) -> AsyncIterator[EtlJob]:
+        """Emite el estado actual del job y luego cada cambio hasta que termina."""
+        job = self._jobs.get(job_id)
+        if job is None:
+            return
+        updates: asyncio.Queue[EtlJob] = asyncio.Queue()
+        self._watchers.setdefault(job_id, set()).add(updates)
+        try:
+            # El bucle solo evalúa snapshots: si el job vivo terminara mientras se envía
+            # el primero, su evento final quedaría en `updates` sin emitirse
+            job = job.model_copy(deep=True)
+            yield job
+            while not job.is_finished:
+                job = await updates.get()
+                yield job
+        finally:
+            watchers = self._watchers.get(job_id)
+            if watchers is not None:
+                watchers.discard(updates)
+                if not watchers:
+                    del self._watchers[job_id]
+
+    # ------------------------------ Métodos privados ------------------------------
+    async def _worker(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run(job_id)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job_id: str) -> None:
+        job = self._jobs.get(job_id)
+        documents = self._inputs.pop(job_id, [])
+        if job is None:
+            return
+        job.status = JobStatus.RUNNING
+        self._publish(job)
+
+        positions = {doc.record_id: i for i, doc in enumerate(job.documents)}
+
+        async def on_result(doc: DocumentContractState, success: bool) -> None:
+            index = positions.get(doc.record_id)
+            if index is not None:
+                job.documents[index].success = success
+                self._publish(job)
+
+        documents_by_type: dict[DocumentType, list[DocumentContractState]] = dict()
+        for doc in documents:
+            documents_by_type.setdefault(doc.document_type, []).append(doc)
+
+        try:
+            for document_type, docs in documents_by_type.items():
+                self.logger.info(f"Job {job_id}: flow de {document_type} - {len(docs)}")
+                await self._orchestrator.execute(
+                    document_type=document_type, documents=docs, on_result=on_result
+                )
+            job.status = JobStatus.COMPLETED
+        except asyncio.CancelledError:
+            self.logger.warning(f"Job {job_id} interrumpido por el apagado del servicio")
+            job.status = JobStatus.FAILED
+            job.error = "Interrumpido por el apagado del servicio"
+            raise
+        except Exception as e:
+            self.logger.error(f"Error en job {job_id}: {str(e)}")
+            job.status = JobStatus.FAILED
+            job.error = str(e)
+        finally:
+            self._finish(job)
+
+    def _abort(self, job: EtlJob, reason: str) -> None:
+        """Da por fallido un job que quedó en cola sin empezar."""
+        self.logger.warning(f"Job {job.id}: {reason}")
+        self._inputs.pop(job.id, None)
+        job.status = JobStatus.FAILED
+        job.error = reason
+        self._finish(job)
+
+    def _finish(self, job: EtlJob) -> None:
+        for item in job.documents:
+            if item.success is None:
+                item.success = False
+        job.finished_at = datetime.now(timezone.utc)
+        self._publish(job)
+
+    def _publish(self, job: EtlJob) -> None:
+        watchers = self._watchers.get(job.id)
+        if not watchers:
+            return
+        snapshot = job.model_copy(deep=True)
+        for updates in watchers:
+            updates.put_nowait(snapshot)
+
+    def _evict_finished(self) -> None:
+        """Descarta los jobs terminados más antiguos por encima del límite retenido."""
+        excess = len(self._jobs) - self._max_retained_jobs
+        if excess <= 0:
+            return
+        for job_id in [job_id for job_id, job in self._jobs.items() if job.is_finished][:excess]:
+            del self._jobs[job_id]
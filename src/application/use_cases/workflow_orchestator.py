@@ -1,16 +1,23 @@
+import asyncio
 import logging
 import uuid
 
-from typing import Any, Literal
+from typing import Any, Awaitable, Callable, Literal
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import BaseCheckpointSaver
 from langgraph.constants import START, END
 from langgraph.graph import StateGraph
 
+from application.ports.content_store_port import ContentStorePort
 from application.ports.extractor_document_port import ExtractorDocumentPort
 from application.ports.loader_metadata_port import LoaderMetadataPort
 from application.ports.loader_document_port import LoaderDocumentPort
 from application.ports.transform_document_port import TransformDocumentPort
 from application.ports.notification_port import NotificationPort
+from application.ports.telemetry_port import NullTelemetry, TelemetryPort
 
+from application.use_cases.workflows.stage_limits import StageLimits
+from application.use_cases.workflows.workflow_base import WorkflowBase
 from application.use_cases.workflows.workflow_inscripciones import WorkflowInscripciones
 from application.use_cases.workflows.workflow_polizas import WorkflowPolizas
 from application.use_cases.workflows.workflow_tasaciones import WorkflowTasaciones
@@ -23,8 +30,14 @@ from domain.models.states.document_contract_state import DocumentContractState
 from domain.models.enums.document_type import DocumentType
 from domain.models.notification import Notification, NotificationData
 
+from infrastructure.adapters.checkpoints.checkpointer_factory import close_checkpointer
 from infrastructure.config.app_settings import get_app_settings, AppSettings
 
+# Callback opcional que recibe cada documento con su resultado final: True solo si
+# quedó cargado y notificado (en streaming apenas se notifica; si no, en final_task).
+# Con notify=False basta con que quede cargado
+DocumentResultCallback = Callable[[DocumentContractState, bool], Awaitable[None]]
+
 
 class WorkflowOrchestator:
     def __init__(
@@ -34,6 +47,10 @@ class WorkflowOrchestator:
         metadata_loader: LoaderMetadataPort,
         document_loader: LoaderDocumentPort,
         notification: NotificationPort,
+        content_store: ContentStorePort,
+        checkpointer: BaseCheckpointSaver | None = None,
+        stage_limits: StageLimits | None = None,
+        telemetry: TelemetryPort | None = None,
     ):
         self.logger = logging.getLogger("app.workflows")
         self._extractor = extractor
@@ -41,15 +58,42 @@ class WorkflowOrchestator:
         self._metadata_loader = metadata_loader
         self._document_loader = document_loader
         self._notification = notification
+        self._content_store = content_store
+        self._checkpointer = checkpointer
+        # Los tres workflows comparten los límites: cada servicio externo se regula
+        # a nivel de proceso, sin importar el tipo de documento
+        self._stage_limits = stage_limits or StageLimits()
+        self._telemetry = telemetry or NullTelemetry()
 
         self.polizas_wf = WorkflowPolizas(
-            self._extractor, self._transformer, self._metadata_loader, self._document_loader
+            self._extractor,
+            self._transformer,
+            self._metadata_loader,
+            self._document_loader,
+            self._content_store,
+            checkpointer,
+            self._stage_limits,
+            self._telemetry,
         )
         self.inscripciones_wf = WorkflowInscripciones(
-            self._extractor, self._transformer, self._metadata_loader, self._document_loader
+            self._extractor,
+            self._transformer,
+            self._metadata_loader,
+            self._document_loader,
+            self._content_store,
+            checkpointer,
+            self._stage_limits,
+            self._telemetry,
         )
         self.tasaciones_wf = WorkflowTasaciones(
-            self._extractor, self._transformer, self._metadata_loader, self._document_loader
+            self._extractor,
+            self._transformer,
+            self._metadata_loader,
+            self._document_loader,
+            self._content_store,
+            checkpointer,
+            self._stage_limits,
+            self._telemetry,
         )
         self.app_settings: AppSettings = get_app_settings()
         self._graph = self._build()
@@ -62,7 +106,7 @@ class WorkflowOrchestator:
         self, state: EtlOrchestatorState
     ) -> Literal["póliza", "inscripción", "tasación"]:
         flow = state.document_type
-        print("flow", flow)
+        self.logger.debug("Flujo seleccionado: %s", flow)
         if flow == DocumentType.REGISTRATION:
             return "inscripción"
         elif flow == DocumentType.APPRAISAL:
@@ -70,85 +114,111 @@ class WorkflowOrchestator:
         else:  # TO DO: Handle default
             return "póliza"
 
-    async def _polizas_flow(self, state: EtlOrchestatorState) -> dict[str, Any]:
-        try:
-            total_documents: list[DocumentContractState] = state.documents
-            if not total_documents:
-                return {}
-
-            results: list[EtlOrchestatorStateResult] = []
-            for index, doc in enumerate(total_documents):
-                print(f"Ejecutando documento: {index + 1}")
-                await self.polizas_wf.execute(doc)
-                result = await self.polizas_wf.execute(doc)
-                if result:
-                    results.append(
-                        EtlOrchestatorStateResult(
-                            record_id=doc.record_id,
-                            parent_id=doc.parent_id,
-                            session_id=doc.session_id,
-                        )
-                    )
+    async def _polizas_flow(
+        self, state: EtlOrchestatorState, config: RunnableConfig
+    ) -> dict[str, Any]:
+        return await self._run_flow("polizas_flow", self.polizas_wf, state, config)
 
-            return {"results": results}
-        except Exception as e:
-            self.logger.error(f"Error en polizas_flow: {str(e)}")
-            return {}
-
-    async def _inscripciones_flow(self, state: EtlOrchestatorState) -> dict[str, Any]:
-        try:
-            total_documents: list[DocumentContractState] = state.documents
-            if not total_documents:
-                return {}
+    async def _inscripciones_flow(
+        self, state: EtlOrchestatorState, config: RunnableConfig
+    ) -> dict[str, Any]:
+        return await self._run_flow(
+            "inscripciones_flow", self.inscripciones_wf, state, config
+        )
 
-            results: list[EtlOrchestatorStateResult] = []
-            for index, doc in enumerate(total_documents):
-                print(f"Ejecutando documento: {index + 1}")
-                result = await self.inscripciones_wf.execute(doc)
-                if result:
-                    results.append(
-                        EtlOrchestatorStateResult(
-                            record_id=doc.record_id,
-                            parent_id=doc.parent_id,
-                            session_id=doc.session_id,
-                        )
-                    )
+    async def _tasaciones_flow(
+        self, state: EtlOrchestatorState, config: RunnableConfig
+    ) -> dict[str, Any]:
+        return await self._run_flow("tasaciones_flow", self.tasaciones_wf, state, config)
 
-            return {"results": results}
-        except Exception as e:
-            self.logger.error(f"Error en inscripciones_flow: {str(e)}")
+    async def _final_task(self, state: EtlOrchestatorState, config: RunnableConfig) -> dict[str, Any]:
+        streamed = self.app_settings.sqs_settings.stream_notifications
+        if streamed or not config["configurable"].get("notify", True):
             return {}
+        results = state.results or []
+        notified = await self._notify_results(results)
+        on_result: DocumentResultCallback | None = config["configurable"].get("on_result")
+        if on_result is not None:
+            documents = {doc.record_id: doc for doc in state.documents}
+            for result in results:
+                await on_result(documents[result.record_id], notified)
+        # Sin notificación el documento no se considera terminado
+        return {} if notified else {"results": []}
 
-    async def _tasaciones_flow(self, state: EtlOrchestatorState) -> dict[str, Any]:
+    # -------------------------- Métodos complementarios al flujo
+    async def _run_flow(
+        self,
+        flow_name: str,
+        workflow: WorkflowBase,
+        state: EtlOrchestatorState,
+        config: RunnableConfig,
+    ) -> dict[str, Any]:
+        """
+        Ejecuta el workflow de los documentos en pipeline: hasta `max_documents`
+        avanzan a la vez y cada etapa respeta su propio límite, por lo que la
+        extracción de un documento se solapa con la transformación de otro. En modo
+        streaming cada resultado exitoso se notifica apenas termina su documento.
+        """
         try:
             total_documents: list[DocumentContractState] = state.documents
             if not total_documents:
                 return {}
 
-            results: list[EtlOrchestatorStateResult] = []
-            for index, doc in enumerate(total_documents):
-                print(f"Ejecutando documento: {index + 1}")
-                await self.tasaciones_wf.execute(doc)
-                result = await self.tasaciones_wf.execute(doc)
-                if result:
-                    results.append(
-                        EtlOrchestatorStateResult(
-                            record_id=doc.record_id,
-                            parent_id=doc.parent_id,
-                            session_id=doc.session_id,
-                        )
+            on_result: DocumentResultCallback | None = config["configurable"].get(
+                "on_result"
+            )
+            notify: bool = config["configurable"].get("notify", True)
+            in_pipeline = asyncio.Semaphore(self._stage_limits.max_documents)
+
+            async def run_document(
+                index: int, doc: DocumentContractState
+            ) -> EtlOrchestatorStateResult | None:
+                attributes = {"flow": flow_name}
+                self._telemetry.adjust("etl.documents.queued", 1, attributes)
+                async with in_pipeline:
+                    self._telemetry.adjust("etl.documents.queued", -1, attributes)
+                    self.logger.debug(
+                        "Ejecutando documento %d", index + 1, extra={"record_id": doc.record_id}
                     )
+                    try:
+                        with self._telemetry.span(flow_name, {**attributes, "record_id": doc.record_id}), \
+                                self._telemetry.timer("etl.document", attributes):
+                            result = await workflow.execute(doc)
+                    except Exception as e:
+                        self.logger.error(
+                            f"Error en {flow_name} ({doc.record_id}): {str(e)}"
+                        )
+                        result = False
+                self._telemetry.increment(
+                    "etl.documents", 1, {**attributes, "outcome": "success" if result else "failed"}
+                )
+                if not result:
+                    if on_result is not None:
+                        await on_result(doc, False)
+                    return None
+                item = EtlOrchestatorStateResult(
+                    record_id=doc.record_id,
+                    parent_id=doc.parent_id,
+                    session_id=doc.session_id,
+                )
+                if notify and not self.app_settings.sqs_settings.stream_notifications:
+                    # El resultado se informa en final_task, junto con el de la notificación del lote
+                    return item
+                notified = not notify or await self._notify_results([item])
+                if on_result is not None:
+                    await on_result(doc, notified)
+                return item if notified else None
 
-            return {"results": results}
+            outcomes = await asyncio.gather(
+                *(run_document(index, doc) for index, doc in enumerate(total_documents))
+            )
+            return {"results": [item for item in outcomes if item is not None]}
         except Exception as e:
-            self.logger.error(f"Error en inscripciones_flow: {str(e)}")
+            self.logger.error(f"Error en {flow_name}: {str(e)}")
             return {}
 
-    def _final_task(self, state: EtlOrchestatorState) -> dict[str, Any]:
+    async def _notify_results(self, results: list[EtlOrchestatorStateResult]) -> bool:
         metadata_notification_type = "regulatory-compliance-prompts.insert-metadata"
-        
-        print("state", state.results)
-        
         notifications = [
             Notification(
                 id=str(uuid.uuid4()),
@@ -158,10 +228,15 @@ class WorkflowOrchestator:
                     data={"recordId": result.record_id, "parentId": result.parent_id},
                 ),
             )
-            for result in state.results
+            for result in results
         ]
-        self._notification.notify(notifications)
-        return {}
+        try:
+            with self._telemetry.timer("etl.notification"):
+                await self._notification.notify(notifications)
+            return True
+        except Exception as e:
+            self.logger.error(f"Error en notificación: {str(e)}")
+            return False
 
     def _build(self):
         g = StateGraph(EtlOrchestatorState)
@@ -187,11 +262,26 @@ class WorkflowOrchestator:
         g.add_edge("final_task", END)
         return g.compile()
 
+    async def aclose(self) -> None:
+        """Despacha las notificaciones pendientes y cierra la conexión del checkpointer."""
+        await self._notification.aclose()
+        await close_checkpointer(self._checkpointer)
+
     async def execute(
-        self, document_type: DocumentType, documents: list[DocumentContractState]
-    ):  
+        self,
+        document_type: DocumentType,
+        documents: list[DocumentContractState],
+        on_result: DocumentResultCallback | None = None,
+        notify: bool = True,
+    ) -> list[EtlOrchestatorStateResult]:
+        """
+        Retorna los documentos que quedaron cargados y notificados. Con `notify`
+        en False no se envía la notificación insert-metadata (ej: backfill).
+        """
         state = EtlOrchestatorState(
             document_type=document_type, documents=documents
         )
-        output_raw = await self._graph.ainvoke(state)
-        print(output_raw)
+        output_raw = await self._graph.ainvoke(
+            state, config={"configurable": {"on_result": on_result, "notify": notify}}
+        )
+        return output_raw.get("results") or []
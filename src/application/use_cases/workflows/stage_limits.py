@@ -0,0 +1,37 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Literal
+
+Stage = Literal["extract", "transform", "load"]
+
+
+class StageLimits:
+    """
+    Límites de concurrencia por etapa, compartidos por todos los workflows del
+    proceso. Cada etapa consume un servicio distinto (Textract, Bedrock, S3/Dynamo)
+    y se regula con su propio semáforo: un documento que terminó de extraer espera
+    turno de transformación sin ocupar un cupo de extracción, y así la extracción
+    del siguiente documento se solapa con la transformación del anterior.
+
+    Los documentos que esperan un cupo forman la cola (FIFO) entre etapas;
+    `max_documents` acota cuántos documentos de un mismo flujo están en el pipeline.
+    """
+
+    def __init__(
+        self,
+        extract_concurrency: int = 4,
+        transform_concurrency: int = 4,
+        load_concurrency: int = 8,
+        max_documents: int = 16,
+    ):
+        self.max_documents = max(1, max_documents)
+        self._slots: dict[Stage, asyncio.Semaphore] = {
+            "extract": asyncio.Semaphore(max(1, extract_concurrency)),
+            "transform": asyncio.Semaphore(max(1, transform_concurrency)),
+            "load": asyncio.Semaphore(max(1, load_concurrency)),
+        }
+
+    @asynccontextmanager
+    async def slot(self, stage: Stage) -> AsyncIterator[None]:
+        async with self._slots[stage]:
+            yield
@@ -1,6 +1,11 @@
+import inspect
+import logging
 from abc import ABC, abstractmethod
-from typing import Any
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Iterable
 
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import BaseCheckpointSaver
 from langgraph.constants import START, END
 from langgraph.graph import StateGraph
 
@@ -8,25 +13,53 @@ from application.ports.loader_metadata_port import LoaderMetadataPort
 from application.ports.loader_document_port import LoaderDocumentPort
 from application.ports.transform_document_port import TransformDocumentPort
 from application.ports.extractor_document_port import ExtractorDocumentPort
+from application.ports.content_store_port import ContentStorePort
 from application.ports.notification_port import NotificationPort
+from application.ports.telemetry_port import NullTelemetry, TelemetryPort
+from application.use_cases.workflows.stage_limits import Stage, StageLimits
+from domain.models.states.document_contract_state import DocumentContractState
 from domain.models.states.etl_base_state import EtlBaseState
 
+logger = logging.getLogger("app.workflows")
+
+_CONTENT_REFS = ("document_content_total_ref", "document_content_llm_ref")
+
 
 class WorkflowBase(ABC):
+    # Prefijo del thread de checkpoints; cada subclase usa su origen
+    origin: str = "base"
+    # Esquema del grafo: los campos que no estén en él se descartan entre nodos
+    state_schema: type[EtlBaseState] = EtlBaseState
+
     def __init__(self,
                  extractor: ExtractorDocumentPort,
                  transformer: TransformDocumentPort,
                  metadata_loader: LoaderMetadataPort,
-                 document_loader: LoaderDocumentPort
+                 document_loader: LoaderDocumentPort,
+                 content_store: ContentStorePort,
+                 checkpointer: BaseCheckpointSaver | None = None,
+                 stage_limits: StageLimits | None = None,
+                 telemetry: TelemetryPort | None = None,
                  ):
+        if checkpointer is not None and not content_store.durable:
+            # El checkpoint guarda handles: si el contenido no sobrevive al proceso,
+            # un reintento después de reiniciar retomaría contra handles inexistentes
+            raise ValueError(
+                "Los checkpoints requieren un almacén de contenido durable "
+                "(ETL_CONTENT_STORE_BACKEND=file con ETL_CONTENT_STORE_DIRECTORY)"
+            )
         self._extractor = extractor
         self._transformer = transformer
         self._metadata_loader = metadata_loader
         self._document_loader = document_loader
+        self._content_store = content_store
+        self._checkpointer = checkpointer
+        self._stage_limits = stage_limits
+        self._telemetry = telemetry or NullTelemetry()
         self._graph = self._build_graph()
 
     @abstractmethod
-    def _extract(self, state: EtlBaseState) -> dict[str, Any]:
+    def _extract(self, state: EtlBaseState, config: RunnableConfig) -> dict[str, Any]:
         ...
 
     @abstractmethod
@@ -41,15 +74,172 @@ class WorkflowBase(ABC):
     def _final_task(self, state: EtlBaseState) -> dict[str, Any]:
         ...
 
+    @abstractmethod
+    async def execute(self, data: DocumentContractState) -> bool:
+        ...
+
     def _build_graph(self):
-        g = StateGraph(EtlBaseState)
-        g.add_node("extract", self._extract)
-        g.add_node("transform", self._transform)
-        g.add_node("load", self._load)
-        g.add_node("final_task", self._final_task)
+        g = StateGraph(self.state_schema)
+        g.add_node("extract", self._staged_extract)
+        g.add_node("transform", self._staged_transform)
+        g.add_node("load", self._staged_load)
+        g.add_node("final_task", self._staged_final_task)
         g.add_edge(START, "extract")
         g.add_edge("extract", "transform")
         g.add_edge("transform", "load")
         g.add_edge("load", "final_task")
         g.add_edge("final_task", END)
-        return g.compile()
+        return g.compile(checkpointer=self._checkpointer)
+
+    # Los nodos envoltorio anotan `state` como Any: LangGraph toma el esquema de
+    # entrada de la anotación y con EtlBaseState descartaría los campos de la subclase
+    async def _staged_extract(self, state: Any, config: RunnableConfig) -> dict[str, Any]:
+        async with self._stage("extract"):
+            return await self._extract(state, config)
+
+    async def _staged_transform(self, state: Any) -> dict[str, Any]:
+        async with self._stage("transform"):
+            return await self._transform(state)
+
+    async def _staged_load(self, state: Any) -> dict[str, Any]:
+        async with self._stage("load"):
+            return await self._load(state)
+
+    async def _staged_final_task(self, state: Any) -> dict[str, Any]:
+        attributes = {"workflow": self.origin, "stage": "final_task"}
+        with self._telemetry.span(f"{self.origin}.final_task", attributes), \
+                self._telemetry.timer("etl.stage", attributes):
+            result = self._final_task(state)
+            return await result if inspect.isawaitable(result) else result
+
+    @asynccontextmanager
+    async def _stage(self, stage: Stage) -> AsyncIterator[None]:
+        """
+        Envuelve un nodo: espera su cupo de etapa (contando los documentos en cola)
+        y mide la duración del nodo con un span por documento.
+        """
+        attributes = {"workflow": self.origin, "stage": stage}
+        if self._stage_limits is None:
+            with self._telemetry.span(f"{self.origin}.{stage}", attributes), \
+                    self._telemetry.timer("etl.stage", attributes):
+                yield
+            return
+
+        self._telemetry.adjust("etl.stage.queued", 1, attributes)
+        queued = True
+        try:
+            async with self._stage_limits.slot(stage):
+                self._telemetry.adjust("etl.stage.queued", -1, attributes)
+                queued = False
+                with self._telemetry.span(f"{self.origin}.{stage}", attributes), \
+                        self._telemetry.timer("etl.stage", attributes):
+                    yield
+        finally:
+            if queued:
+                self._telemetry.adjust("etl.stage.queued", -1, attributes)
+
+    async def _invoke(self, state: EtlBaseState, data: DocumentContractState) -> dict[str, Any]:
+        """
+        Ejecuta el grafo. Con checkpointer, el thread se identifica por record_id: si
+        un intento anterior falló después de extraer o transformar, se retoma desde
+        la última etapa terminada reutilizando el texto extraído y la salida del LLM.
+        """
+        configurable: dict[str, Any] = {"document_data": data}
+        if self._checkpointer is None:
+            return await self._graph.ainvoke(state, config={"configurable": configurable})
+
+        configurable["thread_id"] = f"{self.origin}:{data.record_id}"
+        config: RunnableConfig = {"configurable": configurable}
+        snapshot = await self._graph.aget_state(config)
+        values = snapshot.values or {}
+        resume = WorkflowBase._resume_point(values)
+        if resume is not None and not self._content_available(values):
+            # El contenido venció o se perdió: el checkpoint ya no sirve y el documento se reprocesa
+            logger.warning(
+                "El checkpoint apunta a contenido inexistente; se reprocesa desde la extracción",
+                extra={"record_id": data.record_id},
+            )
+            await self._checkpointer.adelete_thread(configurable["thread_id"])
+            resume = None
+        if resume is None:
+            output_raw = await self._graph.ainvoke(state, config=config)
+        else:
+            as_node, reset = resume
+            await self._graph.aupdate_state(config, reset, as_node=as_node)
+            output_raw = await self._graph.ainvoke(None, config=config)
+
+        if output_raw.get("load_success") is True:
+            # Documento terminado: su checkpoint ya no se necesita
+            await self._checkpointer.adelete_thread(configurable["thread_id"])
+        return output_raw
+
+    def _spill(self, item: EtlBaseState) -> dict[str, Any]:
+        """
+        Mueve el texto extraído al almacén de contenido y retorna la actualización
+        de estado con los handles (y el texto en None). Si ambos textos son iguales
+        se guarda una sola vez.
+        """
+        total = item.document_content_total
+        llm = item.document_content_llm
+        total_ref = self._content_store.put(total) if total is not None else None
+        if llm is None:
+            llm_ref = None
+        elif llm is total or llm == total:
+            llm_ref = total_ref
+        else:
+            llm_ref = self._content_store.put(llm)
+        return {
+            "document_content_total": None,
+            "document_content_llm": None,
+            "document_content_total_ref": total_ref,
+            "document_content_llm_ref": llm_ref,
+        }
+
+    def _release_content(self, items: Iterable[EtlBaseState | None]) -> None:
+        """
+        Libera el contenido de los items al terminar el grafo. Si hay checkpointer y
+        el documento no se cargó, se conserva para que el reintento lo reutilice.
+        """
+        handles: set[str] = set()
+        for item in items:
+            if item is None:
+                continue
+            for handle in (item.document_content_total_ref, item.document_content_llm_ref):
+                if handle is not None:
+                    handles.add(handle)
+        for handle in handles:
+            self._content_store.delete(handle)
+
+    def _content_available(self, values: dict[str, Any]) -> bool:
+        """True si siguen existiendo todos los handles del estado guardado, incluidos los de los hijos."""
+        items: list[Any] = [values]
+        for value in values.values():
+            if isinstance(value, list):
+                items.extend(value)
+        for item in items:
+            for field in _CONTENT_REFS:
+                handle = item.get(field) if isinstance(item, dict) else getattr(item, field, None)
+                if handle is not None and not self._content_store.exists(handle):
+                    return False
+        return True
+
+    def _keeps_content(self, state: EtlBaseState) -> bool:
+        return self._checkpointer is not None and state.load_success is not True
+
+    @staticmethod
+    def _succeeded(output_raw: dict[str, Any]) -> bool:
+        """Lee el resultado directo de la salida del grafo, sin revalidar todo el estado."""
+        return (
+            output_raw.get("extract_success") is True
+            and output_raw.get("transform_success") is True
+            and output_raw.get("load_success") is True
+        )
+
+    @staticmethod
+    def _resume_point(values: dict[str, Any]) -> tuple[str, dict[str, Any]] | None:
+        """Retorna (nodo desde el que se continúa, campos a reiniciar) o None si no hay avance útil."""
+        if values.get("extract_success") is not True or values.get("load_success") is True:
+            return None
+        if values.get("transform_success") is True:
+            return "transform", {"load_success": None}
+        return "extract", {"transform_success": None, "load_success": None}
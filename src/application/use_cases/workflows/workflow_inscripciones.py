@@ -2,14 +2,18 @@ import logging
 from typing import Any
 
 import anyio
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import BaseCheckpointSaver
 
 from application.ports.extractor_document_port import ExtractorDocumentPort
+from application.ports.content_store_port import ContentStorePort
 from application.ports.loader_metadata_port import LoaderMetadataPort
 from application.ports.loader_document_port import LoaderDocumentPort
 from application.ports.transform_document_port import TransformDocumentPort
-from application.ports.notification_port import NotificationPort
+from application.ports.telemetry_port import TelemetryPort
 
 
+from application.use_cases.workflows.stage_limits import StageLimits
 from application.use_cases.workflows.workflow_base import WorkflowBase
 from domain.models.states.document_contract_state import DocumentContractState
 from domain.models.states.etl_base_state import EtlBaseState
@@ -17,27 +21,44 @@ from domain.models.states.etl_inscripciones_state import (
     EtlInscripcionesState,
     EtlInscripcionChild,
 )
-from domain.models.states.etl_polizas_state import EtlPolizasState
 from domain.services.workflow_service import WorkflowService
 
 
 class WorkflowInscripciones(WorkflowBase):
+    origin = "inscripciones"
+    state_schema = EtlInscripcionesState
+
     def __init__(
         self,
         extractor: ExtractorDocumentPort,
         transformer: TransformDocumentPort,
         metadata_loader: LoaderMetadataPort,
         document_loader: LoaderDocumentPort,
+        content_store: ContentStorePort,
+        checkpointer: BaseCheckpointSaver | None = None,
+        stage_limits: StageLimits | None = None,
+        telemetry: TelemetryPort | None = None,
     ):
-        super().__init__(extractor, transformer, metadata_loader, document_loader)
+        super().__init__(
+            extractor,
+            transformer,
+            metadata_loader,
+            document_loader,
+            content_store,
+            checkpointer,
+            stage_limits,
+            telemetry,
+        )
         self.logger = logging.getLogger("app.workflows")
-        self.document_data: DocumentContractState | None = None
 
-    async def _extract(self, state: EtlInscripcionesState) -> dict[str, Any]:
+    async def _extract(self, state: EtlInscripcionesState, config: RunnableConfig) -> dict[str, Any]:
         try:
+            document_data: DocumentContractState = config["configurable"]["document_data"]
             items: list[EtlBaseState] = await self._extractor.extract_pipeline(
-                document_data=self.document_data, origin="inscripciones"
+                document_data=document_data, origin="inscripciones"
             )
+            # El texto de cada página pasa al almacén; los hijos solo llevan handles
+            items = [item.model_copy(update=self._spill(item)) for item in items]
             children: list[EtlInscripcionChild] = (
                 WorkflowService.resolve_inscripciones_children(items, state)
             )
@@ -55,13 +76,22 @@ class WorkflowInscripciones(WorkflowBase):
             if not extract_success:
                 return {}
             children_extracted: list[EtlInscripcionChild] = state.children_extracted
-            print("children", len(children_extracted))
+            self.logger.debug(
+                "Transformando %d hijos de inscripción",
+                len(children_extracted),
+                extra={"record_id": state.record_id},
+            )
             children_transformed: list[EtlInscripcionChild] = []
             for index, child in enumerate(children_extracted):
-                print("index child", index)
                 item = await self._transform_unit(child)
-                print("item", item)
-                children_transformed.append(item)
+                self.logger.debug(
+                    "Hijo %d transformado: %s",
+                    index,
+                    item is not None,
+                    extra={"record_id": state.record_id},
+                )
+                if item is not None:
+                    children_transformed.append(item)
 
             return {
                 "transform_success": True,
@@ -81,13 +111,12 @@ class WorkflowInscripciones(WorkflowBase):
 
             for child in state.children_transformed:
                 text_key = f"txt/{state.record_id}.txt"
+                document_total_ref = child.document_content_total_ref
                 await anyio.to_thread.run_sync(
-                    self._document_loader.save_document,
-                    text_key,
-                    child.document_content_total.encode("utf-8"),
+                    lambda: self._document_loader.save_document(
+                        text_key, self._content_store.read_bytes(document_total_ref)
+                    )
                 )
-                child.document_content_total = None
-                child.document_content_llm = None
 
             await anyio.to_thread.run_sync(
                 self._metadata_loader.save_metadata,
@@ -101,48 +130,41 @@ class WorkflowInscripciones(WorkflowBase):
             return {"load_success": False}
 
     def _final_task(self, state: EtlInscripcionesState) -> dict[str, Any]:
+        if not self._keeps_content(state):
+            # Los hijos transformados comparten handles con los extraídos
+            self._release_content(state.children_extracted)
         return {}
 
     async def execute(self, data: DocumentContractState) -> bool:
-        self.document_data = data
         state: EtlInscripcionesState = EtlInscripcionesState(
             record_id=data.record_id,
             period_year=data.period_year,
             period_month=data.period_month,
         )
-        output_raw = await self._graph.ainvoke(state)
-        output = EtlInscripcionesState.model_validate(output_raw)
-        return (
-            output.transform_success == True
-            and output.load_success == True
-            and output.extract_success == True
-        )
+        output_raw = await self._invoke(state, data)
+        return WorkflowBase._succeeded(output_raw)
 
     # -------------------------- Métodos complementarios al flujo
     async def _transform_unit(
         self, child: EtlInscripcionChild
     ) -> EtlInscripcionChild | None:
         try:
-            document_llm = child.document_content_llm
+            document_llm_ref = child.document_content_llm_ref
             item: EtlInscripcionChild | None = await anyio.to_thread.run_sync(
-                self._transformer.llm_caller_inscripciones, document_llm
+                lambda: self._transformer.llm_caller_inscripciones(
+                    self._content_store.read(document_llm_ref)
+                )
             )
             if item is None:
                 child.transform_success = False
                 return None
-            return EtlInscripcionChild(
-                **child.model_dump(
-                    exclude={
-                        "inscription_number",
-                        "legal_name",
-                        "inscription_date",
-                        "transform_success",
-                    }
-                ),
-                inscription_number=item.inscription_number,
-                legal_name=item.legal_name,
-                inscription_date=item.inscription_date,
-                transform_success=True,
+            return child.model_copy(
+                update={
+                    "inscription_number": item.inscription_number,
+                    "legal_name": item.legal_name,
+                    "inscription_date": item.inscription_date,
+                    "transform_success": True,
+                }
             )
 
         except Exception as e:
@@ -2,13 +2,17 @@ import logging
 from typing import Any
 
 import anyio
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import BaseCheckpointSaver
 
 from application.ports.extractor_document_port import ExtractorDocumentPort
+from application.ports.content_store_port import ContentStorePort
 from application.ports.loader_metadata_port import LoaderMetadataPort
 from application.ports.loader_document_port import LoaderDocumentPort
 from application.ports.transform_document_port import TransformDocumentPort
-from application.ports.notification_port import NotificationPort
+from application.ports.telemetry_port import TelemetryPort
 
+from application.use_cases.workflows.stage_limits import StageLimits
 from application.use_cases.workflows.workflow_base import WorkflowBase
 
 
@@ -20,33 +24,48 @@ from domain.services.workflow_service import WorkflowService
 
 
 class WorkflowTasaciones(WorkflowBase):
+    origin = "tasaciones"
+    state_schema = EtlTasacionesState
+
     def __init__(
         self,
         extractor: ExtractorDocumentPort,
         transformer: TransformDocumentPort,
         metadata_loader: LoaderMetadataPort,
         document_loader: LoaderDocumentPort,
+        content_store: ContentStorePort,
+        checkpointer: BaseCheckpointSaver | None = None,
+        stage_limits: StageLimits | None = None,
+        telemetry: TelemetryPort | None = None,
     ):
-        super().__init__(extractor, transformer, metadata_loader, document_loader)
+        super().__init__(
+            extractor,
+            transformer,
+            metadata_loader,
+            document_loader,
+            content_store,
+            checkpointer,
+            stage_limits,
+            telemetry,
+        )
         self.logger = logging.getLogger("app.workflows")
-        self.document_data: DocumentContractState | None = None
 
-    async def _extract(self, state: EtlTasacionesState) -> dict[str, Any]:
+    async def _extract(self, state: EtlTasacionesState, config: RunnableConfig) -> dict[str, Any]:
         try:
+            document_data: DocumentContractState = config["configurable"]["document_data"]
             self.logger.info("Iniciando el proceso de extracción de tasaciones")
             items: list[EtlBaseState] = await self._extractor.extract_pipeline(
-                document_data=self.document_data, origin="tasaciones"
+                document_data=document_data, origin="tasaciones"
             )
             if len(items) == 0:
                 return {"extract_success": False}
             item = items[0]
             return {
                 "extract_success": True,
-                "record_id": self.document_data.record_id,
-                "period_month": self.document_data.period_month,
-                "period_year": self.document_data.period_year,
-                "document_content_total": item.document_content_total,
-                "document_content_llm": item.document_content_llm,
+                "record_id": document_data.record_id,
+                "period_month": document_data.period_month,
+                "period_year": document_data.period_year,
+                **self._spill(item),
             }
         except Exception as e:
             self.logger.error(f"Error en la extracción de tasaciones: {str(e)}")
@@ -57,11 +76,15 @@ class WorkflowTasaciones(WorkflowBase):
             extract_success = state.extract_success
             if not extract_success:
                 return {}
-            document_llm = state.document_content_llm
+            document_llm_ref = state.document_content_llm_ref
             item: EtlTasacionesState | None = await anyio.to_thread.run_sync(
-                self._transformer.llm_caller_tasaciones, document_llm
+                lambda: self._transformer.llm_caller_tasaciones(
+                    self._content_store.read(document_llm_ref)
+                )
+            )
+            self.logger.debug(
+                "Resultado del LLM de tasaciones: %s", item, extra={"record_id": state.record_id}
             )
-            print("item", item)
             if item is None:
                 return {"transform_success": False}
             return {
@@ -84,15 +107,12 @@ class WorkflowTasaciones(WorkflowBase):
                 return {}
             
             text_key = f"txt/{state.record_id}.txt"
+            document_total_ref = state.document_content_total_ref
             await anyio.to_thread.run_sync(
-                self._document_loader.save_document,
-                text_key,
-                state.document_content_total.encode("utf-8"),
+                lambda: self._document_loader.save_document(
+                    text_key, self._content_store.read_bytes(document_total_ref)
+                )
             )
-            state.document_content_total = None
-            state.document_content_llm = None
-            
-            print("state en load", state)
 
             await anyio.to_thread.run_sync(
                 self._metadata_loader.save_metadata, "tasaciones", [state]
@@ -104,11 +124,12 @@ class WorkflowTasaciones(WorkflowBase):
             return {"load_success": False}
 
     async def _final_task(self, state: EtlTasacionesState) -> dict[str, Any]:
-        pass
+        if self._keeps_content(state):
+            return {}
+        self._release_content([state])
+        return {"document_content_total_ref": None, "document_content_llm_ref": None}
 
-    async def execute(self, data: DocumentContractState) -> EtlTasacionesState:
-        self.document_data = data
+    async def execute(self, data: DocumentContractState) -> bool:
         state: EtlTasacionesState = EtlTasacionesState(record_id=data.record_id)
-        output_raw = await self._graph.ainvoke(state)
-        output = EtlTasacionesState.model_validate(output_raw)
-        return output.transform_success == True and output.load_success == True and output.extract_success == True
+        output_raw = await self._invoke(state, data)
+        return WorkflowBase._succeeded(output_raw)
@@ -0,0 +1,37 @@
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+from domain.models.enums.document_type import DocumentType
+from domain.models.enums.job_status import JobStatus
+
+
+class EtlJobDocument(BaseModel):
+    record_id: str = Field(..., serialization_alias="recordId", description="ID del documento")
+    parent_id: str = Field(..., serialization_alias="parentId", description="ID del documento padre")
+    document_type: DocumentType = Field(
+        ..., serialization_alias="documentType", description="tipo de documento"
+    )
+    success: bool | None = Field(
+        default=None,
+        serialization_alias="success",
+        description="resultado del documento; None mientras no termina",
+    )
+
+
+class EtlJob(BaseModel):
+    id: str = Field(..., serialization_alias="jobId", description="identificador del job")
+    session_id: str | None = Field(
+        default=None, serialization_alias="sessionId", description="sesión de los documentos"
+    )
+    status: JobStatus = Field(default=JobStatus.PENDING, serialization_alias="status")
+    created_at: datetime = Field(..., serialization_alias="createdAt")
+    finished_at: datetime | None = Field(default=None, serialization_alias="finishedAt")
+    documents: list[EtlJobDocument] = Field(
+        default_factory=list, serialization_alias="documents"
+    )
+    error: str | None = Field(default=None, serialization_alias="error")
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in (JobStatus.COMPLETED, JobStatus.FAILED)
@@ -5,6 +5,10 @@ class EtlBaseState(BaseModel):
     record_id: str = Field(description="ID del documento")
     document_content_total: str | None = Field(description="Contenido total del documento", default=None)
     document_content_llm: str | None = Field(description="Contenido específico a enviar el llm", default=None)
+    document_content_total_ref: str | None = Field(
+        description="Handle del contenido total en el almacén de contenido", default=None)
+    document_content_llm_ref: str | None = Field(
+        description="Handle del contenido a enviar al llm en el almacén de contenido", default=None)
     period_month: str | None = Field(description="Contiene el mes de donde pertenece el archivo", default=None)
     period_year: str | None = Field(description="Contiene el año donde pertenece el archivo", default=None)
     extract_success: bool | None = Field(description="Indica si su procesamiento fue exitoso o no", default=None)
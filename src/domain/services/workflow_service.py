@@ -56,7 +56,9 @@ class WorkflowService:
                 period_year=state.period_year,
                 extract_success=True,
                 document_content_llm=i.document_content_llm,
-                document_content_total=i.document_content_total
+                document_content_total=i.document_content_total,
+                document_content_llm_ref=i.document_content_llm_ref,
+                document_content_total_ref=i.document_content_total_ref,
             )
             to_send.append(item)
         return to_send
@@ -0,0 +1,34 @@
+import os
+
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.checkpoint.memory import MemorySaver
+
+from infrastructure.config.app_settings import CheckpointSettings
+
+
+def build_checkpointer(settings: CheckpointSettings) -> BaseCheckpointSaver | None:
+    """
+    Crea el checkpointer de LangGraph según la configuración. Cualquier
+    implementación de BaseCheckpointSaver (Postgres, Redis, ...) puede agregarse
+    como un nuevo backend sin tocar los workflows.
+    """
+    if settings.backend == "memory":
+        return MemorySaver()
+    if settings.backend == "sqlite":
+        # Dependencias opcionales: solo se requieren con este backend
+        import aiosqlite
+        from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+        directory = os.path.dirname(settings.sqlite_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # La conexión se abre de forma perezosa en el primer uso, dentro del event loop
+        return AsyncSqliteSaver(aiosqlite.connect(settings.sqlite_path))
+    return None
+
+
+async def close_checkpointer(checkpointer: BaseCheckpointSaver | None) -> None:
+    """Cierra la conexión del checkpointer si tiene una (ej: aiosqlite del backend sqlite)."""
+    conn = getattr(checkpointer, "conn", None)
+    if conn is not None:
+        await conn.close()
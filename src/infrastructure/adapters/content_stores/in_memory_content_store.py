@@ -0,0 +1,25 @@
+import uuid
+
+from application.ports.content_store_port import ContentStorePort
+
+
+class InMemoryContentStore(ContentStorePort):
+    def __init__(self):
+        self._contents: dict[str, str] = {}
+
+    def put(self, text: str) -> str:
+        handle = str(uuid.uuid4())
+        self._contents[handle] = text
+        return handle
+
+    def read(self, handle: str) -> str:
+        return self._contents[handle]
+
+    def read_bytes(self, handle: str) -> bytes:
+        return self._contents[handle].encode("utf-8")
+
+    def exists(self, handle: str) -> bool:
+        return handle in self._contents
+
+    def delete(self, handle: str) -> None:
+        self._contents.pop(handle, None)
@@ -0,0 +1,79 @@
+import logging
+import os
+import tempfile
+import time
+import uuid
+
+from application.ports.content_store_port import ContentStorePort
+
+
+class TempFileContentStore(ContentStorePort):
+    """
+    Guarda cada texto en un archivo (UTF-8), de modo que mientras el documento
+    espera entre etapas el contenido vive en disco y no en el heap del proceso.
+    Cada lectura trae el archivo completo a memoria.
+
+    Con un `directory` fijo los handles sobreviven a un reinicio (necesario con
+    checkpoints persistentes); al iniciar se borran los archivos con más de
+    `retention_seconds`, que son de documentos que no volvieron a reintentarse.
+    Sin directorio se usa uno temporal nuevo por proceso.
+    """
+
+    def __init__(self, directory: str | None = None, retention_seconds: int | None = None):
+        self._durable = bool(directory)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            self._directory = directory
+            if retention_seconds is not None:
+                self._prune(retention_seconds)
+        else:
+            self._directory = tempfile.mkdtemp(prefix="etl-content-")
+
+    @property
+    def durable(self) -> bool:
+        return self._durable
+
+    def put(self, text: str) -> str:
+        handle = uuid.uuid4().hex
+        with open(self._path(handle), "wb") as f:
+            f.write(text.encode("utf-8"))
+        return handle
+
+    def read(self, handle: str) -> str:
+        return self.read_bytes(handle).decode("utf-8")
+
+    def read_bytes(self, handle: str) -> bytes:
+        try:
+            with open(self._path(handle), "rb") as f:
+                return f.read()
+        except FileNotFoundError as e:
+            raise KeyError(handle) from e
+
+    def exists(self, handle: str) -> bool:
+        return os.path.exists(self._path(handle))
+
+    def delete(self, handle: str) -> None:
+        try:
+            os.remove(self._path(handle))
+        except FileNotFoundError:
+            pass
+
+    def _prune(self, retention_seconds: int) -> None:
+        cutoff = time.time() - retention_seconds
+        removed = 0
+        with os.scandir(self._directory) as entries:
+            for entry in entries:
+                if entry.name.endswith(".txt") and entry.stat().st_mtime < cutoff:
+                    try:
+                        os.remove(entry.path)
+                        removed += 1
+                    except FileNotFoundError:
+                        pass
+        if removed:
+            logging.getLogger("app.adapters").info(
+                "Se eliminaron %d contenidos vencidos de %s", removed, self._directory
+            )
+
+    def _path(self, handle: str) -> str:
+        # El handle es un uuid hex: no puede escapar del directorio
+        return os.path.join(self._directory, f"{handle}.txt")
@@ -0,0 +1,36 @@
+from domain.models.states.etl_base_state import EtlBaseState
+
+# Páginas que se guardan como contenido total en los flujos de un solo ítem
+TOTAL_CONTENT_PAGES = 20
+
+
+def build_extracted_items(record_id: str, origin: str, per_page: list[dict], llm_key: str) -> list[EtlBaseState]:
+    """
+    Arma los ítems que devuelve un extractor a partir del contenido por página
+    ({"text", "structured", ...}): uno por página para inscripciones y uno por
+    documento para el resto. `llm_key` elige qué contenido recibe el LLM.
+    """
+    if origin == "inscripciones":
+        return [
+            EtlBaseState(
+                record_id=record_id,
+                extract_success=True,
+                transform_success=False,
+                load_success=False,
+                document_content_total=p.get("text", ""),
+                document_content_llm=p.get(llm_key, ""),
+            )
+            for p in per_page
+        ]
+    first_pages = "\n\n".join(p.get("text", "") for p in per_page[:TOTAL_CONTENT_PAGES])
+    full_text = "\n\n".join(p.get(llm_key, "") for p in per_page)
+    return [
+        EtlBaseState(
+            record_id=record_id,
+            extract_success=True,
+            transform_success=False,
+            load_success=False,
+            document_content_total=first_pages,
+            document_content_llm=full_text,
+        )
+    ]
@@ -0,0 +1,114 @@
+import logging
+import tempfile
+from typing import IO
+
+import anyio
+import boto3
+from botocore.exceptions import ClientError
+from mypy_boto3_s3 import S3Client
+from pypdf import PdfReader
+from pypdf.errors import PdfReadError
+
+from application.ports.extractor_document_port import ExtractorDocumentPort
+from application.ports.telemetry_port import NullTelemetry, TelemetryPort
+from domain.models.states.document_contract_state import DocumentContractState
+from domain.models.states.etl_base_state import EtlBaseState
+from infrastructure.adapters.extractors.extracted_items import build_extracted_items
+from infrastructure.adapters.extractors.pdf.pdf_text_layer import PdfTextLayer
+from infrastructure.config.app_settings import get_app_settings
+
+logger = logging.getLogger("app.adapters")
+
+_CHUNK_SIZE = 1024 * 1024
+
+
+class PdfTextExtractorDocument(ExtractorDocumentPort):
+    """
+    Extrae la capa de texto embebida de los PDFs generados digitalmente, sin OCR:
+    descarga el objeto en streaming a un archivo temporal (en memoria hasta
+    `spool_max_bytes`) y lee el texto página a página. Si la proporción de páginas
+    con texto queda bajo `min_text_ratio`, o el objeto no es un PDF legible, el
+    documento se delega al extractor `fallback` (Textract).
+    """
+
+    def __init__(
+            self,
+            fallback: ExtractorDocumentPort,
+            telemetry: TelemetryPort | None = None,
+            s3_client: S3Client | None = None,
+    ):
+        app_settings = get_app_settings()
+        self.settings = app_settings.extractor_settings
+        self.s3: S3Client = s3_client or boto3.client("s3", region_name=app_settings.aws_settings.region)
+        self._fallback = fallback
+        self._telemetry = telemetry or NullTelemetry()
+
+    async def extract_pipeline(self, document_data: DocumentContractState, origin: str) -> list[EtlBaseState]:
+        per_page, content = None, None
+        if document_data.key.lower().endswith(".pdf"):
+            try:
+                with self._telemetry.timer("etl.adapter", {"adapter": "pdf_text", "operation": "extract"}):
+                    per_page, content = await anyio.to_thread.run_sync(self._read_text_layer, document_data.key)
+            except (ClientError, PdfReadError, ValueError) as e:
+                logger.warning(
+                    "no se pudo leer la capa de texto de %s: %s", document_data.key, e,
+                    extra={"record_id": document_data.record_id},
+                )
+
+        if per_page is None:
+            self._telemetry.increment("etl.extractor.route", 1, {"extractor": "fallback"})
+            if content is not None:
+                # El fallback reutiliza el PDF ya descargado en lugar de volver a leerlo de S3
+                return await self._fallback.extract_pipeline(
+                    document_data=document_data, origin=origin, content=content
+                )
+            return await self._fallback.extract_pipeline(document_data=document_data, origin=origin)
+
+        self._telemetry.increment("etl.extractor.route", 1, {"extractor": "pdf_text"})
+        return build_extracted_items(document_data.record_id, origin, per_page, "text")
+
+    # ------------------------------ Métodos privados ------------------------------
+    def _read_text_layer(self, file_key: str) -> tuple[list[dict] | None, bytes | None]:
+        """
+        Retorna (contenido por página, None) o, si el PDF no tiene suficiente texto
+        embebido, (None, bytes descargados) para el fallback. Los bytes solo se
+        entregan si el objeto cabe en `spool_max_bytes`: uno más grande ya está en
+        disco y se deja que el fallback lo lea de S3.
+        """
+        with tempfile.SpooledTemporaryFile(max_size=self.settings.spool_max_bytes) as buffer:
+            size = self._download(file_key, buffer)
+
+            def _fallback_content() -> bytes | None:
+                if size > self.settings.spool_max_bytes:
+                    return None
+                buffer.seek(0)
+                return buffer.read()
+
+            reader = PdfReader(buffer)
+            page_count = len(reader.pages)
+            if page_count == 0:
+                return None, _fallback_content()
+            # Páginas sin texto que se toleran antes de delegar el documento al OCR
+            allowed_missing = int(page_count * (1 - self.settings.min_text_ratio))
+            missing = 0
+            pages: list[dict] = []
+            for index in range(page_count):
+                text = PdfTextLayer.page_texts(reader, [index])[index]
+                if not PdfTextLayer.has_text(text, self.settings.min_chars_per_page):
+                    missing += 1
+                    if missing > allowed_missing:
+                        logger.debug(
+                            "%s sin capa de texto suficiente (página %d de %d)", file_key, index + 1, page_count
+                        )
+                        return None, _fallback_content()
+                pages.append(PdfTextLayer.page_content(text))
+            return pages, None
+
+    def _download(self, file_key: str, buffer: IO[bytes]) -> int:
+        """Descarga el objeto en `buffer` y retorna su tamaño en bytes."""
+        response = self.s3.get_object(Bucket=get_app_settings().s3_settings.bucket, Key=file_key)
+        for chunk in response["Body"].iter_chunks(_CHUNK_SIZE):
+            buffer.write(chunk)
+        size = buffer.tell()
+        buffer.seek(0)
+        return size
@@ -0,0 +1,64 @@
+import io
+
+from pypdf import PdfReader, PdfWriter
+
+
+class PdfTextLayer:
+    """
+    Lectura local de la capa de texto embebida de un PDF (los generados
+    digitalmente la traen; los escaneados no), para decidir qué páginas
+    necesitan OCR.
+    """
+
+    @staticmethod
+    def parse_page_range(spec: str | None, page_count: int) -> list[int]:
+        """
+        Páginas (base 0) de un rango tipo "1-20,25"; vacío o None son todas.
+        Los valores fuera del documento se ignoran.
+        :param spec:
+        :param page_count:
+        :return:
+        """
+        if not spec or not spec.strip():
+            return list(range(page_count))
+        pages: set[int] = set()
+        for part in spec.split(","):
+            part = part.strip()
+            if not part:
+                continue
+            start, _, end = part.partition("-")
+            first = int(start)
+            last = int(end) if end else first
+            pages.update(range(max(first, 1) - 1, min(last, page_count)))
+        return sorted(pages)
+
+    @staticmethod
+    def page_texts(reader: PdfReader, pages: list[int]) -> dict[int, str]:
+        """Texto embebido de cada página pedida ("" si no tiene capa de texto)."""
+        texts: dict[int, str] = {}
+        for index in pages:
+            try:
+                texts[index] = (reader.pages[index].extract_text() or "").strip()
+            except Exception:  # pypdf falla con algunos streams de contenido dañados
+                texts[index] = ""
+        return texts
+
+    @staticmethod
+    def has_text(text: str, min_chars: int) -> bool:
+        # Se cuentan solo caracteres visibles: los PDFs escaneados a veces traen espacios sueltos
+        return sum(1 for char in text if not char.isspace()) >= min_chars
+
+    @staticmethod
+    def subset(reader: PdfReader, pages: list[int]) -> bytes:
+        """PDF nuevo solo con las páginas indicadas, en ese orden."""
+        writer = PdfWriter()
+        for index in pages:
+            writer.add_page(reader.pages[index])
+        buffer = io.BytesIO()
+        writer.write(buffer)
+        return buffer.getvalue()
+
+    @staticmethod
+    def page_content(text: str) -> dict:
+        """Mismo formato que las páginas de Textract (ver `ExtractAsyncHelper`)."""
+        return {"text": text, "lines_count": len(text.splitlines()), "structured": text}
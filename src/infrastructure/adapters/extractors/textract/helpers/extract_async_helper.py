@@ -1,90 +1,69 @@
 import asyncio
-from typing import List, Set
+from typing import List
 
-from mypy_boto3_textract.type_defs import BlockTypeDef
+from infrastructure.adapters.extractors.textract.helpers.structured_content_helper import (
+    StructuredContentHelper,
+    TableFormat,
+)
+from infrastructure.adapters.extractors.textract.helpers.textract_block_store import TextractBlockStore
 
 
 class ExtractAsyncHelper:
     @staticmethod
-    def build_index(blocks: list[BlockTypeDef]) -> dict[str, BlockTypeDef]:
+    def page_closure_ids(page_index: int, store: TextractBlockStore) -> list[int]:
         """
-        Indexa todos los bloques por Id (O(n))
-        :param blocks:
-        :return:
+        Recorre relaciones desde PAGE y cierra el conjunto de bloques alcanzables
+        (CHILD: LINE→WORD, TABLE→CELL, etc.; VALUE: KEY_VALUE_SET KEY → VALUE)
+        :param page_index: índice del bloque PAGE en el store
+        :param store:
+        :return: índices en orden de lectura
         """
-        return {b["Id"]: b for b in blocks}
-
-    @staticmethod
-    def _children_ids(block: BlockTypeDef, rel_type: str | None = None):
-        for rel in block.get("Relationships", []):
-            if rel_type is None or rel.get("Type") == rel_type:
-                for cid in rel.get("Ids", []):
-                    yield cid
+        return store.closure(page_index)
 
     @staticmethod
-    def page_closure_ids(page_block: BlockTypeDef, by_id: dict[str, BlockTypeDef]) -> set[str]:
-        """
-        Recorre relaciones desde PAGE y cierra el conjunto de Ids alcanzables
-        :param page_block:
-        :param by_id:
-        :return:
-        """
-        seen: Set[str] = {page_block["Id"]}
-        stack: List[str] = [*list(ExtractAsyncHelper._children_ids(page_block))]  # hijos directos
-        while stack:
-            bid = stack.pop()
-            if bid in seen or bid not in by_id:
-                continue
-            seen.add(bid)
-            b = by_id[bid]
-            # CHILD: LINE→WORD, TABLE→CELL, etc.
-            for cid in ExtractAsyncHelper._children_ids(b):
-                stack.append(cid)
-            # VALUE: KEY_VALUE_SET (KEY → VALUE)
-            for vid in ExtractAsyncHelper._children_ids(b, "VALUE"):
-                stack.append(vid)
-        return seen
-
-    @staticmethod
-    def extract_page_text(ids: set[str], by_id: dict[str, BlockTypeDef]) -> dict:
+    def extract_page_text(ids: list[int], store: TextractBlockStore) -> dict:
         """
         Extrae contenido por página (ejemplo: texto “LINE→WORD”)
         :param ids:
-        :param by_id:
+        :param store:
         :return:
         """
-        lines = [by_id[i].get("Text", "") for i in ids
-                 if i in by_id and by_id[i].get("BlockType") == "LINE"]
+        lines = [store.text(i) for i in store.iter_type(ids, "LINE")]
         return {"text": "\n".join(lines), "lines_count": len(lines)}
 
     @staticmethod
     async def extract_pages_async(
-            pages: List[BlockTypeDef],
-            blocks: List[BlockTypeDef],
+            store: TextractBlockStore,
             batch_size: int = 4,
             max_concurrency: int = 4,
+            table_format: TableFormat | None = None,
     ) -> List[dict]:
-        """Procesa páginas por lotes, en paralelo limitado (CPU-bound en hilos)."""
-        by_id = ExtractAsyncHelper.build_index(blocks)
+        """
+        Procesa páginas por lotes, en paralelo limitado (CPU-bound en hilos).
+        Con `table_format` cada página trae además "structured": secciones de
+        LAYOUT, tablas y campos clave-valor (ver `StructuredContentHelper`).
+        """
         sem = asyncio.Semaphore(max_concurrency)
 
-        async def process_one(page_block: BlockTypeDef) -> dict:
+        async def process_one(page_index: int) -> dict:
             def _work():
-                ids = ExtractAsyncHelper.page_closure_ids(page_block, by_id)
-                return ExtractAsyncHelper.extract_page_text(ids, by_id)
+                ids = ExtractAsyncHelper.page_closure_ids(page_index, store)
+                page = ExtractAsyncHelper.extract_page_text(ids, store)
+                if table_format is not None:
+                    page["structured"] = StructuredContentHelper.render_page(ids, store, table_format)
+                return page
 
             # Evita bloquear el event loop si el cierre es pesado
             async with sem:
                 return await asyncio.to_thread(_work)
 
         # chunking por batches
-        def chunked(seq: List[BlockTypeDef], n: int):
+        def chunked(seq: List[int], n: int):
             for i in range(0, len(seq), n):
                 yield seq[i:i + n]
 
         out: List[dict] = []
-        for batch in chunked(pages, batch_size):
+        for batch in chunked(store.page_indices(), batch_size):
             results = await asyncio.gather(*(process_one(p) for p in batch))
             out.extend(results)
         return out
-
@@ -0,0 +1,166 @@
+from typing import Literal
+
+from infrastructure.adapters.extractors.textract.helpers.textract_block_store import (
+    FLAG_KEY,
+    FLAG_SELECTED,
+    TextractBlockStore,
+)
+
+TableFormat = Literal["markdown", "tsv"]
+
+# Bloques de LAYOUT que solo agregan ruido (y tokens) al contexto del LLM
+_SKIPPED_LAYOUTS = {"LAYOUT_HEADER", "LAYOUT_FOOTER", "LAYOUT_PAGE_NUMBER"}
+_HEADINGS = {"LAYOUT_TITLE": "# ", "LAYOUT_SECTION_HEADER": "## "}
+
+
+class StructuredContentHelper:
+    """
+    Arma el contexto del LLM a partir de lo que Textract ya devuelve con TABLES,
+    LAYOUT y FORMS: secciones en orden de lectura (títulos como encabezados
+    markdown, sin cabeceras ni pies de página), tablas reconstruidas como grilla
+    (markdown o TSV) y pares clave-valor. Si la página no trae LAYOUT se usan
+    sus líneas tal cual.
+    """
+
+    @staticmethod
+    def render_page(ids: list[int], store: TextractBlockStore, table_format: TableFormat = "markdown") -> str:
+        """
+        Contenido estructurado de una página
+        :param ids: bloques de la página (ver `ExtractAsyncHelper.page_closure_ids`)
+        :param store:
+        :param table_format: "markdown" o "tsv"
+        :return:
+        """
+        layout_code = {store.type_code(name) for name in store.layout_types()}
+        list_code = store.type_code("LAYOUT_LIST")
+        layouts = [i for i in ids if store.types[i] in layout_code]
+        tables = list(store.iter_type(ids, "TABLE"))
+        keys = [i for i in store.iter_type(ids, "KEY_VALUE_SET") if store.flags[i] & FLAG_KEY]
+        rendered_tables: set[int] = set()
+        rendered_keys: set[int] = set()
+
+        sections: list[str] = []
+        if not layouts:
+            sections.append("\n".join(store.text(i) for i in store.iter_type(ids, "LINE")))
+
+        for layout in layouts:
+            # Los ítems de una lista se imprimen dentro de la propia lista
+            if store.parent[layout] >= 0 and store.types[store.parent[layout]] == list_code:
+                continue
+            kind = store.block_type(layout)
+            if kind in _SKIPPED_LAYOUTS:
+                continue
+            if kind in _HEADINGS:
+                sections.append(_HEADINGS[kind] + " ".join(StructuredContentHelper._lines(layout, store)))
+            elif kind == "LAYOUT_LIST":
+                items = [
+                    "- " + " ".join(StructuredContentHelper._lines(item, store))
+                    for item in store.children_of(layout)
+                    if store.types[item] in layout_code
+                ]
+                sections.append("\n".join(items))
+            elif kind == "LAYOUT_TABLE":
+                inside = [t for t in tables if t not in rendered_tables and store.contains_center(layout, t)]
+                if not inside:
+                    sections.append("\n".join(StructuredContentHelper._lines(layout, store)))
+                for table in inside:
+                    rendered_tables.add(table)
+                    sections.append(StructuredContentHelper.render_table(table, store, table_format))
+            elif kind == "LAYOUT_KEY_VALUE":
+                inside = [k for k in keys if k not in rendered_keys and store.contains_center(layout, k)]
+                if not inside:
+                    sections.append("\n".join(StructuredContentHelper._lines(layout, store)))
+                rendered_keys.update(inside)
+                sections.append(StructuredContentHelper._render_key_values(inside, store))
+            else:
+                sections.append("\n".join(StructuredContentHelper._lines(layout, store)))
+
+        # Tablas y campos que ningún bloque de LAYOUT cubrió van al final de la página
+        for table in tables:
+            if table not in rendered_tables:
+                sections.append(StructuredContentHelper.render_table(table, store, table_format))
+        pending_keys = [k for k in keys if k not in rendered_keys]
+        if pending_keys:
+            sections.append(StructuredContentHelper._render_key_values(pending_keys, store))
+
+        return "\n\n".join(section for section in sections if section)
+
+    @staticmethod
+    def table_grid(table: int, store: TextractBlockStore) -> list[list[str]]:
+        """
+        Reconstruye la grilla de una TABLE a partir de sus CELL. El texto de una
+        celda combinada (MERGED_CELL) se coloca en su esquina superior izquierda y
+        el resto de posiciones que abarca quedan vacías.
+        """
+        cell_code = store.type_code("CELL")
+        merged_code = store.type_code("MERGED_CELL")
+        cells = [i for i in store.children_of(table) if store.types[i] == cell_code]
+        merged = [i for i in store.children_of(table) if store.types[i] == merged_code]
+        if not cells:
+            return []
+
+        rows = max(store.row[i] + max(store.row_span[i], 1) - 1 for i in cells)
+        columns = max(store.column[i] + max(store.column_span[i], 1) - 1 for i in cells)
+        grid = [[""] * columns for _ in range(rows)]
+        for cell in cells:
+            grid[store.row[cell] - 1][store.column[cell] - 1] = StructuredContentHelper._content(cell, store)
+
+        for block in merged:
+            parts = [
+                StructuredContentHelper._content(cell, store)
+                for cell in store.children_of(block)
+                if store.types[cell] == cell_code
+            ]
+            top, left = store.row[block] - 1, store.column[block] - 1
+            for r in range(top, min(top + store.row_span[block], rows)):
+                for c in range(left, min(left + store.column_span[block], columns)):
+                    grid[r][c] = ""
+            grid[top][left] = " ".join(part for part in parts if part)
+        return grid
+
+    @staticmethod
+    def render_table(table: int, store: TextractBlockStore, table_format: TableFormat = "markdown") -> str:
+        grid = StructuredContentHelper.table_grid(table, store)
+        if not grid:
+            return ""
+        if table_format == "tsv":
+            return "\n".join(
+                "\t".join(value.replace("\t", " ") for value in row) for row in grid
+            )
+
+        def _row(values: list[str]) -> str:
+            # Sin espacios alrededor de los separadores: mismos datos, menos tokens
+            return "|" + "|".join(value.replace("|", "\\|") for value in values) + "|"
+
+        # La primera fila hace de encabezado; markdown exige uno
+        lines = [_row(grid[0]), "|" + "---|" * len(grid[0])]
+        lines.extend(_row(row) for row in grid[1:])
+        return "\n".join(lines)
+
+    # ------------------------------ Métodos privados ------------------------------
+    @staticmethod
+    def _lines(layout: int, store: TextractBlockStore) -> list[str]:
+        line_code = store.type_code("LINE")
+        return [store.text(i) for i in store.children_of(layout) if store.types[i] == line_code]
+
+    @staticmethod
+    def _content(index: int, store: TextractBlockStore) -> str:
+        """Texto de los WORD hijos de una celda o clave/valor; las casillas marcadas como [X]."""
+        word_code = store.type_code("WORD")
+        selection_code = store.type_code("SELECTION_ELEMENT")
+        parts: list[str] = []
+        for child in store.children_of(index):
+            code = store.types[child]
+            if code == word_code:
+                parts.append(store.text(child))
+            elif code == selection_code:
+                parts.append("[X]" if store.flags[child] & FLAG_SELECTED else "[ ]")
+        return " ".join(parts)
+
+    @staticmethod
+    def _render_key_values(keys: list[int], store: TextractBlockStore) -> str:
+        lines = []
+        for key in keys:
+            value = " ".join(StructuredContentHelper._content(v, store) for v in store.values_of(key))
+            lines.append(f"{StructuredContentHelper._content(key, store)}: {value}")
+        return "\n".join(lines)
@@ -0,0 +1,241 @@
+from array import array
+from typing import Any, Iterable, Iterator
+
+# Tipos de bloque conocidos; uno nuevo se agrega al final al aparecer
+_BLOCK_TYPES: list[str] = [
+    "PAGE", "LINE", "WORD", "TABLE", "CELL", "MERGED_CELL", "KEY_VALUE_SET",
+    "SELECTION_ELEMENT", "TABLE_TITLE", "TABLE_FOOTER", "QUERY", "QUERY_RESULT",
+    "SIGNATURE", "LAYOUT_TITLE", "LAYOUT_HEADER", "LAYOUT_FOOTER",
+    "LAYOUT_SECTION_HEADER", "LAYOUT_PAGE_NUMBER", "LAYOUT_LIST", "LAYOUT_FIGURE",
+    "LAYOUT_TABLE", "LAYOUT_KEY_VALUE", "LAYOUT_TEXT",
+]
+
+# Flags por bloque (EntityTypes y SelectionStatus relevantes para texto y tablas)
+FLAG_KEY = 1
+FLAG_VALUE = 2
+FLAG_COLUMN_HEADER = 4
+FLAG_SELECTED = 8
+
+_ENTITY_FLAGS = {"KEY": FLAG_KEY, "VALUE": FLAG_VALUE, "COLUMN_HEADER": FLAG_COLUMN_HEADER}
+_EMPTY: dict[str, Any] = {}
+
+
+class TextractBlockStore:
+    """
+    Representación columnar de los bloques de Textract.
+
+    En lugar de mantener cada `BlockTypeDef` como dict anidado, cada atributo vive
+    en un arreglo compacto indexado por la posición del bloque (struct-of-arrays):
+    tipo, página, flags, texto (offset y largo en un único buffer), celda de tabla
+    y bounding box. Los Ids se internan a índices enteros y las relaciones CHILD y
+    VALUE se guardan en formato CSR (offsets + índices). De cada bloque solo se
+    conservan los campos necesarios para reconstruir texto, tablas y layout.
+
+    Se llena página a página con `add_blocks` (la respuesta puede liberarse
+    enseguida) y `finalize` resuelve las relaciones; después los Ids de texto se
+    descartan.
+    """
+
+    def __init__(self):
+        self._type_names: list[str] = list(_BLOCK_TYPES)
+        self._type_codes: dict[str, int] = {name: code for code, name in enumerate(_BLOCK_TYPES)}
+        self.types = array("B")
+        self.pages = array("H")
+        self.flags = array("B")
+        self.text_start = array("I")
+        self.text_length = array("I")
+        self.row = array("H")
+        self.column = array("H")
+        self.row_span = array("H")
+        self.column_span = array("H")
+        # left, top, width, height por bloque
+        self.bbox = array("f")
+        self.child_start = array("I")
+        self.children = array("I")
+        self.value_start = array("I")
+        self.values = array("I")
+        self.parent = array("i")
+        self._text = ""
+        self._text_parts: list[str] = []
+        self._text_size = 0
+        self._ids: dict[str, int] | None = {}
+        self._pending_children: list[tuple[str, ...] | None] = []
+        self._pending_values: list[tuple[str, ...] | None] = []
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+    # ------------------------------ Carga ------------------------------
+    def add_blocks(self, blocks: Iterable[dict[str, Any]]) -> None:
+        if self._ids is None:
+            raise RuntimeError("El store ya fue finalizado")
+        # Referencias locales: este bucle corre una vez por bloque del documento
+        ids, type_codes, text_parts = self._ids, self._type_codes, self._text_parts
+        pending_children, pending_values = self._pending_children, self._pending_values
+        text_size = self._text_size
+        for block in blocks:
+            ids[block["Id"]] = len(ids)
+            block_type = block.get("BlockType", "")
+            code = type_codes.get(block_type)
+            self.types.append(code if code is not None else self.type_code(block_type))
+            self.pages.append(block.get("Page", 1))
+
+            flags = 0
+            for entity in block.get("EntityTypes", ()):
+                flags |= _ENTITY_FLAGS.get(entity, 0)
+            if block.get("SelectionStatus") == "SELECTED":
+                flags |= FLAG_SELECTED
+            self.flags.append(flags)
+
+            text = block.get("Text", "")
+            self.text_start.append(text_size)
+            self.text_length.append(len(text))
+            if text:
+                text_parts.append(text)
+                text_size += len(text)
+
+            if "RowIndex" in block:
+                self.row.append(block["RowIndex"])
+                self.column.append(block.get("ColumnIndex", 0))
+                self.row_span.append(block.get("RowSpan", 1))
+                self.column_span.append(block.get("ColumnSpan", 1))
+            else:
+                self.row.append(0)
+                self.column.append(0)
+                self.row_span.append(0)
+                self.column_span.append(0)
+
+            box = block.get("Geometry", _EMPTY).get("BoundingBox", _EMPTY)
+            self.bbox.extend(
+                (box.get("Left", 0.0), box.get("Top", 0.0), box.get("Width", 0.0), box.get("Height", 0.0))
+            )
+
+            children = values = None
+            for relationship in block.get("Relationships", ()):
+                kind = relationship.get("Type")
+                # Las celdas combinadas cuelgan de la tabla como un hijo más
+                if kind == "CHILD" or kind == "MERGED_CELL":
+                    children = (children or ()) + tuple(relationship.get("Ids", ()))
+                elif kind == "VALUE":
+                    values = (values or ()) + tuple(relationship.get("Ids", ()))
+            pending_children.append(children)
+            pending_values.append(values)
+        self._text_size = text_size
+
+    def finalize(self) -> "TextractBlockStore":
+        """Resuelve las relaciones a índices y libera los Ids de texto."""
+        if self._ids is None:
+            return self
+        ids = self._ids
+        self._text = "".join(self._text_parts)
+        self._text_parts = []
+        self.parent = array("i", [-1]) * len(self)
+        self.child_start, self.children = self._resolve(self._pending_children, ids, self.parent)
+        self.value_start, self.values = self._resolve(self._pending_values, ids, None)
+        self._pending_children = []
+        self._pending_values = []
+        self._ids = None
+        return self
+
+    @classmethod
+    def from_responses(cls, responses: Iterable[dict[str, Any]]) -> "TextractBlockStore":
+        store = cls()
+        for response in responses:
+            store.add_blocks(response.get("Blocks", []))
+        return store.finalize()
+
+    # ------------------------------ Consultas ------------------------------
+    def type_code(self, name: str) -> int:
+        code = self._type_codes.get(name)
+        if code is None:
+            code = self._type_codes[name] = len(self._type_names)
+            self._type_names.append(name)
+        return code
+
+    def block_type(self, index: int) -> str:
+        return self._type_names[self.types[index]]
+
+    def layout_types(self) -> list[str]:
+        return [name for name in self._type_names if name.startswith("LAYOUT_")]
+
+    def text(self, index: int) -> str:
+        start = self.text_start[index]
+        return self._text[start:start + self.text_length[index]]
+
+    def indices_of(self, name: str) -> list[int]:
+        code = self.type_code(name)
+        return [index for index, value in enumerate(self.types) if value == code]
+
+    def page_indices(self) -> list[int]:
+        return self.indices_of("PAGE")
+
+    def children_of(self, index: int) -> array:
+        return self.children[self.child_start[index]:self.child_start[index + 1]]
+
+    def values_of(self, index: int) -> array:
+        return self.values[self.value_start[index]:self.value_start[index + 1]]
+
+    def closure(self, root: int) -> list[int]:
+        """Índices alcanzables desde `root` por CHILD y VALUE, en orden de lectura."""
+        seen = {root}
+        stack = list(self.children_of(root))
+        while stack:
+            index = stack.pop()
+            if index in seen:
+                continue
+            seen.add(index)
+            stack.extend(self.children_of(index))
+            stack.extend(self.values_of(index))
+        # El orden de los bloques en la respuesta es el orden de lectura de Textract
+        return sorted(seen)
+
+    def iter_type(self, indices: Iterable[int], name: str) -> Iterator[int]:
+        code = self.type_code(name)
+        types = self.types
+        return (index for index in indices if types[index] == code)
+
+    def box(self, index: int) -> tuple[float, float, float, float]:
+        """(left, top, width, height) del bloque."""
+        offset = index * 4
+        return tuple(self.bbox[offset:offset + 4])
+
+    def contains_center(self, outer: int, inner: int) -> bool:
+        """Si el centro del bloque `inner` cae dentro del bounding box de `outer`."""
+        left, top, width, height = self.box(outer)
+        inner_left, inner_top, inner_width, inner_height = self.box(inner)
+        x, y = inner_left + inner_width / 2, inner_top + inner_height / 2
+        return left <= x <= left + width and top <= y <= top + height
+
+    def geometry(self):
+        """Bounding boxes como arreglo NumPy (n, 4) de float32, sin copiar el buffer."""
+        import numpy as np
+
+        return np.frombuffer(self.bbox, dtype=np.float32).reshape(-1, 4)
+
+    def nbytes(self) -> int:
+        """Bytes ocupados por las columnas y el buffer de texto."""
+        columns = (
+            self.types, self.pages, self.flags, self.text_start, self.text_length,
+            self.row, self.column, self.row_span, self.column_span, self.bbox,
+            self.child_start, self.children, self.value_start, self.values, self.parent,
+        )
+        return sum(column.itemsize * len(column) for column in columns) + len(self._text)
+
+    # ------------------------------ Métodos privados ------------------------------
+    @staticmethod
+    def _resolve(
+        pending: list[tuple[str, ...] | None], ids: dict[str, int], parent: array | None
+    ) -> tuple[array, array]:
+        start = array("I", [0])
+        targets = array("I")
+        for index, related in enumerate(pending):
+            if related:
+                for related_id in related:
+                    target = ids.get(related_id)
+                    if target is None:
+                        continue
+                    targets.append(target)
+                    if parent is not None and parent[target] < 0:
+                        parent[target] = index
+            start.append(len(targets))
+        return start, targets
@@ -1,97 +1,290 @@
+import io
 import logging
 import asyncio
+import os
+import uuid
 from typing import Any
 
 import anyio
 import boto3
 from botocore.exceptions import ClientError
+from mypy_boto3_s3 import S3Client
 from mypy_boto3_textract import TextractClient
 from mypy_boto3_textract.type_defs import (
     StartDocumentAnalysisResponseTypeDef,
     GetDocumentAnalysisResponseTypeDef,
-    BlockTypeDef,
 )
+from pypdf import PdfReader
+from pypdf.errors import PdfReadError
 
 from application.ports.extractor_document_port import ExtractorDocumentPort
+from application.ports.telemetry_port import NullTelemetry, TelemetryPort
 from domain.models.states.document_contract_state import DocumentContractState
 from domain.models.states.etl_base_state import EtlBaseState
+from infrastructure.adapters.extractors.extracted_items import build_extracted_items
+from infrastructure.adapters.extractors.pdf.pdf_text_layer import PdfTextLayer
 from infrastructure.adapters.extractors.textract.helpers.extract_async_helper import ExtractAsyncHelper
+from infrastructure.adapters.extractors.textract.helpers.textract_block_store import TextractBlockStore
 from infrastructure.config.app_settings import get_app_settings
 
+logger = logging.getLogger("app.adapters")
+
+# Formatos que la API síncrona acepta tal cual desde S3 (una sola página)
+_SYNC_IMAGE_EXTENSIONS = {".png", ".jpg", ".jpeg"}
+
 
 class TextractExtractorDocument(ExtractorDocumentPort):
-    def __init__(self):
+    def __init__(
+            self,
+            telemetry: TelemetryPort | None = None,
+            client: TextractClient | None = None,
+            s3_client: S3Client | None = None,
+            triage: bool = True,
+            sync_api: bool = True,
+    ):
+        """
+        `client` permite inyectar un cliente que graba o reproduce respuestas.
+        `triage` y `sync_api` en False fuerzan el job asíncrono sobre el objeto
+        original aunque la configuración los habilite (ej: fixtures que solo
+        cubren la API asíncrona).
+        """
         self.aws_settings = get_app_settings().aws_settings
-        self.textract: TextractClient = boto3.client("textract", region_name=self.aws_settings.region)
+        self.textract_settings = get_app_settings().textract_settings
+        self.textract: TextractClient = client or boto3.client(
+            "textract", region_name=self.aws_settings.region
+        )
+        self.s3: S3Client = s3_client or boto3.client("s3", region_name=self.aws_settings.region)
+        self._triage = triage and bool(self.textract_settings.triage_document_types or self.textract_settings.page_ranges)
+        self._sync_api = sync_api and self.textract_settings.sync_max_bytes > 0
+        self._telemetry = telemetry or NullTelemetry()
 
     # ---------- ASYNC API del Port ----------
-    async def extract_pipeline(self, document_data: DocumentContractState, origin: str) -> list[EtlBaseState]:
-        job_id = await self._start_analysis(document_data.key)
-        if job_id is None:
+    async def extract_pipeline(
+            self, document_data: DocumentContractState, origin: str, content: bytes | None = None
+    ) -> list[EtlBaseState]:
+        """
+        `content` son los bytes del objeto si quien llama ya los descargó (ej: el
+        extractor de capa de texto al delegar): el triage y la API síncrona los
+        usan sin volver a leer S3.
+        """
+        document_type = document_data.document_type.value
+        features = self.textract_settings.features_for(document_type)
+        if self._triage_applies(document_data.key, document_type):
+            per_page = await self._extract_with_triage(document_data.key, document_type, features, content)
+        else:
+            per_page = await self._ocr_pages(document_data.key, features, content)
+        if per_page is None:
             return []
 
-        results_from_analysis = await self._get_analysis_result(job_id)
-        pages, blocks = type(self)._group_by_page(results_from_analysis)
+        # El LLM recibe tablas y secciones; el contenido total sigue siendo el texto plano
+        llm_key = "structured" if self.textract_settings.llm_context == "structured" else "text"
 
+        return build_extracted_items(document_data.record_id, origin, per_page, llm_key)
+
+    # ------------------------------ Métodos privados ASYNC ------------------------------
+    async def _pages(self, store: TextractBlockStore) -> list[dict]:
         # Procesar contenido por página (paralelismo controlado en memoria)
-        per_page = await ExtractAsyncHelper.extract_pages_async(
-            pages=pages,
-            blocks=blocks,
+        structured = self.textract_settings.llm_context == "structured"
+        return await ExtractAsyncHelper.extract_pages_async(
+            store=store,
             batch_size=4,  # 1 si quieres estrictamente secuencial por página
             max_concurrency=4,  # techo de paralelismo
+            table_format=self.textract_settings.table_format if structured else None,
         )
 
+    async def _ocr_pages(
+            self, file_key: str, features: list[str], content: bytes | None = None
+    ) -> list[dict] | None:
+        """OCR del documento completo: API síncrona si califica, si no un job asíncrono."""
+        store = None
+        if self._sync_api:
+            document = await self._sync_document(file_key, content)
+            if document is not None:
+                store = await self._analyze_sync(document, features)
+        if store is None:
+            store = await self._analyze_async(file_key, features)
+            if store is None:
+                return None
+        return await self._pages(store)
 
-        items_to_send: list[EtlBaseState] = []
-        if origin == "inscripciones":
-            for p in per_page:
-                item = EtlBaseState(
-                    record_id=document_data.record_id,
-                    extract_success=True,
-                    transform_success=False,
-                    load_success=False,
-                    document_content_total=p.get("text", ""),
-                    document_content_llm=p.get("text", ""),
-                )
-                items_to_send.append(item)
+    def _triage_applies(self, file_key: str, document_type: str) -> bool:
+        settings = self.textract_settings
+        return (
+            self._triage
+            and file_key.lower().endswith(".pdf")
+            and (document_type in settings.triage_document_types or document_type in settings.page_ranges)
+        )
+
+    async def _extract_with_triage(
+            self, file_key: str, document_type: str, features: list[str], content: bytes | None = None
+    ) -> list[dict] | None:
+        """
+        Lee el PDF localmente antes del OCR: las páginas con capa de texto
+        embebida (al menos `triage_min_chars` caracteres) se toman tal cual y
+        solo las escaneadas van a Textract, en un PDF con esas páginas. Las
+        páginas fuera del rango configurado para el tipo no se procesan.
+        """
+        settings = self.textract_settings
+        bucket = get_app_settings().s3_settings.bucket
+
+        def _read():
+            data = content
+            if data is None:
+                size = self.s3.head_object(Bucket=bucket, Key=file_key)["ContentLength"]
+                if size > settings.triage_max_bytes:
+                    return None
+                data = self.s3.get_object(Bucket=bucket, Key=file_key)["Body"].read()
+            elif len(data) > settings.triage_max_bytes:
+                return None
+            reader = PdfReader(io.BytesIO(data))
+            page_count = len(reader.pages)
+            pages = PdfTextLayer.parse_page_range(settings.page_ranges.get(document_type), page_count)
+            texts = PdfTextLayer.page_texts(reader, pages)
+            scanned = [i for i in pages if not PdfTextLayer.has_text(texts[i], settings.triage_min_chars)]
+            # Si todas las páginas necesitan OCR se manda el objeto original
+            subset = PdfTextLayer.subset(reader, scanned) if scanned and len(scanned) < page_count else None
+            return data, page_count, pages, texts, scanned, subset
+
+        try:
+            triage = await anyio.to_thread.run_sync(_read)
+        except (ClientError, PdfReadError, ValueError) as e:
+            logger.warning("no se pudo leer %s antes del OCR: %s", file_key, e)
+            triage = None
+        if triage is None:
+            return await self._ocr_pages(file_key, features, content)
+
+        content, page_count, pages, texts, scanned, subset = triage
+        self._telemetry.increment("etl.textract.triage_pages", len(pages) - len(scanned), {"route": "local"})
+        self._telemetry.increment("etl.textract.triage_pages", len(scanned), {"route": "ocr"})
+        self._telemetry.increment("etl.textract.triage_pages", page_count - len(pages), {"route": "skipped"})
+        logger.debug(
+            "triage de %s: %d páginas con texto, %d a OCR, %d fuera de rango",
+            file_key, len(pages) - len(scanned), len(scanned), page_count - len(pages),
+        )
+        if not scanned:
+            return [PdfTextLayer.page_content(texts[i]) for i in pages]
+
+        if subset is None:
+            ocr = await self._ocr_pages(file_key, features, content)
         else:
-            # Ejemplo simple: concatenar texto por página
-            first_pages = "\n\n".join(p.get("text", "") for i, p in enumerate(per_page) if i < 20)
-            full_text = "\n\n".join(p.get("text", "") for p in per_page)
-            # print("full text", full_text)
-            item = EtlBaseState(
-                record_id=document_data.record_id,
-                extract_success=True,
-                transform_success=False,
-                load_success=False,
-                document_content_total=first_pages,
-                document_content_llm=full_text,
+            ocr = await self._ocr_subset(subset, len(scanned), features)
+        if ocr is None:
+            return None
+        ocr_by_page = dict(zip(scanned, ocr))
+        return [ocr_by_page[i] if i in ocr_by_page else PdfTextLayer.page_content(texts[i]) for i in pages]
+
+    async def _ocr_subset(self, content: bytes, page_count: int, features: list[str]) -> list[dict] | None:
+        """
+        OCR de un PDF armado en memoria. Con una sola página va por la API
+        síncrona; si no se sube a un prefijo temporal del bucket (los jobs
+        asíncronos solo leen de S3) y se borra al terminar.
+        """
+        if self._sync_api and page_count == 1 and len(content) <= self.textract_settings.sync_max_bytes:
+            store = await self._analyze_sync({"Bytes": content}, features)
+            if store is not None:
+                return await self._pages(store)
+
+        bucket = get_app_settings().s3_settings.bucket
+        staging_key = f"{self.textract_settings.staging_prefix}{uuid.uuid4().hex}.pdf"
+        await anyio.to_thread.run_sync(
+            lambda: self.s3.put_object(Bucket=bucket, Key=staging_key, Body=content)
+        )
+        try:
+            store = await self._analyze_async(staging_key, features)
+        finally:
+            try:
+                await anyio.to_thread.run_sync(
+                    lambda: self.s3.delete_object(Bucket=bucket, Key=staging_key)
+                )
+            except ClientError as e:
+                logger.warning("no se pudo borrar %s: %s", staging_key, e)
+        return None if store is None else await self._pages(store)
+
+    async def _sync_document(self, file_key: str, content: bytes | None = None) -> dict[str, Any] | None:
+        """
+        Documentos chicos de una sola página (imágenes o PDFs) califican para
+        analyze_document / detect_document_text: responden en segundos, sin job
+        ni polling. Retorna el `Document` a enviar o None si no califica.
+        """
+        extension = os.path.splitext(file_key)[1].lower()
+        if extension not in _SYNC_IMAGE_EXTENSIONS and extension != ".pdf":
+            return None
+        bucket = get_app_settings().s3_settings.bucket
+        max_bytes = self.textract_settings.sync_max_bytes
+
+        def _call() -> dict[str, Any] | None:
+            if content is None:
+                size = self.s3.head_object(Bucket=bucket, Key=file_key)["ContentLength"]
+                if size > max_bytes:
+                    return None
+            if extension != ".pdf":
+                return {"S3Object": {"Bucket": bucket, "Name": file_key}}
+            data = content if content is not None else (
+                self.s3.get_object(Bucket=bucket, Key=file_key)["Body"].read()
             )
-            items_to_send.append(item)
+            if len(data) > max_bytes or len(PdfReader(io.BytesIO(data)).pages) != 1:
+                return None
+            return {"Bytes": data}
 
-        return items_to_send
+        try:
+            return await anyio.to_thread.run_sync(_call)
+        except (ClientError, PdfReadError) as e:
+            logger.warning("sin API síncrona para %s, se usa la asíncrona: %s", file_key, e)
+            return None
 
-    # ------------------------------ Métodos privados ASYNC ------------------------------
-    async def _start_analysis(self, file_key: str) -> str | None:
-        """Envuelve start_document_analysis (sync) en un hilo y retorna JobId."""
+    async def _analyze_sync(self, document: dict[str, Any], features: list[str]) -> TextractBlockStore | None:
+        """Llama a la API síncrona; None si falla y hay que usar la asíncrona."""
+
+        def _call() -> dict[str, Any]:
+            operation = "analyze_document" if features else "detect_document_text"
+            with self._telemetry.timer("etl.adapter", {"adapter": "textract", "operation": operation}):
+                if features:
+                    return self.textract.analyze_document(Document=document, FeatureTypes=features)
+                return self.textract.detect_document_text(Document=document)
+
+        try:
+            resp = await anyio.to_thread.run_sync(_call)
+        except ClientError as e:
+            logger.warning("falló la API síncrona de textract, se usa la asíncrona: %s", e)
+            return None
+        self._telemetry.increment("etl.textract.route", 1, {"api": "sync"})
+        return TextractBlockStore.from_responses([resp])
+
+    async def _analyze_async(self, file_key: str, features: list[str]) -> TextractBlockStore | None:
+        job_id = await self._start_analysis(file_key, features)
+        if job_id is None:
+            return None
+        return await self._get_analysis_result(job_id, features)
+
+    async def _start_analysis(self, file_key: str, features: list[str]) -> str | None:
+        """
+        Envuelve start_document_analysis (sync) en un hilo y retorna JobId. Sin
+        features se usa start_document_text_detection, que solo extrae texto.
+        """
+        self._telemetry.increment("etl.textract.route", 1, {"api": "async"})
         try:
             def _call() -> StartDocumentAnalysisResponseTypeDef:
-                return self.textract.start_document_analysis(
-                    DocumentLocation={"S3Object": {
-                        "Bucket": get_app_settings().s3_settings.bucket,
-                        "Name": file_key
-                    }},
-                    FeatureTypes=["TABLES", "LAYOUT"],
-                )
+                location = {"S3Object": {
+                    "Bucket": get_app_settings().s3_settings.bucket,
+                    "Name": file_key
+                }}
+                operation = "start_document_analysis" if features else "start_document_text_detection"
+                with self._telemetry.timer("etl.adapter", {"adapter": "textract", "operation": operation}):
+                    if features:
+                        return self.textract.start_document_analysis(
+                            DocumentLocation=location,
+                            FeatureTypes=features,
+                        )
+                    return self.textract.start_document_text_detection(DocumentLocation=location)
 
             resp = await anyio.to_thread.run_sync(_call)
             return resp.get("JobId")
         except ClientError as e:
-            logging.exception("error en start_analysis: %s", e)
+            logger.exception("error en start_analysis: %s", e)
             return None
 
     async def _get_document_analysis_page(
-            self, job_id: str, next_token: str | None = None
+            self, job_id: str, features: list[str], next_token: str | None = None
     ) -> GetDocumentAnalysisResponseTypeDef:
         """Una página de resultados (maneja NextToken)."""
 
@@ -99,37 +292,33 @@ class TextractExtractorDocument(ExtractorDocumentPort):
             kwargs = {"JobId": job_id}
             if next_token:
                 kwargs["NextToken"] = next_token
-            return self.textract.get_document_analysis(**kwargs)
+            operation = "get_document_analysis" if features else "get_document_text_detection"
+            with self._telemetry.timer("etl.adapter", {"adapter": "textract", "operation": operation}):
+                return getattr(self.textract, operation)(**kwargs)
 
         return await anyio.to_thread.run_sync(_call)
 
-    async def _get_analysis_result(self, job_id: str) -> list[GetDocumentAnalysisResponseTypeDef]:
+    async def _get_analysis_result(self, job_id: str, features: list[str]) -> TextractBlockStore:
         """
         Polling asíncrono hasta que el Job termine, luego pagina todo el resultado.
+        Cada página se vuelca al store columnar apenas llega, así las respuestas
+        completas (dicts anidados) no se acumulan en memoria.
         """
-        resp = await self._get_document_analysis_page(job_id)
-        logging.info("job status: %s", resp["JobStatus"])
-
-        while resp["JobStatus"] == "IN_PROGRESS":
-            await asyncio.sleep(5)  # NO usar time.sleep en async
-            resp = await self._get_document_analysis_page(job_id)
-            logging.info("job status: %s", resp["JobStatus"])
-
-        all_responses: list[GetDocumentAnalysisResponseTypeDef] = [resp]
-        while "NextToken" in all_responses[-1]:
-            next_token = all_responses[-1]["NextToken"]  # type: ignore[index]
-            next_page = await self._get_document_analysis_page(job_id, next_token)
-            all_responses.append(next_page)
-
-        return all_responses
-
-    @staticmethod
-    def _group_by_page(
-            response: list[GetDocumentAnalysisResponseTypeDef],
-    ) -> tuple[list[BlockTypeDef], list[BlockTypeDef]]:
-        """
-        Agrupa los blocks por página y retorna (pages, blocks).
-        """
-        blocks: list[BlockTypeDef] = [b for r in response for b in r.get("Blocks", [])]
-        pages: list[BlockTypeDef] = [p for p in blocks if p.get("BlockType") == "PAGE"]
-        return pages, blocks
+        # Tiempo total del job en Textract, incluyendo la espera entre polls
+        with self._telemetry.timer("etl.textract.job"):
+            resp = await self._get_document_analysis_page(job_id, features)
+            logger.debug("job status: %s", resp["JobStatus"], extra={"job_id": job_id})
+
+            while resp["JobStatus"] == "IN_PROGRESS":
+                self._telemetry.increment("etl.textract.polls")
+                await asyncio.sleep(5)  # NO usar time.sleep en async
+                resp = await self._get_document_analysis_page(job_id, features)
+                logger.debug("job status: %s", resp["JobStatus"], extra={"job_id": job_id})
+
+        store = TextractBlockStore()
+        store.add_blocks(resp.get("Blocks", []))
+        while "NextToken" in resp:
+            resp = await self._get_document_analysis_page(job_id, features, resp["NextToken"])  # type: ignore[typeddict-item]
+            store.add_blocks(resp.get("Blocks", []))
+
+        return store.finalize()
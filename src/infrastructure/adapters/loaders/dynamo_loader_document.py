@@ -6,14 +6,23 @@ from boto3.dynamodb.conditions import Key, Attr
 from botocore.config import Config
 from mypy_boto3_dynamodb.service_resource import DynamoDBServiceResource, Table
 from application.ports.loader_metadata_port import LoaderMetadataPort
+from application.ports.telemetry_port import NullTelemetry, TelemetryPort
 from domain.models.states.etl_base_state import EtlBaseState
 from infrastructure.config.app_settings import AppSettings, get_app_settings
 from typing import Any
 
+# El texto del documento va a S3; en la metadata no se serializa ni el contenido ni sus handles
+_CONTENT_FIELDS = {
+    "document_content_total",
+    "document_content_llm",
+    "document_content_total_ref",
+    "document_content_llm_ref",
+}
 
 class DynamoLoaderMetadata(LoaderMetadataPort):
-    def __init__(self):
+    def __init__(self, telemetry: TelemetryPort | None = None):
         self.app_settings: AppSettings = get_app_settings()
+        self._telemetry = telemetry or NullTelemetry()
         dynamo_resource = self._get_configuration()
         self.si_table: Table = dynamo_resource.Table(
             self.app_settings.table_settings.si_table
@@ -33,26 +42,44 @@ class DynamoLoaderMetadata(LoaderMetadataPort):
     def save_metadata(self, document_type: str, data: list[EtlBaseState]) -> None:
 
         for d in data:
-            query_output = self.si_table.query(
-                KeyConditionExpression=Key("supervisoryRecordId").eq(d.record_id),
-                IndexName="supervisoryRecordId-index",
-                Limit=1,
-            )
+            with self._telemetry.timer("etl.adapter", {"adapter": "dynamodb", "operation": "query"}):
+                query_output = self.si_table.query(
+                    KeyConditionExpression=Key("supervisoryRecordId").eq(d.record_id),
+                    IndexName="supervisoryRecordId-index",
+                    Limit=1,
+                )
+            if not query_output["Items"]:
+                raise LookupError(f"No existe el registro supervisado {d.record_id}")
             metadata = query_output["Items"][0]
 
-            new_metadata = d.model_dump(mode="json", exclude_none=True)
+            new_metadata = {
+                key: str(value)
+                for key, value in d.model_dump(
+                    mode="json", exclude_none=True, exclude=_CONTENT_FIELDS
+                ).items()
+            }
             new_metadata["document_type"] = document_type
-            for [key, value] in new_metadata.items():
-                new_metadata[key] = str(value)
 
             metadata["metadata"].update(new_metadata)
-            self.si_table.update_item(
-                Key={
-                    "id": metadata["id"],
-                },
-                UpdateExpression="set metadata = :metadata",
-                ExpressionAttributeValues={
-                    ":metadata": metadata["metadata"],
-                },
-                ReturnValues="UPDATED_NEW",
+            with self._telemetry.timer("etl.adapter", {"adapter": "dynamodb", "operation": "update_item"}):
+                self.si_table.update_item(
+                    Key={
+                        "id": metadata["id"],
+                    },
+                    UpdateExpression="set metadata = :metadata",
+                    ExpressionAttributeValues={
+                        ":metadata": metadata["metadata"],
+                    },
+                    ReturnValues="UPDATED_NEW",
+                )
+
+    def find_record_id(self, key: str) -> str | None:
+        table_settings = self.app_settings.table_settings
+        with self._telemetry.timer("etl.adapter", {"adapter": "dynamodb", "operation": "query"}):
+            query_output = self.si_table.query(
+                KeyConditionExpression=Key(table_settings.si_key_attribute).eq(key),
+                IndexName=table_settings.si_key_index,
+                Limit=1,
             )
+        items = query_output["Items"]
+        return str(items[0]["supervisoryRecordId"]) if items else None
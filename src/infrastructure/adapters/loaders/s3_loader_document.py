@@ -1,13 +1,15 @@
 from application.ports.loader_document_port import LoaderDocumentPort
+from application.ports.telemetry_port import NullTelemetry, TelemetryPort
 from infrastructure.config.app_settings import AppSettings, get_app_settings
 from mypy_boto3_s3.service_resource import Bucket
 
 import boto3
 
 class S3LoaderDocument(LoaderDocumentPort):
-    def __init__(self):
+    def __init__(self, telemetry: TelemetryPort | None = None):
         self.app_settings: AppSettings = get_app_settings()
         self.bucket: Bucket = self._get_cofiguration()
+        self._telemetry = telemetry or NullTelemetry()
         
     def _get_cofiguration(self) -> Bucket:
         s3 = boto3.resource("s3", region_name=self.app_settings.aws_settings.region)
@@ -15,4 +17,5 @@ class S3LoaderDocument(LoaderDocumentPort):
         
     
     def save_document(self, key: str, data: bytes) -> None:
-        self.bucket.put_object(Key=key, Body=data)
\ No newline at end of file
+        with self._telemetry.timer("etl.adapter", {"adapter": "s3", "operation": "put_object"}):
+            self.bucket.put_object(Key=key, Body=data)
\ No newline at end of file
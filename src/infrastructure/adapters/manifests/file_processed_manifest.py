@@ -0,0 +1,42 @@
+import os
+import threading
+
+from application.ports.processed_manifest_port import ProcessedManifestPort
+
+
+class FileProcessedManifest(ProcessedManifestPort):
+    """
+    Manifiesto en un archivo de texto, una clave por línea. Se carga completo al
+    iniciar y cada clave nueva se agrega al final con flush, así un backfill
+    interrumpido retoma sin volver a procesar lo que ya terminó.
+    """
+
+    def __init__(self, path: str):
+        self._path = path
+        self._lock = threading.Lock()
+        self._keys: set[str] = set()
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self._keys = {line.rstrip("\n") for line in f if line.strip()}
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8")
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def contains(self, key: str) -> bool:
+        return key in self._keys
+
+    def add(self, key: str) -> None:
+        with self._lock:
+            if key in self._keys:
+                return
+            self._keys.add(key)
+            self._file.write(f"{key}\n")
+            self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
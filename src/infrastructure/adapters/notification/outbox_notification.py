@@ -0,0 +1,106 @@
+import asyncio
+import logging
+
+from application.ports.notification_port import NotificationDeliveryError, NotificationPort
+from application.ports.telemetry_port import NullTelemetry, TelemetryPort
+from domain.models.notification import Notification
+
+
+class OutboxNotification(NotificationPort):
+    """
+    Outbox en memoria delante de otro NotificationPort.
+
+    Acumula las notificaciones de todos los flujos concurrentes y las despacha en
+    segundo plano cuando se llena un lote (batch_size) o vence el intervalo
+    (flush_interval). `notify` solo retorna cuando el lote que contiene sus mensajes
+    fue enviado, por lo que los errores del envío llegan al que notificó.
+    """
+
+    def __init__(
+        self,
+        delegate: NotificationPort,
+        batch_size: int = 10,
+        flush_interval: float = 0.5,
+        telemetry: TelemetryPort | None = None,
+    ):
+        self.logger = logging.getLogger("app.notifications")
+        self._delegate = delegate
+        self._batch_size = max(1, batch_size)
+        self._flush_interval = flush_interval
+        self._pending: list[tuple[Notification, asyncio.Future]] = []
+        self._wakeup: asyncio.Event | None = None
+        self._worker: asyncio.Task | None = None
+        self._closing = False
+        self._telemetry = telemetry or NullTelemetry()
+
+    async def notify(self, messages: list[Notification]) -> None:
+        if not messages:
+            return
+        self._ensure_worker()
+        loop = asyncio.get_running_loop()
+        futures: list[asyncio.Future] = []
+        for message in messages:
+            future = loop.create_future()
+            self._pending.append((message, future))
+            futures.append(future)
+        self._telemetry.adjust("etl.notification.queued", len(messages))
+
+        if len(self._pending) >= self._batch_size:
+            self._wakeup.set()
+        await asyncio.gather(*futures)
+
+    async def aclose(self) -> None:
+        """Despacha lo pendiente y detiene el worker de fondo."""
+        self._closing = True
+        if self._worker is None or self._worker.done():
+            await self._flush()
+            return
+        self._wakeup.set()
+        await self._worker
+
+    # ------------------------------ Métodos privados ------------------------------
+    def _ensure_worker(self) -> None:
+        if self._worker is not None and not self._worker.done():
+            return
+        self._closing = False
+        self._wakeup = asyncio.Event()
+        self._worker = asyncio.create_task(self._run(), name="notification-outbox")
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self._flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self._flush()
+            if self._closing and not self._pending:
+                return
+
+    async def _flush(self) -> None:
+        while self._pending:
+            batch = self._pending[: self._batch_size]
+            del self._pending[: self._batch_size]
+            self._telemetry.adjust("etl.notification.queued", -len(batch))
+            self._telemetry.record("etl.notification.batch_size", len(batch))
+            try:
+                await self._delegate.notify([message for message, _ in batch])
+            except NotificationDeliveryError as e:
+                # Solo fallan los que no se entregaron; el resto del lote sí llegó
+                self.logger.error(f"Error enviando lote de notificaciones: {str(e)}")
+                for message, future in batch:
+                    if not future.done():
+                        if message.id in e.failed_ids:
+                            future.set_exception(e)
+                        else:
+                            future.set_result(None)
+                continue
+            except Exception as e:
+                self.logger.error(f"Error enviando lote de notificaciones: {str(e)}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for _, future in batch:
+                if not future.done():
+                    future.set_result(None)
@@ -1,7 +1,12 @@
 import boto3
 import json
+import logging
+import time
 
-from application.ports.notification_port import NotificationPort
+import anyio
+
+from application.ports.notification_port import NotificationDeliveryError, NotificationPort
+from application.ports.telemetry_port import NullTelemetry, TelemetryPort
 from mypy_boto3_sqs import SQSClient
 
 from botocore.config import Config
@@ -9,11 +14,16 @@ from infrastructure.config.app_settings import AppSettings, get_app_settings
 
 from domain.models.notification import Notification
 
+# Límite de entradas por llamada de send_message_batch impuesto por SQS
+SQS_MAX_BATCH_ENTRIES = 10
+
 
 class SqsNotification(NotificationPort):
-    def __init__(self):
+    def __init__(self, telemetry: TelemetryPort | None = None):
         self.app_settings: AppSettings = get_app_settings()
         self.queue: SQSClient = self._get_configuration()
+        self._telemetry = telemetry or NullTelemetry()
+        self.logger = logging.getLogger("app.notifications")
 
     def _get_configuration(self) -> SQSClient:
         _cfg = Config(
@@ -26,14 +36,56 @@ class SqsNotification(NotificationPort):
         )
         return sqs_client
 
-    def notify(self, notifications: list[Notification]):
+    async def notify(self, notifications: list[Notification]) -> None:
+        """
+        Envía las notificaciones en lotes de SQS sin bloquear el event loop. Si al
+        agotar los reintentos quedan entradas rechazadas, lanza
+        NotificationDeliveryError con sus ids (el resto sí quedó entregado).
+        """
         sqs_messages = [
             {"Id": notification.id, "MessageBody": notification.message.model_dump_json(by_alias=True)}
             for notification in notifications
         ]
+        failed: dict[str, str] = {}
+        for i in range(0, len(sqs_messages), SQS_MAX_BATCH_ENTRIES):
+            failed.update(
+                await anyio.to_thread.run_sync(
+                    self._send_batch, sqs_messages[i:i + SQS_MAX_BATCH_ENTRIES]
+                )
+            )
+        if failed:
+            raise NotificationDeliveryError(set(failed), "; ".join(sorted(set(failed.values()))))
 
-        print("sqs_messages", sqs_messages)
-        print("queue_url", self.app_settings.sqs_settings.queue_url)
-        self.queue.send_message_batch(
-            QueueUrl=self.app_settings.sqs_settings.queue_url, Entries=sqs_messages
-        )
+    def _send_batch(self, entries: list[dict]) -> dict[str, str]:
+        """
+        send_message_batch responde 200 aunque rechace entradas: las de `Failed`
+        se reintentan con backoff (salvo errores del emisor, que no se resuelven
+        reintentando). Retorna {Id: motivo} de las que no se entregaron.
+        """
+        sqs_settings = self.app_settings.sqs_settings
+        failed: dict[str, str] = {}
+        attempt = 1
+        while True:
+            self.logger.debug(
+                "Enviando %d notificaciones a %s (intento %d)", len(entries), sqs_settings.queue_url, attempt
+            )
+            with self._telemetry.timer("etl.adapter", {"adapter": "sqs", "operation": "send_message_batch"}):
+                response = self.queue.send_message_batch(QueueUrl=sqs_settings.queue_url, Entries=entries)
+            rejected = {item["Id"]: item for item in response.get("Failed", [])}
+            if rejected:
+                self._telemetry.increment("etl.notification.rejected", len(rejected))
+            for entry_id, item in rejected.items():
+                failed[entry_id] = f"{item.get('Code')}: {item.get('Message', '')}"
+            entries = [
+                entry for entry in entries
+                if entry["Id"] in rejected and not rejected[entry["Id"]].get("SenderFault")
+            ]
+            if not entries or attempt >= sqs_settings.max_attempts:
+                break
+            self.logger.warning(f"SQS rechazó {len(entries)} notificaciones; reintento {attempt}")
+            time.sleep(sqs_settings.retry_backoff * 2 ** (attempt - 1))
+            attempt += 1
+            # Un reintento exitoso deja de contar como fallido
+            for entry in entries:
+                failed.pop(entry["Id"], None)
+        return failed
@@ -0,0 +1,79 @@
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+
+class S3ListingCache:
+    """
+    Caché local del listado de S3 por carpeta, en un archivo JSON. Cada entrada
+    guarda las claves con su LastModified, el momento del listado y la marca de
+    agua (el LastModified más reciente de la carpeta).
+
+    Una carpeta se sirve desde la caché mientras su listado tenga menos de
+    `ttl_seconds`, o siempre si su marca de agua es más antigua que `stable_days`:
+    los meses ya cerrados no reciben archivos nuevos, así que un re-escaneo solo
+    vuelve a listar las carpetas con actividad reciente.
+    """
+
+    def __init__(self, path: str, ttl_seconds: int = 3600, stable_days: int | None = None):
+        self.logger = logging.getLogger("app.adapters")
+        self._path = path
+        self._ttl_seconds = ttl_seconds
+        self._stable_after = timedelta(days=stable_days) if stable_days is not None else None
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._entries: dict[str, dict[str, Any]] = {}
+        if os.path.exists(path):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError) as e:
+                self.logger.warning("Se descarta la caché de listado %s: %s", path, e)
+
+    def get(self, bucket_name: str, prefix: str) -> list[dict[str, Any]] | None:
+        """Objetos de la carpeta (Key y LastModified) o None si hay que volver a listarla"""
+        with self._lock:
+            entry = self._entries.get(f"{bucket_name}/{prefix}")
+        if entry is None:
+            return None
+        fresh = time.time() - entry["listed_at"] < self._ttl_seconds
+        stable = (
+            self._stable_after is not None
+            and entry["watermark"] is not None
+            and datetime.fromisoformat(entry["watermark"]) < datetime.now(timezone.utc) - self._stable_after
+        )
+        if not (fresh or stable):
+            return None
+        return [
+            {"Key": key, "LastModified": datetime.fromisoformat(last_modified)}
+            for key, last_modified in entry["objects"]
+        ]
+
+    def put(self, bucket_name: str, prefix: str, objects: list[dict[str, Any]]) -> None:
+        watermark = max((obj["LastModified"] for obj in objects), default=None)
+        entry = {
+            "listed_at": time.time(),
+            "watermark": watermark.isoformat() if watermark is not None else None,
+            "objects": [[obj["Key"], obj["LastModified"].isoformat()] for obj in objects],
+        }
+        with self._lock:
+            self._entries[f"{bucket_name}/{prefix}"] = entry
+            self._dirty = True
+
+    def save(self) -> None:
+        """Escribe la caché si cambió; se reemplaza el archivo completo para no dejarlo a medias"""
+        with self._lock:
+            if not self._dirty:
+                return
+            directory = os.path.dirname(self._path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            temporary = f"{self._path}.tmp"
+            with open(temporary, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f, ensure_ascii=False)
+            os.replace(temporary, self._path)
+            self._dirty = False
@@ -1,56 +1,204 @@
+import logging
 import os.path
+import queue
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterator
+
 import boto3
 from mypy_boto3_s3 import S3Client
 from application.ports.poller_document_port import PollerDocumentPort
+from application.ports.telemetry_port import NullTelemetry, TelemetryPort
+from domain.models.enums.document_type import DocumentType
 from domain.models.states.document_contract_state import DocumentContractState
+from infrastructure.adapters.pollers.s3_listing_cache import S3ListingCache
 from infrastructure.config.app_settings import get_app_settings
 
+# Páginas ya filtradas que esperan a ser consumidas antes de frenar a los hilos de listado
+_QUEUE_SIZE = 16
+# Objetos por página de list_objects_v2; también el tamaño de lote al servir desde la caché
+_PAGE_SIZE = 1000
+_DONE = object()
+
 
 class S3PollerDocument(PollerDocumentPort):
-    def __init__(self):
+    """
+    Lista los documentos de un prefijo del bucket. Primero descubre las carpetas
+    del prefijo (ej: "Mayo 2023/") con Delimiter="/" y luego lista cada carpeta
+    en paralelo, hasta `list_concurrency` a la vez. Los documentos se filtran por
+    extensión a medida que llega cada página y se emiten en cuanto están listos,
+    sin un orden fijo entre carpetas.
+    """
+
+    def __init__(
+            self,
+            telemetry: TelemetryPort | None = None,
+            s3_client: S3Client | None = None,
+            listing_cache: S3ListingCache | None = None,
+    ):
         self.app_settings = get_app_settings()
-        self.s3_client: S3Client = boto3.client("s3", self.app_settings.aws_settings.region)
+        self.settings = self.app_settings.poller_settings
+        self.s3_client: S3Client = s3_client or boto3.client("s3", self.app_settings.aws_settings.region)
+        self.logger = logging.getLogger("app.adapters")
+        self._telemetry = telemetry or NullTelemetry()
+        self._cache = listing_cache
+        if self._cache is None and self.settings.cache_path:
+            self._cache = S3ListingCache(
+                self.settings.cache_path, self.settings.cache_ttl_seconds, self.settings.cache_stable_days
+            )
 
-    def get_file_names(self, bucket_name: str, prefix_path: str, document_type: str = "pdf",
-                       position: int | None = None) -> list[DocumentContractState]:
+    def iter_file_names(self, bucket_name: str, prefix_path: str, flow: DocumentType,
+                        session_id: str, parent_id: str,
+                        document_type: str = "pdf") -> Iterator[DocumentContractState]:
         """
-        Obtiene todos los nombres de los archivos y retorna el tipo seleccionado
+        Emite cada documento con la extensión seleccionada apenas llega la página
+        de resultados que lo contiene, sea cual sea la carpeta
         """
-        results: list[DocumentContractState] = []
+        def to_document(obj: dict[str, Any]) -> DocumentContractState | None:
+            return self._to_document(bucket_name, prefix_path, obj, flow, session_id, parent_id, document_type)
+
+        try:
+            folders, files = self._discover(bucket_name, prefix_path)
+            # Archivos sueltos en la raíz del prefijo, fuera de cualquier carpeta
+            for obj in files:
+                document = to_document(obj)
+                if document is not None:
+                    yield document
+            if folders:
+                yield from self._list_concurrently(bucket_name, folders, to_document)
+        finally:
+            if self._cache is not None:
+                self._cache.save()
+
+    # ------------------------------ Métodos privados ------------------------------
+    def _discover(self, bucket_name: str, prefix_path: str) -> tuple[list[str], list[dict[str, Any]]]:
+        """Carpetas inmediatas del prefijo y archivos que están directamente en él"""
         paginator = self.s3_client.get_paginator("list_objects_v2")
+        pages = paginator.paginate(Bucket=bucket_name, Prefix=prefix_path, Delimiter="/")
+        folders: list[str] = []
+        files: list[dict[str, Any]] = []
+        for page in self._timed_pages(pages):
+            folders.extend(item["Prefix"] for item in page.get("CommonPrefixes", []))
+            files.extend(page.get("Contents", []))
+        self.logger.info("Prefijo %s: %d carpetas a listar", prefix_path, len(folders))
+        return folders, files
 
-        for page in paginator.paginate(Bucket=bucket_name, Prefix=prefix_path):
-            for obj in page.get("Contents", []):
-                key = obj["Key"]
-                if key.endswith("/"):
-                    continue
-                if not key.lower().endswith(f".{document_type.lower()}"):
-                    continue
-                # Se retira el prefijo base ("ej: Pólizas/")
-                rel_path = key.removeprefix(prefix_path)
-                # folder = parte antes del archivo ("ej: Mayo 2023")
-                folder = os.path.dirname(rel_path)
-                # document_name = parte después del folder ("ej: documento.pdf")
-                file_name = os.path.basename(rel_path)
-                # Se intenta parsear mes y año
+    def _list_concurrently(
+            self,
+            bucket_name: str,
+            folders: list[str],
+            to_document: Callable[[dict[str, Any]], DocumentContractState | None],
+    ) -> Iterator[DocumentContractState]:
+        """
+        Un hilo por carpeta (hasta `list_concurrency`) lista y filtra; cada página
+        filtrada llega entera por una cola acotada (un paso por la cola por
+        documento cuesta más que el propio listado), así un consumidor lento frena
+        el listado en lugar de acumular el bucket en memoria
+        """
+        results: queue.Queue = queue.Queue(maxsize=_QUEUE_SIZE)
+        stop = threading.Event()
+
+        def put(item: Any) -> None:
+            while not stop.is_set():
                 try:
+                    results.put(item, timeout=0.1)
+                    return
+                except queue.Full:
+                    continue
+
+        def worker(folder: str) -> None:
+            try:
+                for page in self._list_folder(bucket_name, folder, stop):
+                    documents = [document for document in map(to_document, page) if document is not None]
+                    if documents:
+                        put(documents)
+                put(_DONE)
+            except Exception as e:
+                put(e)
+
+        pool = ThreadPoolExecutor(
+            max_workers=max(1, min(self.settings.list_concurrency, len(folders))),
+            thread_name_prefix="s3-list",
+        )
+        try:
+            for folder in folders:
+                pool.submit(worker, folder)
+            pending = len(folders)
+            while pending:
+                item = results.get()
+                if item is _DONE:
+                    pending -= 1
+                elif isinstance(item, Exception):
+                    raise item
+                else:
+                    yield from item
+        finally:
+            # Si el consumidor corta el generador (o falla una carpeta) los hilos dejan de listar
+            stop.set()
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def _list_folder(
+            self, bucket_name: str, folder: str, stop: threading.Event
+    ) -> Iterator[list[dict[str, Any]]]:
+        """Objetos de la carpeta por páginas, desde la caché si está vigente o desde S3"""
+        cached = self._cache.get(bucket_name, folder) if self._cache is not None else None
+        if cached is not None:
+            self._telemetry.increment("etl.poller.listing_cache", 1, {"result": "hit"})
+            for start in range(0, len(cached), _PAGE_SIZE):
+                if stop.is_set():
+                    return
+                yield cached[start:start + _PAGE_SIZE]
+            return
+        if self._cache is not None:
+            self._telemetry.increment("etl.poller.listing_cache", 1, {"result": "miss"})
+
+        listed: list[dict[str, Any]] = []
+        paginator = self.s3_client.get_paginator("list_objects_v2")
+        for page in self._timed_pages(paginator.paginate(Bucket=bucket_name, Prefix=folder)):
+            if stop.is_set():
+                return
+            objects = page.get("Contents", [])
+            if self._cache is not None:
+                listed.extend({"Key": obj["Key"], "LastModified": obj["LastModified"]} for obj in objects)
+            yield objects
+        # Solo un listado completo reemplaza la entrada de la caché
+        if self._cache is not None:
+            self._cache.put(bucket_name, folder, listed)
 
-                    period_month, period_year = folder.split(" ")
-                except Exception as e:
-                    print(f"Error en get_file_names {str(e)}")
-                    period_month, period_year = None, None
-                new_element = DocumentContractState(
-                    key=key,
-                    folder=folder,
-                    document_name=file_name,
-                    period_month=period_month,
-                    period_year=period_year,
-                )
-
-                results.append(
-                    new_element
-                )
-        if position is not None:
-            return [results[position]]
-        return results
+    def _timed_pages(self, pages: Iterator[dict[str, Any]]) -> Iterator[dict[str, Any]]:
+        iterator = iter(pages)
+        while True:
+            with self._telemetry.timer("etl.adapter", {"adapter": "s3", "operation": "list_objects_v2"}):
+                page = next(iterator, None)
+            if page is None:
+                return
+            yield page
 
+    def _to_document(self, bucket_name: str, prefix_path: str, obj: dict[str, Any], flow: DocumentType,
+                     session_id: str, parent_id: str, document_type: str) -> DocumentContractState | None:
+        key = obj["Key"]
+        if key.endswith("/"):
+            return None
+        if not key.lower().endswith(f".{document_type.lower()}"):
+            return None
+        # Se retira el prefijo base ("ej: Pólizas/")
+        rel_path = key.removeprefix(prefix_path)
+        # folder = última carpeta antes del archivo ("ej: Mayo 2023")
+        folder = os.path.basename(os.path.dirname(rel_path))
+        # Se intenta parsear mes y año
+        period_month, _, period_year = folder.strip().rpartition(" ")
+        if not period_month or not period_year.isdigit():
+            self.logger.warning("No se pudo obtener el periodo de %s (carpeta %r)", key, folder)
+            return None
+        return DocumentContractState(
+            # Id provisional y estable por objeto; el backfill lo reemplaza por el del
+            # registro supervisado existente antes de procesar
+            record_id=str(uuid.uuid5(uuid.NAMESPACE_URL, f"s3://{bucket_name}/{key}")),
+            parent_id=parent_id,
+            key=key,
+            session_id=session_id,
+            document_type=flow,
+            period_month=period_month,
+            period_year=period_year,
+        )
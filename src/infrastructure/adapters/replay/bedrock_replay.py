@@ -0,0 +1,60 @@
+import time
+from typing import Any
+
+from infrastructure.adapters.replay.fixture_store import FixtureStore, request_key
+
+_KIND = "bedrock"
+
+
+def _converse_request(kwargs: dict[str, Any]) -> dict[str, Any]:
+    # Solo lo que define la respuesta; el resto (p. ej. metadata) no entra en la clave
+    return {
+        key: kwargs.get(key)
+        for key in ("modelId", "messages", "system", "toolConfig", "inferenceConfig")
+    }
+
+
+class RecordingBedrockRuntimeClient:
+    """
+    Envuelve el cliente boto3 de bedrock-runtime y graba cada respuesta de
+    Converse con su latencia, indexada por el hash del request.
+    """
+
+    def __init__(self, client: Any, store: FixtureStore):
+        self._client = client
+        self._store = store
+
+    def converse(self, **kwargs: Any) -> dict[str, Any]:
+        started = time.monotonic()
+        response = self._client.converse(**kwargs)
+        request = _converse_request(kwargs)
+        self._store.write(
+            _KIND,
+            request_key(request),
+            {
+                "request": request,
+                "elapsed": time.monotonic() - started,
+                "response": {k: v for k, v in response.items() if k != "ResponseMetadata"},
+            },
+        )
+        return response
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._client, name)
+
+
+class ReplayBedrockRuntimeClient:
+    """
+    Responde Converse con la respuesta grabada para el mismo request, esperando la
+    latencia grabada dividida por `speed` (speed=0 no espera).
+    """
+
+    def __init__(self, store: FixtureStore, speed: float = 0.0):
+        self._store = store
+        self._speed = speed
+
+    def converse(self, **kwargs: Any) -> dict[str, Any]:
+        fixture = self._store.read(_KIND, request_key(_converse_request(kwargs)))
+        if self._speed > 0:
+            time.sleep(fixture["elapsed"] / self._speed)
+        return fixture["response"]
@@ -0,0 +1,52 @@
+import gzip
+import hashlib
+import json
+import os
+import re
+from typing import Any
+
+
+class FixtureNotFoundError(KeyError):
+    """No hay una respuesta grabada para la llamada que se quiere reproducir."""
+
+
+class FixtureStore:
+    """
+    Guarda las respuestas grabadas como JSON comprimido (gzip), un archivo por
+    documento de Textract o por request de Bedrock, bajo `<directorio>/<tipo>/`.
+    """
+
+    def __init__(self, directory: str):
+        self._directory = directory
+
+    def write(self, kind: str, key: str, payload: dict[str, Any]) -> str:
+        path = self._path(kind, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporary = f"{path}.tmp"
+        with gzip.open(temporary, "wt", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False, default=str)
+        # Escritura atómica: un lector nunca ve un fixture a medias
+        os.replace(temporary, path)
+        return path
+
+    def read(self, kind: str, key: str) -> dict[str, Any]:
+        path = self._path(kind, key)
+        if not os.path.exists(path):
+            raise FixtureNotFoundError(f"Sin fixture de {kind} para {key!r} ({path})")
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return json.load(f)
+
+    def exists(self, kind: str, key: str) -> bool:
+        return os.path.exists(self._path(kind, key))
+
+    def _path(self, kind: str, key: str) -> str:
+        # Nombre legible más un hash para que claves distintas no colisionen
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+        slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", key)[-80:].strip("_")
+        return os.path.join(self._directory, kind, f"{slug}-{digest}.json.gz")
+
+
+def request_key(request: dict[str, Any]) -> str:
+    """Clave estable de un request: hash del JSON canónico."""
+    canonical = json.dumps(request, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
@@ -0,0 +1,36 @@
+from typing import Any
+
+import boto3
+
+from infrastructure.adapters.replay.bedrock_replay import (
+    RecordingBedrockRuntimeClient,
+    ReplayBedrockRuntimeClient,
+)
+from infrastructure.adapters.replay.fixture_store import FixtureStore
+from infrastructure.adapters.replay.textract_replay import (
+    RecordingTextractClient,
+    ReplayTextractClient,
+)
+from infrastructure.adapters.transformers.bed_rock_transformer_document import BedRockTransformerDocument
+from infrastructure.config.app_settings import ReplaySettings
+
+
+def build_replay_clients(settings: ReplaySettings, region: str | None) -> tuple[Any, Any]:
+    """
+    Retorna (cliente de Textract, cliente de bedrock-runtime) para los adaptadores.
+    Con mode=off retorna (None, None) y cada adaptador crea su cliente boto3.
+    """
+    if settings.mode == "off":
+        return None, None
+    store = FixtureStore(settings.fixtures_dir)
+    if settings.mode == "replay":
+        return (
+            ReplayTextractClient(store, settings.speed),
+            ReplayBedrockRuntimeClient(store, settings.speed),
+        )
+    return (
+        RecordingTextractClient(boto3.client("textract", region_name=region), store),
+        RecordingBedrockRuntimeClient(
+            BedRockTransformerDocument.build_runtime_client(region), store
+        ),
+    )
@@ -0,0 +1,138 @@
+import threading
+import time
+from typing import Any
+
+from infrastructure.adapters.replay.fixture_store import FixtureNotFoundError, FixtureStore
+
+_KIND = "textract"
+_TERMINAL_STATUSES = {"SUCCEEDED", "FAILED", "PARTIAL_SUCCESS"}
+
+
+def _document_key(document_location: dict[str, Any]) -> str:
+    s3_object = document_location["S3Object"]
+    return f"{s3_object['Bucket']}/{s3_object['Name']}"
+
+
+def _fixture_key(request: dict[str, Any]) -> str:
+    """
+    Documento más FeatureTypes del request: el mismo documento analizado con otro
+    perfil de features devuelve otros bloques, así que es otro fixture (sin
+    features es DetectDocumentText).
+    """
+    features = "+".join(sorted(request.get("FeatureTypes") or [])) or "TEXT"
+    return f"{_document_key(request['DocumentLocation'])}#{features}"
+
+
+class RecordingTextractClient:
+    """
+    Envuelve el cliente boto3 de Textract y graba, por documento y FeatureTypes,
+    cada página de GetDocumentAnalysis (o GetDocumentTextDetection) con el tiempo
+    transcurrido desde el inicio del job. El fixture se escribe cuando se leyó la
+    última página del resultado.
+    """
+
+    def __init__(self, client: Any, store: FixtureStore):
+        self._client = client
+        self._store = store
+        self._lock = threading.Lock()
+        self._jobs: dict[str, dict[str, Any]] = {}
+
+    def start_document_analysis(self, **kwargs: Any) -> dict[str, Any]:
+        return self._start("start_document_analysis", kwargs)
+
+    def start_document_text_detection(self, **kwargs: Any) -> dict[str, Any]:
+        return self._start("start_document_text_detection", kwargs)
+
+    def get_document_analysis(self, **kwargs: Any) -> dict[str, Any]:
+        return self._record_page(self._client.get_document_analysis(**kwargs), kwargs)
+
+    def get_document_text_detection(self, **kwargs: Any) -> dict[str, Any]:
+        return self._record_page(self._client.get_document_text_detection(**kwargs), kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._client, name)
+
+    def _start(self, operation: str, kwargs: dict[str, Any]) -> dict[str, Any]:
+        started = time.monotonic()
+        response = getattr(self._client, operation)(**kwargs)
+        with self._lock:
+            self._jobs[response["JobId"]] = {
+                "fixture_key": _fixture_key(kwargs),
+                "document_key": _document_key(kwargs["DocumentLocation"]),
+                "feature_types": kwargs.get("FeatureTypes", []),
+                "started": started,
+                "pages": [],
+            }
+        return response
+
+    def _record_page(self, response: dict[str, Any], kwargs: dict[str, Any]) -> dict[str, Any]:
+        job_id = kwargs["JobId"]
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or response.get("JobStatus") not in _TERMINAL_STATUSES:
+                return response
+            job["pages"].append(
+                {
+                    "next_token": kwargs.get("NextToken"),
+                    "offset": time.monotonic() - job["started"],
+                    "response": response,
+                }
+            )
+            finished = "NextToken" not in response
+            if finished:
+                del self._jobs[job_id]
+        if finished:
+            self._store.write(
+                _KIND,
+                job["fixture_key"],
+                {
+                    "document_key": job["document_key"],
+                    "feature_types": job["feature_types"],
+                    "pages": job["pages"],
+                },
+            )
+        return response
+
+
+class ReplayTextractClient:
+    """
+    Sirve los resultados grabados en lugar de llamar a Textract. Con speed=1 se
+    respetan los tiempos grabados (espera del job y de cada página), con speed=10
+    van diez veces más rápido y con speed=0 no se espera.
+    """
+
+    def __init__(self, store: FixtureStore, speed: float = 0.0):
+        self._store = store
+        self._speed = speed
+
+    def start_document_analysis(self, **kwargs: Any) -> dict[str, Any]:
+        fixture_key = _fixture_key(kwargs)
+        if not self._store.exists(_KIND, fixture_key):
+            raise FixtureNotFoundError(
+                f"Sin fixture de textract para {fixture_key!r}; con otros FeatureTypes hay que volver a grabar"
+            )
+        # El JobId es la propia clave del fixture: no hace falta estado entre llamadas
+        return {"JobId": fixture_key}
+
+    def start_document_text_detection(self, **kwargs: Any) -> dict[str, Any]:
+        return self.start_document_analysis(**kwargs)
+
+    def get_document_text_detection(self, **kwargs: Any) -> dict[str, Any]:
+        return self.get_document_analysis(**kwargs)
+
+    def get_document_analysis(self, **kwargs: Any) -> dict[str, Any]:
+        fixture = self._store.read(_KIND, kwargs["JobId"])
+        pages: list[dict[str, Any]] = fixture["pages"]
+        next_token = kwargs.get("NextToken")
+        for index, page in enumerate(pages):
+            if page["next_token"] == next_token:
+                previous = pages[index - 1]["offset"] if index > 0 else 0.0
+                self._wait(page["offset"] - previous)
+                return page["response"]
+        raise FixtureNotFoundError(
+            f"Sin página grabada para {kwargs['JobId']!r} con NextToken={next_token!r}"
+        )
+
+    def _wait(self, seconds: float) -> None:
+        if self._speed > 0 and seconds > 0:
+            time.sleep(seconds / self._speed)
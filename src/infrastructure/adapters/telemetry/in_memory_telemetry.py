@@ -0,0 +1,130 @@
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Iterator
+
+from application.ports.telemetry_port import Attributes, TelemetryPort
+
+_SeriesKey = tuple[str, tuple[tuple[str, str], ...]]
+
+# Span activo en la tarea o thread actual (las tareas de asyncio copian el contexto)
+_current_span: ContextVar[str | None] = ContextVar("current_span", default=None)
+
+
+@dataclass
+class FinishedSpan:
+    name: str
+    attributes: dict[str, str]
+    start: float
+    duration: float
+    error: str | None = None
+    parent: str | None = None
+
+
+class InMemoryTelemetry(TelemetryPort):
+    """
+    Exportador en memoria: guarda cada serie por nombre y atributos. Sirve para
+    inspeccionar las métricas en los benchmarks y en pruebas sin un backend real.
+    Las llamadas pueden venir de worker threads, por eso todo pasa por un lock.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms: dict[_SeriesKey, list[float]] = defaultdict(list)
+        self._counters: dict[_SeriesKey, int] = defaultdict(int)
+        self._levels: dict[_SeriesKey, int] = defaultdict(int)
+        self.spans: list[FinishedSpan] = []
+
+    def record(self, name: str, value: float, attributes: Attributes | None = None) -> None:
+        with self._lock:
+            self._histograms[self._key(name, attributes)].append(value)
+
+    def increment(self, name: str, value: int = 1, attributes: Attributes | None = None) -> None:
+        with self._lock:
+            self._counters[self._key(name, attributes)] += value
+
+    def adjust(self, name: str, delta: int, attributes: Attributes | None = None) -> None:
+        with self._lock:
+            self._levels[self._key(name, attributes)] += delta
+
+    @contextmanager
+    def span(self, name: str, attributes: Attributes | None = None) -> Iterator[None]:
+        parent = _current_span.get()
+        token = _current_span.set(name)
+        start = time.perf_counter()
+        error: str | None = None
+        try:
+            yield
+        except Exception as e:
+            error = e.__class__.__name__
+            raise
+        finally:
+            _current_span.reset(token)
+            finished = FinishedSpan(
+                name=name,
+                attributes=dict(attributes or {}),
+                start=start,
+                duration=time.perf_counter() - start,
+                error=error,
+                parent=parent,
+            )
+            with self._lock:
+                self.spans.append(finished)
+
+    # ------------------------------ Consultas ------------------------------
+    def values(self, name: str, **attributes: str) -> list[float]:
+        """Valores del histograma; sin atributos junta todas las series del nombre."""
+        with self._lock:
+            return [
+                value
+                for key, series in self._histograms.items()
+                if self._matches(key, name, attributes)
+                for value in series
+            ]
+
+    def count(self, name: str, **attributes: str) -> int:
+        with self._lock:
+            return sum(
+                value for key, value in self._counters.items() if self._matches(key, name, attributes)
+            )
+
+    def level(self, name: str, **attributes: str) -> int:
+        with self._lock:
+            return sum(
+                value for key, value in self._levels.items() if self._matches(key, name, attributes)
+            )
+
+    def series(self) -> dict[str, dict[str, float]]:
+        """Resumen por serie (cantidad y suma de cada histograma, total de cada contador)."""
+        with self._lock:
+            summary: dict[str, dict[str, float]] = {}
+            for key, values in self._histograms.items():
+                summary[self._label(key)] = {"count": len(values), "sum": sum(values)}
+            for key, value in self._counters.items():
+                summary[self._label(key)] = {"total": value}
+            for key, value in self._levels.items():
+                summary[self._label(key)] = {"level": value}
+            return summary
+
+    # ------------------------------ Métodos privados ------------------------------
+    @staticmethod
+    def _key(name: str, attributes: Attributes | None) -> _SeriesKey:
+        return name, tuple(sorted((attributes or {}).items()))
+
+    @staticmethod
+    def _matches(key: _SeriesKey, name: str, attributes: dict[str, str]) -> bool:
+        key_name, key_attributes = key
+        if key_name != name:
+            return False
+        present = dict(key_attributes)
+        return all(present.get(k) == v for k, v in attributes.items())
+
+    @staticmethod
+    def _label(key: _SeriesKey) -> str:
+        name, attributes = key
+        if not attributes:
+            return name
+        return f"{name}{{{','.join(f'{k}={v}' for k, v in attributes)}}}"
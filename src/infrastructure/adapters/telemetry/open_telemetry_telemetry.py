@@ -0,0 +1,58 @@
+import threading
+from typing import ContextManager
+
+from opentelemetry import metrics, trace
+
+from application.ports.telemetry_port import Attributes, TelemetryPort
+
+_INSTRUMENTATION_NAME = "sbs-suptech-etl"
+
+
+class OpenTelemetryTelemetry(TelemetryPort):
+    """
+    Publica métricas y spans con la API de OpenTelemetry sobre los providers
+    globales; qué exportador se usa (Prometheus, OTLP) lo define el factory.
+    Los instrumentos se crean la primera vez que se usa cada nombre.
+    """
+
+    def __init__(self):
+        self._meter = metrics.get_meter(_INSTRUMENTATION_NAME)
+        self._tracer = trace.get_tracer(_INSTRUMENTATION_NAME)
+        self._lock = threading.Lock()
+        self._histograms: dict[str, metrics.Histogram] = {}
+        self._counters: dict[str, metrics.Counter] = {}
+        self._up_down_counters: dict[str, metrics.UpDownCounter] = {}
+
+    def record(self, name: str, value: float, attributes: Attributes | None = None) -> None:
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.get(name)
+                if histogram is None:
+                    unit = "s" if name.endswith(".duration") else "1"
+                    histogram = self._meter.create_histogram(name, unit=unit)
+                    self._histograms[name] = histogram
+        histogram.record(value, attributes=attributes)
+
+    def increment(self, name: str, value: int = 1, attributes: Attributes | None = None) -> None:
+        counter = self._counters.get(name)
+        if counter is None:
+            with self._lock:
+                counter = self._counters.get(name)
+                if counter is None:
+                    counter = self._meter.create_counter(name)
+                    self._counters[name] = counter
+        counter.add(value, attributes=attributes)
+
+    def adjust(self, name: str, delta: int, attributes: Attributes | None = None) -> None:
+        counter = self._up_down_counters.get(name)
+        if counter is None:
+            with self._lock:
+                counter = self._up_down_counters.get(name)
+                if counter is None:
+                    counter = self._meter.create_up_down_counter(name)
+                    self._up_down_counters[name] = counter
+        counter.add(delta, attributes=attributes)
+
+    def span(self, name: str, attributes: Attributes | None = None) -> ContextManager[None]:
+        return self._tracer.start_as_current_span(name, attributes=attributes)
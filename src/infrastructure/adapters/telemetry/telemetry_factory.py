@@ -0,0 +1,60 @@
+import logging
+
+from application.ports.telemetry_port import NullTelemetry, TelemetryPort
+from infrastructure.adapters.telemetry.in_memory_telemetry import InMemoryTelemetry
+from infrastructure.config.app_settings import TelemetrySettings
+
+app_logger = logging.getLogger("app.environment")
+
+
+def build_telemetry(settings: TelemetrySettings) -> TelemetryPort:
+    """
+    Crea la telemetría según la configuración. El backend otel registra los
+    providers globales de OpenTelemetry con un lector Prometheus (si hay puerto) y
+    un exportador OTLP de spans (si hay endpoint).
+    """
+    if settings.backend == "memory":
+        return InMemoryTelemetry()
+    if settings.backend == "otel":
+        _configure_open_telemetry(settings)
+        from infrastructure.adapters.telemetry.open_telemetry_telemetry import (
+            OpenTelemetryTelemetry,
+        )
+
+        return OpenTelemetryTelemetry()
+    return NullTelemetry()
+
+
+def _configure_open_telemetry(settings: TelemetrySettings) -> None:
+    # Dependencias opcionales: solo se requieren con este backend
+    from opentelemetry import metrics, trace
+    from opentelemetry.sdk.metrics import MeterProvider
+    from opentelemetry.sdk.resources import SERVICE_NAME, Resource
+    from opentelemetry.sdk.trace import TracerProvider
+
+    resource = Resource.create({SERVICE_NAME: settings.service_name})
+
+    readers = []
+    if settings.prometheus_port is not None:
+        from opentelemetry.exporter.prometheus import PrometheusMetricReader
+        from prometheus_client import start_http_server
+
+        try:
+            start_http_server(settings.prometheus_port)
+            readers.append(PrometheusMetricReader())
+        except OSError as e:
+            # Con varios procesos en el mismo host solo el primero toma el puerto
+            app_logger.warning(
+                f"No se pudo exponer métricas en el puerto {settings.prometheus_port}: {str(e)}"
+            )
+    metrics.set_meter_provider(MeterProvider(resource=resource, metric_readers=readers))
+
+    tracer_provider = TracerProvider(resource=resource)
+    if settings.otlp_endpoint:
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+
+        tracer_provider.add_span_processor(
+            BatchSpanProcessor(OTLPSpanExporter(endpoint=settings.otlp_endpoint))
+        )
+    trace.set_tracer_provider(tracer_provider)
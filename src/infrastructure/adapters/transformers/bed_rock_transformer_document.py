@@ -8,6 +8,7 @@ from botocore.exceptions import ClientError, ReadTimeoutError, EndpointConnectio
     BotoCoreError
 from langchain_aws import ChatBedrockConverse
 from pydantic import SecretStr, BaseModel
+from application.ports.telemetry_port import NullTelemetry, TelemetryPort
 from application.ports.transform_document_port import TransformDocumentPort
 from domain.models.states.etl_inscripciones_state import EtlInscripcionesState, EtlInscripcionChild
 from domain.models.states.etl_polizas_state import EtlPolizasState
@@ -16,13 +17,18 @@ from infrastructure.config.app_settings import AppSettings, get_app_settings
 
 T = TypeVar("T", bound=BaseModel)
 
+logger = logging.getLogger("app.adapters")
+
 
 class BedRockTransformerDocument(TransformDocumentPort):
-    def __init__(self):
+    def __init__(self, telemetry: TelemetryPort | None = None, client: Any = None):
         self._app_settings: AppSettings = get_app_settings()
-        self.bedrock_converse: ChatBedrockConverse = self._get_bedrock()
+        # `client` permite inyectar un cliente de bedrock-runtime que graba o reproduce respuestas
+        self.bedrock_converse: ChatBedrockConverse = self._get_bedrock(client)
+        self._telemetry = telemetry or NullTelemetry()
 
-    def _get_bedrock(self) -> ChatBedrockConverse:
+    @staticmethod
+    def build_runtime_client(region: str | None) -> Any:
         retries_config: Any = {"max_attempts": 12, "mode": "adaptive"}
         config = Config(
             retries=retries_config,
@@ -31,16 +37,23 @@ class BedRockTransformerDocument(TransformDocumentPort):
             tcp_keepalive=True,
             max_pool_connections=50
         )
-        client = boto3.client("bedrock-runtime", region_name=self._app_settings.aws_settings.region, config=config)
+        return boto3.client("bedrock-runtime", region_name=region, config=config)
+
+    def _get_bedrock(self, client: Any = None) -> ChatBedrockConverse:
+        region = self._app_settings.aws_settings.region
+        # `client` es el cliente de runtime que usa Converse; `bedrock_client` es el
+        # del plano de control y se deja que langchain lo cree
         return ChatBedrockConverse(
             model="anthropic.claude-3-5-sonnet-20240620-v1:0",
-            region_name=self._app_settings.aws_settings.region,
-            bedrock_client=client,
+            region_name=region,
+            client=client or BedRockTransformerDocument.build_runtime_client(region),
         )
 
     # ------ Pólizas
     def llm_caller_polizas(self, context: str) -> EtlPolizasState | None:
-        return BedRockTransformerDocument.with_throttling_retry(self._llm_polizas_internal_chain, context)
+        return BedRockTransformerDocument.with_throttling_retry(
+            self._llm_polizas_internal_chain, context, on_retry=self._count_retry
+        )
 
     def _llm_polizas_internal_chain(self, context: str) -> EtlPolizasState:
         poliza_system_prompt = """Eres un experto obteniendo información de las pólizas; donde debes analizar la 
@@ -55,13 +68,13 @@ class BedRockTransformerDocument(TransformDocumentPort):
             ("system", f"{poliza_system_prompt}"),
             ("human", f"{context}")
         ]
-        chain = self.bedrock_converse.with_structured_output(EtlPolizasState)
-        results = chain.invoke(messages)
-        return EtlPolizasState.model_validate(results)
+        return self._invoke_structured(EtlPolizasState, messages, "polizas")
 
     # ----- Inscripciones
     def llm_caller_inscripciones(self, context: str) -> EtlInscripcionChild | None:
-        return BedRockTransformerDocument.with_throttling_retry(self._llm_inscripciones_internal_chain, context)
+        return BedRockTransformerDocument.with_throttling_retry(
+            self._llm_inscripciones_internal_chain, context, on_retry=self._count_retry
+        )
 
     def _llm_inscripciones_internal_chain(self, context: str) -> EtlInscripcionChild:
         inscripciones_system_prompt = """Eres un experto obteniendo información de las inscripciones (números de 
@@ -76,13 +89,13 @@ class BedRockTransformerDocument(TransformDocumentPort):
             ("system", f"{inscripciones_system_prompt}"),
             ("human", f"{context}")
         ]
-        chain = self.bedrock_converse.with_structured_output(EtlInscripcionChild)
-        results = chain.invoke(messages)
-        return EtlInscripcionChild.model_validate(results)
+        return self._invoke_structured(EtlInscripcionChild, messages, "inscripciones")
 
     # --- Tasaciones
     def llm_caller_tasaciones(self, context: str) -> EtlTasacionesState | None:
-        return BedRockTransformerDocument.with_throttling_retry(self._llm_tasaciones_internal_chain, context)
+        return BedRockTransformerDocument.with_throttling_retry(
+            self._llm_tasaciones_internal_chain, context, on_retry=self._count_retry
+        )
 
     def _llm_tasaciones_internal_chain(self, context: str) -> EtlTasacionesState:
         tasacion_system_prompt = """Eres un experto obteniendo información de las tasaciones, para lo cual debes 
@@ -100,13 +113,30 @@ class BedRockTransformerDocument(TransformDocumentPort):
             ("system", f"{tasacion_system_prompt}"),
             ("human", f"{context}")
         ]
-        chain = self.bedrock_converse.with_structured_output(EtlTasacionesState)
-        results = chain.invoke(messages)
-        return EtlTasacionesState.model_validate(results)
+        return self._invoke_structured(EtlTasacionesState, messages, "tasaciones")
+
+    def _invoke_structured(self, schema: type[T], messages: list[tuple[str, str]], flow: str) -> T:
+        """Invoca el modelo con salida estructurada y registra la duración y los tokens usados."""
+        chain = self.bedrock_converse.with_structured_output(schema, include_raw=True)
+        with self._telemetry.timer("etl.adapter", {"adapter": "bedrock", "operation": flow}):
+            output = chain.invoke(messages)
+
+        usage = getattr(output["raw"], "usage_metadata", None) or {}
+        for token_type in ("input_tokens", "output_tokens"):
+            if token_type in usage:
+                self._telemetry.record(
+                    "etl.bedrock.tokens", usage[token_type], {"flow": flow, "type": token_type}
+                )
+        if output.get("parsing_error") is not None:
+            raise output["parsing_error"]
+        return schema.model_validate(output["parsed"])
+
+    def _count_retry(self, reason: str) -> None:
+        self._telemetry.increment("etl.adapter.retries", 1, {"adapter": "bedrock", "reason": reason})
 
     @staticmethod
     def with_throttling_retry(func: Callable[..., T], *args, max_retries=5, backoff_base=1.0, backoff_factor=2.0,
-                              max_backoff=30.0,
+                              max_backoff=30.0, on_retry: Callable[[str], None] | None = None,
                               **kwargs):
         """
         Ejecuta func(*args, **kwargs) con manejo de ThrottlingException y backoff.
@@ -118,6 +148,7 @@ class BedRockTransformerDocument(TransformDocumentPort):
             backoff_base: segundos de espera inicial
             backoff_factor: multiplicador exponencial
             max_backoff: límite máximo de espera en segundos
+            on_retry: callback opcional que recibe el motivo de cada reintento
         """
         retries = 0
         while True:
@@ -128,8 +159,12 @@ class BedRockTransformerDocument(TransformDocumentPort):
                 code = (e.response or {}).get("Error", {}).get("Code", "")
                 if code == "ThrottlingException" and retries < max_retries:
                     wait = min(backoff_base * (backoff_factor ** retries) + random.uniform(0, 1), max_backoff)
-                    print(
-                        f"[Retry] Throttling detectado. Esperando {wait:.2f}s antes de reintentar ({retries + 1}/{max_retries})")
+                    logger.warning(
+                        "[Retry] Throttling detectado. Esperando %.2fs antes de reintentar (%d/%d)",
+                        wait, retries + 1, max_retries,
+                    )
+                    if on_retry is not None:
+                        on_retry(code)
                     time.sleep(wait)
                     retries += 1
                     continue
@@ -137,8 +172,12 @@ class BedRockTransformerDocument(TransformDocumentPort):
             except (ReadTimeoutError, EndpointConnectionError, ConnectionClosedError, TimeoutError, BotoCoreError) as e:
                 if retries < max_retries:
                     wait = min(backoff_base * (backoff_factor ** retries) + random.uniform(0, 1), max_backoff)
-                    logging.warning(
-                        f"[Retry] Error transitorio '{e.__class__.__name__}'. Esperando {wait:.2f}s ({retries + 1}/{max_retries})")
+                    logger.warning(
+                        "[Retry] Error transitorio '%s'. Esperando %.2fs (%d/%d)",
+                        e.__class__.__name__, wait, retries + 1, max_retries,
+                    )
+                    if on_retry is not None:
+                        on_retry(e.__class__.__name__)
                     time.sleep(wait)
                     retries += 1
                     continue
@@ -1,16 +1,100 @@
+from functools import lru_cache
+
+from application.use_cases.backfill_documents import BackfillDocuments
 from application.use_cases.workflow_orchestator import WorkflowOrchestator
+from application.use_cases.workflows.stage_limits import StageLimits
+from application.ports.content_store_port import ContentStorePort
+from application.ports.extractor_document_port import ExtractorDocumentPort
+from application.ports.telemetry_port import TelemetryPort
+from infrastructure.adapters.checkpoints.checkpointer_factory import build_checkpointer
+from infrastructure.adapters.content_stores.in_memory_content_store import InMemoryContentStore
+from infrastructure.adapters.content_stores.temp_file_content_store import TempFileContentStore
+from infrastructure.adapters.extractors.pdf.pdf_text_extractor_document import PdfTextExtractorDocument
 from infrastructure.adapters.extractors.textract.textract_extractor_document import TextractExtractorDocument
 from infrastructure.adapters.loaders.dynamo_loader_document import DynamoLoaderMetadata
 from infrastructure.adapters.loaders.s3_loader_document import S3LoaderDocument
+from infrastructure.adapters.manifests.file_processed_manifest import FileProcessedManifest
+from infrastructure.adapters.notification.outbox_notification import OutboxNotification
 from infrastructure.adapters.notification.sqs_notification import SqsNotification
+from infrastructure.adapters.pollers.s3_poller_document import S3PollerDocument
+from infrastructure.adapters.replay.replay_factory import build_replay_clients
+from infrastructure.adapters.telemetry.telemetry_factory import build_telemetry
 from infrastructure.adapters.transformers.bed_rock_transformer_document import BedRockTransformerDocument
+from infrastructure.config.app_settings import (
+    ContentStoreSettings,
+    PipelineSettings,
+    get_app_settings,
+)
+
+
+def build_content_store(settings: ContentStoreSettings) -> ContentStorePort:
+    if settings.backend == "file":
+        return TempFileContentStore(settings.directory, settings.retention_hours * 3600)
+    return InMemoryContentStore()
+
+
+def build_stage_limits(settings: PipelineSettings) -> StageLimits:
+    return StageLimits(
+        extract_concurrency=settings.extract_concurrency,
+        transform_concurrency=settings.transform_concurrency,
+        load_concurrency=settings.load_concurrency,
+        max_documents=settings.max_documents,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_telemetry() -> TelemetryPort:
+    # Los providers de OpenTelemetry son globales: una sola instancia por proceso
+    return build_telemetry(get_app_settings().telemetry_settings)
 
 
 def build_workflow() -> WorkflowOrchestator:
-    extractor = TextractExtractorDocument()
-    transformer = BedRockTransformerDocument()
-    metadata_loader = DynamoLoaderMetadata()
-    document_loader = S3LoaderDocument()
+    app_settings = get_app_settings()
+    telemetry = get_telemetry()
+    textract_client, bedrock_client = build_replay_clients(
+        app_settings.replay_settings, app_settings.aws_settings.region
+    )
+    # Grabación y replay usan el mismo camino: los fixtures solo cubren la API
+    # asíncrona de Textract, así que no hay triage, API síncrona ni lectura directa de S3
+    direct = app_settings.replay_settings.mode == "off"
+    extractor: ExtractorDocumentPort = TextractExtractorDocument(
+        telemetry, textract_client, triage=direct, sync_api=direct
+    )
+    if app_settings.extractor_settings.backend == "pdf_text" and direct:
+        extractor = PdfTextExtractorDocument(extractor, telemetry)
+    transformer = BedRockTransformerDocument(telemetry, bedrock_client)
+    metadata_loader = DynamoLoaderMetadata(telemetry)
+    document_loader = S3LoaderDocument(telemetry)
+
+    sqs_settings = app_settings.sqs_settings
+    notification = OutboxNotification(
+        SqsNotification(telemetry),
+        batch_size=sqs_settings.batch_size,
+        flush_interval=sqs_settings.flush_interval,
+        telemetry=telemetry,
+    )
+    content_store = build_content_store(app_settings.content_store_settings)
+    checkpointer = build_checkpointer(app_settings.checkpoint_settings)
+    return WorkflowOrchestator(
+        extractor,
+        transformer,
+        metadata_loader,
+        document_loader,
+        notification,
+        content_store,
+        checkpointer,
+        build_stage_limits(app_settings.pipeline_settings),
+        telemetry,
+    )
+
 
-    notification = SqsNotification()
-    return WorkflowOrchestator(extractor, transformer, metadata_loader, document_loader, notification)
+def build_backfill() -> BackfillDocuments:
+    backfill_settings = get_app_settings().backfill_settings
+    return BackfillDocuments(
+        S3PollerDocument(get_telemetry()),
+        build_workflow(),
+        FileProcessedManifest(backfill_settings.manifest_path),
+        DynamoLoaderMetadata(get_telemetry()),
+        batch_size=backfill_settings.batch_size,
+        concurrent_batches=backfill_settings.concurrent_batches,
+    )
@@ -1,9 +1,10 @@
+import json
 import os
 from functools import lru_cache
 from typing import Literal
 
 from dotenv import load_dotenv
-from pydantic import BaseModel, Field, ValidationError
+from pydantic import BaseModel, Field, ValidationError, field_validator
 
 path_root = os.path.dirname(
     os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -24,6 +25,22 @@ class KafkaSettings(BaseModel):
     sasl_mechanism: str | None = Field(description="", default=None)
     sasl_username: str | None = Field(description="", default=None)
     sasl_password: str | None = Field(description="", default=None)
+    max_records: int = Field(description="Máximo de mensajes por cada getmany", default=10)
+    partition_buffer: int = Field(
+        description="Mensajes encolados por partición a partir de los cuales se pausa su consumo",
+        default=20,
+    )
+    dlq_topic: str | None = Field(
+        description="Tópico donde se publican los mensajes que no se pudieron procesar; obligatorio en el worker",
+        default=None,
+    )
+    max_attempts: int = Field(
+        description="Intentos de procesar un mensaje antes de enviarlo al DLQ", default=3
+    )
+    retry_backoff: float = Field(
+        description="Segundos de espera antes del primer reintento; se duplica en cada intento",
+        default=2.0,
+    )
 
 
 class AwsSettings(BaseModel):
@@ -42,10 +59,287 @@ class S3Settings(BaseModel):
 
 class TableSettings(BaseModel):
     si_table: str = Field(description="Tabla de supervised items en dynamo")
+    si_key_index: str = Field(
+        description="GSI de la tabla de supervised items por clave S3 del documento (backfill)",
+        default="key-index",
+    )
+    si_key_attribute: str = Field(
+        description="Atributo con la clave S3 del documento, partition key de `si_key_index`",
+        default="key",
+    )
 
 
 class SqsSettings(BaseModel):
     queue_url: str = Field(description="URL de la queue SQS")
+    batch_size: int = Field(
+        description="Cantidad de notificaciones que dispara el envío del outbox", default=10
+    )
+    flush_interval: float = Field(
+        description="Segundos máximos que una notificación espera en el outbox", default=0.5
+    )
+    stream_notifications: bool = Field(
+        description="Notifica cada documento apenas termina en lugar de al final del flujo",
+        default=True,
+    )
+    max_attempts: int = Field(
+        description="Intentos de envío de las entradas que SQS rechaza dentro de un lote", default=3
+    )
+    retry_backoff: float = Field(
+        description="Segundos de espera antes del primer reintento; se duplica en cada intento",
+        default=0.2,
+    )
+
+
+class ApiSettings(BaseModel):
+    host: str = Field(description="Interfaz donde escucha la API", default="0.0.0.0")
+    port: int = Field(description="Puerto de la API", default=9090)
+    reload: bool = Field(
+        description="Recarga al detectar cambios (solo desarrollo; fuerza un único worker)",
+        default=False,
+    )
+    workers: int = Field(
+        description="Procesos de uvicorn; por ahora solo 1: los jobs viven en memoria del "
+                    "proceso y los procesos comparten el socket, así que GET /jobs/{id} "
+                    "llegaría a un proceso que no conoce el job",
+        default=1,
+    )
+    loop: Literal["auto", "asyncio", "uvloop"] = Field(
+        description="Implementación del event loop", default="auto"
+    )
+    http: Literal["auto", "h11", "httptools"] = Field(
+        description="Implementación del protocolo HTTP", default="auto"
+    )
+    timeout_keep_alive: int = Field(
+        description="Segundos que se mantiene abierta una conexión keep-alive ociosa", default=75
+    )
+    backlog: int = Field(description="Conexiones pendientes máximas del socket", default=2048)
+    limit_concurrency: int | None = Field(
+        description="Conexiones concurrentes máximas antes de responder 503", default=None
+    )
+    max_concurrent_jobs: int = Field(
+        description="Jobs de /start-etl que se procesan en paralelo por proceso", default=4
+    )
+    max_queued_jobs: int = Field(
+        description="Jobs aceptados en espera de un worker; con la cola llena /start-etl responde 429",
+        default=100,
+    )
+    drain_timeout: float = Field(
+        description="Segundos que el apagado espera a los jobs en curso y en cola antes de cancelarlos",
+        default=120.0,
+    )
+    max_retained_jobs: int = Field(
+        description="Jobs terminados que se conservan en memoria para consulta", default=1000
+    )
+
+    @field_validator("workers")
+    @classmethod
+    def _single_worker(cls, workers: int) -> int:
+        # Sin un store de jobs compartido (ej: DynamoDB o Redis) cada proceso ve solo sus jobs
+        if workers != 1:
+            raise ValueError("API_WORKERS debe ser 1 mientras los jobs se guarden en memoria del proceso")
+        return workers
+
+
+class WorkerSettings(BaseModel):
+    processes: int = Field(
+        description="Cantidad de procesos worker que levanta el supervisor", default=1
+    )
+    max_concurrency: int = Field(
+        description="Documentos en vuelo por cada proceso worker", default=8
+    )
+    drain_timeout: float = Field(
+        description="Segundos que se espera a los documentos en proceso al detener el worker",
+        default=120.0,
+    )
+    heartbeat_interval: float = Field(
+        description="Segundos entre heartbeats de cada worker", default=5.0
+    )
+    health_timeout: float = Field(
+        description="Segundos sin heartbeat tras los cuales el supervisor reinicia el worker",
+        default=120.0,
+    )
+    max_restarts: int = Field(
+        description="Reinicios seguidos de un worker antes de que el supervisor se detenga con error",
+        default=5,
+    )
+    restart_backoff: float = Field(
+        description="Segundos de espera antes del primer reinicio; se duplica en cada falla seguida",
+        default=1.0,
+    )
+
+
+class ContentStoreSettings(BaseModel):
+    backend: Literal["memory", "file"] = Field(
+        description="Dónde se guarda el texto de los documentos entre etapas", default="memory"
+    )
+    directory: str | None = Field(
+        description="Directorio del backend file; por defecto un directorio temporal",
+        default=None,
+    )
+    retention_hours: int = Field(
+        description="Horas que se conserva el contenido de un documento no cargado en el backend file",
+        default=72,
+    )
+
+
+class CheckpointSettings(BaseModel):
+    backend: Literal["none", "memory", "sqlite"] = Field(
+        description="Almacén de checkpoints de los workflows por documento", default="none"
+    )
+    sqlite_path: str = Field(
+        description="Archivo SQLite de checkpoints cuando backend es sqlite",
+        default=".checkpoints/etl.sqlite",
+    )
+
+
+class PipelineSettings(BaseModel):
+    extract_concurrency: int = Field(
+        description="Documentos extrayéndose a la vez (Textract) en el proceso", default=4
+    )
+    transform_concurrency: int = Field(
+        description="Documentos transformándose a la vez (Bedrock) en el proceso", default=4
+    )
+    load_concurrency: int = Field(
+        description="Documentos cargándose a la vez (S3 y Dynamo) en el proceso", default=8
+    )
+    max_documents: int = Field(
+        description="Documentos de un mismo flujo que avanzan a la vez por el pipeline",
+        default=16,
+    )
+
+
+class ExtractorSettings(BaseModel):
+    backend: Literal["textract", "pdf_text"] = Field(
+        description="Extractor de documentos: textract, o pdf_text (capa de texto embebida, "
+                    "con Textract como respaldo)",
+        default="textract",
+    )
+    min_chars_per_page: int = Field(
+        description="Caracteres embebidos para considerar que una página tiene texto", default=100
+    )
+    min_text_ratio: float = Field(
+        description="Proporción mínima de páginas con texto para no pasar el documento a Textract",
+        default=1.0,
+    )
+    spool_max_bytes: int = Field(
+        description="Bytes del PDF que se mantienen en memoria; el resto se vuelca a disco",
+        default=16 * 1024 * 1024,
+    )
+
+
+# Features de Textract por DocumentType; una lista vacía usa DetectDocumentText (solo texto)
+DEFAULT_TEXTRACT_FEATURE_PROFILES: dict[str, list[str]] = {
+    "POLICY": ["TABLES", "LAYOUT"],
+    "APPRAISAL": ["TABLES", "LAYOUT"],
+    "REGISTRATION": [],
+    "DEFAULT": ["TABLES", "LAYOUT"],
+}
+
+
+class TextractSettings(BaseModel):
+    llm_context: Literal["text", "structured"] = Field(
+        description="Contenido que recibe el LLM: solo las líneas o secciones, tablas y campos",
+        default="structured",
+    )
+    table_format: Literal["markdown", "tsv"] = Field(
+        description="Formato de las tablas reconstruidas en el contexto estructurado",
+        default="markdown",
+    )
+    feature_profiles: dict[str, list[str]] = Field(
+        description="FeatureTypes por DocumentType (clave DEFAULT para el resto); "
+                    "lista vacía para extraer solo texto",
+        default_factory=lambda: dict(DEFAULT_TEXTRACT_FEATURE_PROFILES),
+    )
+    sync_max_bytes: int = Field(
+        description="Documentos de una página hasta este tamaño usan la API síncrona; 0 la desactiva",
+        default=5 * 1024 * 1024,
+    )
+
+    triage_document_types: list[str] = Field(
+        description="DocumentTypes cuyos PDFs se leen localmente antes del OCR para usar la "
+                    "capa de texto embebida; lista vacía lo desactiva",
+        default_factory=lambda: ["POLICY", "APPRAISAL"],
+    )
+    triage_min_chars: int = Field(
+        description="Caracteres de texto embebido a partir de los cuales una página no va a OCR",
+        default=100,
+    )
+    triage_max_bytes: int = Field(
+        description="PDFs más grandes que esto no se descargan para el triage", default=50 * 1024 * 1024
+    )
+    page_ranges: dict[str, str] = Field(
+        description="Páginas que se procesan por DocumentType, ej: {\"POLICY\": \"1-20\"}; "
+                    "sin entrada se procesan todas",
+        default_factory=dict,
+    )
+    staging_prefix: str = Field(
+        description="Prefijo del bucket donde se suben las páginas escaneadas para el job asíncrono",
+        default="tmp/textract/",
+    )
+
+    def features_for(self, document_type: str) -> list[str]:
+        return self.feature_profiles.get(document_type, self.feature_profiles.get("DEFAULT", []))
+
+
+class BackfillSettings(BaseModel):
+    manifest_path: str = Field(
+        description="Archivo con las claves ya procesadas que un backfill omite",
+        default=".backfill/manifest.txt",
+    )
+    batch_size: int = Field(description="Documentos por lote enviado al orquestador", default=50)
+    concurrent_batches: int = Field(
+        description="Lotes en vuelo a la vez; con más de uno el pipeline no se vacía entre lotes",
+        default=2,
+    )
+
+
+class PollerSettings(BaseModel):
+    list_concurrency: int = Field(
+        description="Carpetas del prefijo que se listan en paralelo en S3", default=8
+    )
+    cache_path: str | None = Field(
+        description="Archivo JSON con el listado por carpeta; sin valor no se usa caché",
+        default=None,
+    )
+    cache_ttl_seconds: int = Field(
+        description="Segundos durante los que el listado en caché de una carpeta se da por vigente",
+        default=3600,
+    )
+    cache_stable_days: int | None = Field(
+        description="Carpetas sin objetos modificados en estos días se sirven siempre desde la caché",
+        default=None,
+    )
+
+
+class TelemetrySettings(BaseModel):
+    backend: Literal["none", "memory", "otel"] = Field(
+        description="Destino de las métricas y trazas del pipeline", default="none"
+    )
+    service_name: str = Field(
+        description="Nombre del servicio en las métricas y trazas", default="sbs-suptech-etl"
+    )
+    prometheus_port: int | None = Field(
+        description="Puerto donde se exponen las métricas para Prometheus (backend otel)",
+        default=None,
+    )
+    otlp_endpoint: str | None = Field(
+        description="Endpoint OTLP/HTTP al que se envían los spans (backend otel)",
+        default=None,
+    )
+
+
+class ReplaySettings(BaseModel):
+    mode: Literal["off", "record", "replay"] = Field(
+        description="Graba las respuestas de Textract y Bedrock o las reproduce sin llamar a AWS",
+        default="off",
+    )
+    fixtures_dir: str = Field(
+        description="Directorio de los fixtures grabados", default=".fixtures"
+    )
+    speed: float = Field(
+        description="Velocidad de reproducción: 1 respeta los tiempos grabados, 0 no espera",
+        default=0.0,
+    )
 
 
 class AppSettings(BaseModel):
@@ -62,6 +356,50 @@ class AppSettings(BaseModel):
     kafka_settings: KafkaSettings = Field(
         description="Todas las configuraciones asociadas al kafka"
     )
+    content_store_settings: ContentStoreSettings = Field(
+        description="Configuración del almacén de contenido de los documentos",
+        default_factory=ContentStoreSettings,
+    )
+    checkpoint_settings: CheckpointSettings = Field(
+        description="Configuración de los checkpoints de los workflows",
+        default_factory=CheckpointSettings,
+    )
+    pipeline_settings: PipelineSettings = Field(
+        description="Concurrencia por etapa del pipeline de documentos",
+        default_factory=PipelineSettings,
+    )
+    extractor_settings: ExtractorSettings = Field(
+        description="Selección del extractor de documentos",
+        default_factory=ExtractorSettings,
+    )
+    textract_settings: TextractSettings = Field(
+        description="Configuración de la extracción con Textract",
+        default_factory=TextractSettings,
+    )
+    backfill_settings: BackfillSettings = Field(
+        description="Configuración del reprocesamiento masivo desde el bucket",
+        default_factory=BackfillSettings,
+    )
+    poller_settings: PollerSettings = Field(
+        description="Configuración del listado de documentos en el bucket",
+        default_factory=PollerSettings,
+    )
+    telemetry_settings: TelemetrySettings = Field(
+        description="Configuración de métricas y trazas",
+        default_factory=TelemetrySettings,
+    )
+    replay_settings: ReplaySettings = Field(
+        description="Grabación y reproducción de respuestas de Textract y Bedrock",
+        default_factory=ReplaySettings,
+    )
+    api_settings: ApiSettings = Field(
+        description="Configuración de la API HTTP",
+        default_factory=ApiSettings,
+    )
+    worker_settings: WorkerSettings = Field(
+        description="Configuración de los procesos worker de kafka",
+        default_factory=WorkerSettings,
+    )
 
     @classmethod
     def load(cls) -> "AppSettings":
@@ -79,9 +417,16 @@ class AppSettings(BaseModel):
                 ),
                 table_settings=TableSettings(
                     si_table=os.getenv("SUPERVISED_ITEMS_TABLE"),
+                    si_key_index=os.getenv("SUPERVISED_ITEMS_KEY_INDEX", "key-index"),
+                    si_key_attribute=os.getenv("SUPERVISED_ITEMS_KEY_ATTRIBUTE", "key"),
                 ),
                 sqs_settings=SqsSettings(
                     queue_url=os.getenv("NOTIFICATION_QUEUE_URL"),
+                    batch_size=int(os.getenv("NOTIFICATION_BATCH_SIZE", "10")),
+                    flush_interval=float(os.getenv("NOTIFICATION_FLUSH_INTERVAL", "0.5")),
+                    stream_notifications=os.getenv("NOTIFICATION_STREAMING", "true").lower() == "true",
+                    max_attempts=int(os.getenv("NOTIFICATION_MAX_ATTEMPTS", "3")),
+                    retry_backoff=float(os.getenv("NOTIFICATION_RETRY_BACKOFF", "0.2")),
                 ),
                 kafka_settings=KafkaSettings(
                     bootstrap_servers=os.getenv("AWS_KAFKA_BOOTSTRAP_SERVERS"),
@@ -91,9 +436,109 @@ class AppSettings(BaseModel):
                     sasl_mechanism=None,
                     sasl_username=None,
                     sasl_password=None,
+                    max_records=int(os.getenv("AWS_KAFKA_MAX_RECORDS", "10")),
+                    partition_buffer=int(os.getenv("AWS_KAFKA_PARTITION_BUFFER", "20")),
+                    dlq_topic=os.getenv("AWS_KAFKA_DLQ_TOPIC"),
+                    max_attempts=int(os.getenv("AWS_KAFKA_MAX_ATTEMPTS", "3")),
+                    retry_backoff=float(os.getenv("AWS_KAFKA_RETRY_BACKOFF", "2.0")),
+                ),
+                content_store_settings=ContentStoreSettings(
+                    backend=os.getenv("ETL_CONTENT_STORE_BACKEND", "memory"),
+                    directory=os.getenv("ETL_CONTENT_STORE_DIRECTORY"),
+                    retention_hours=int(os.getenv("ETL_CONTENT_STORE_RETENTION_HOURS", "72")),
+                ),
+                checkpoint_settings=CheckpointSettings(
+                    backend=os.getenv("ETL_CHECKPOINT_BACKEND", "none"),
+                    sqlite_path=os.getenv("ETL_CHECKPOINT_SQLITE_PATH", ".checkpoints/etl.sqlite"),
+                ),
+                pipeline_settings=PipelineSettings(
+                    extract_concurrency=int(os.getenv("ETL_PIPELINE_EXTRACT_CONCURRENCY", "4")),
+                    transform_concurrency=int(os.getenv("ETL_PIPELINE_TRANSFORM_CONCURRENCY", "4")),
+                    load_concurrency=int(os.getenv("ETL_PIPELINE_LOAD_CONCURRENCY", "8")),
+                    max_documents=int(os.getenv("ETL_PIPELINE_MAX_DOCUMENTS", "16")),
+                ),
+                extractor_settings=ExtractorSettings(
+                    backend=os.getenv("ETL_EXTRACTOR", "textract"),
+                    min_chars_per_page=int(os.getenv("ETL_PDF_TEXT_MIN_CHARS", "100")),
+                    min_text_ratio=float(os.getenv("ETL_PDF_TEXT_MIN_RATIO", "1.0")),
+                    spool_max_bytes=int(os.getenv("ETL_PDF_TEXT_SPOOL_BYTES", str(16 * 1024 * 1024))),
+                ),
+                textract_settings=TextractSettings(
+                    llm_context=os.getenv("ETL_TEXTRACT_LLM_CONTEXT", "structured"),
+                    table_format=os.getenv("ETL_TEXTRACT_TABLE_FORMAT", "markdown"),
+                    # JSON que se combina con los perfiles por defecto, ej: {"POLICY": ["TABLES"]}
+                    feature_profiles={
+                        **DEFAULT_TEXTRACT_FEATURE_PROFILES,
+                        **json.loads(os.getenv("ETL_TEXTRACT_FEATURE_PROFILES", "{}")),
+                    },
+                    sync_max_bytes=int(os.getenv("ETL_TEXTRACT_SYNC_MAX_BYTES", str(5 * 1024 * 1024))),
+                    triage_document_types=[
+                        value.strip()
+                        for value in os.getenv("ETL_TEXTRACT_TRIAGE_TYPES", "POLICY,APPRAISAL").split(",")
+                        if value.strip()
+                    ],
+                    triage_min_chars=int(os.getenv("ETL_TEXTRACT_TRIAGE_MIN_CHARS", "100")),
+                    triage_max_bytes=int(os.getenv("ETL_TEXTRACT_TRIAGE_MAX_BYTES", str(50 * 1024 * 1024))),
+                    page_ranges=json.loads(os.getenv("ETL_TEXTRACT_PAGE_RANGES", "{}")),
+                    staging_prefix=os.getenv("ETL_TEXTRACT_STAGING_PREFIX", "tmp/textract/"),
+                ),
+                backfill_settings=BackfillSettings(
+                    manifest_path=os.getenv("ETL_BACKFILL_MANIFEST", ".backfill/manifest.txt"),
+                    batch_size=int(os.getenv("ETL_BACKFILL_BATCH_SIZE", "50")),
+                    concurrent_batches=int(os.getenv("ETL_BACKFILL_CONCURRENT_BATCHES", "2")),
+                ),
+                poller_settings=PollerSettings(
+                    list_concurrency=int(os.getenv("ETL_POLLER_LIST_CONCURRENCY", "8")),
+                    cache_path=os.getenv("ETL_POLLER_CACHE_PATH"),
+                    cache_ttl_seconds=int(os.getenv("ETL_POLLER_CACHE_TTL_SECONDS", "3600")),
+                    cache_stable_days=(
+                        int(os.getenv("ETL_POLLER_CACHE_STABLE_DAYS"))
+                        if os.getenv("ETL_POLLER_CACHE_STABLE_DAYS") else None
+                    ),
+                ),
+                telemetry_settings=TelemetrySettings(
+                    backend=os.getenv("ETL_TELEMETRY_BACKEND", "none"),
+                    service_name=os.getenv("ETL_TELEMETRY_SERVICE_NAME", "sbs-suptech-etl"),
+                    prometheus_port=(
+                        int(os.getenv("ETL_TELEMETRY_PROMETHEUS_PORT"))
+                        if os.getenv("ETL_TELEMETRY_PROMETHEUS_PORT") else None
+                    ),
+                    otlp_endpoint=os.getenv("ETL_TELEMETRY_OTLP_ENDPOINT"),
+                ),
+                replay_settings=ReplaySettings(
+                    mode=os.getenv("ETL_REPLAY_MODE", "off"),
+                    fixtures_dir=os.getenv("ETL_REPLAY_FIXTURES_DIR", ".fixtures"),
+                    speed=float(os.getenv("ETL_REPLAY_SPEED", "0")),
+                ),
+                api_settings=ApiSettings(
+                    host=os.getenv("API_HOST", "0.0.0.0"),
+                    port=int(os.getenv("API_PORT", "9090")),
+                    reload=os.getenv("API_RELOAD", "false").lower() == "true",
+                    workers=int(os.getenv("API_WORKERS", "1")),
+                    loop=os.getenv("API_LOOP", "auto"),
+                    http=os.getenv("API_HTTP", "auto"),
+                    timeout_keep_alive=int(os.getenv("API_TIMEOUT_KEEP_ALIVE", "75")),
+                    backlog=int(os.getenv("API_BACKLOG", "2048")),
+                    limit_concurrency=(
+                        int(os.getenv("API_LIMIT_CONCURRENCY"))
+                        if os.getenv("API_LIMIT_CONCURRENCY") else None
+                    ),
+                    max_concurrent_jobs=int(os.getenv("API_MAX_CONCURRENT_JOBS", "4")),
+                    max_queued_jobs=int(os.getenv("API_MAX_QUEUED_JOBS", "100")),
+                    drain_timeout=float(os.getenv("API_DRAIN_TIMEOUT", "120")),
+                    max_retained_jobs=int(os.getenv("API_MAX_RETAINED_JOBS", "1000")),
+                ),
+                worker_settings=WorkerSettings(
+                    processes=int(os.getenv("ETL_WORKER_PROCESSES", "1")),
+                    max_concurrency=int(os.getenv("ETL_WORKER_CONCURRENCY", "8")),
+                    drain_timeout=float(os.getenv("ETL_WORKER_DRAIN_TIMEOUT", "120")),
+                    heartbeat_interval=float(os.getenv("ETL_WORKER_HEARTBEAT_INTERVAL", "5")),
+                    health_timeout=float(os.getenv("ETL_WORKER_HEALTH_TIMEOUT", "120")),
+                    max_restarts=int(os.getenv("ETL_WORKER_MAX_RESTARTS", "5")),
+                    restart_backoff=float(os.getenv("ETL_WORKER_RESTART_BACKOFF", "1")),
                 ),
             )
-        except (KeyError, ValidationError) as e:
+        except (KeyError, ValueError, ValidationError) as e:
             raise RuntimeError(f"Configuración invalidad: {e}") from e
 
 
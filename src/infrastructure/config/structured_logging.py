@@ -0,0 +1,101 @@
+import atexit
+import json
+import logging
+import queue
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any
+
+# Máximo de caracteres de cualquier texto que llega al log (mensajes, argumentos, extras)
+DEFAULT_MAX_FIELD_CHARS = 2000
+
+# Atributos propios de LogRecord; el resto son campos estructurados pasados con `extra`
+_RECORD_ATTRIBUTES = set(
+    logging.LogRecord("", logging.INFO, "", 0, "", None, None).__dict__
+) | {"message", "asctime", "taskName"}
+
+_SCALARS = (int, float, bool, type(None))
+
+
+def truncate_text(value: str, max_chars: int = DEFAULT_MAX_FIELD_CHARS) -> str:
+    if len(value) <= max_chars:
+        return value
+    return f"{value[:max_chars]}…(+{len(value) - max_chars} caracteres)"
+
+
+def _compact(value: Any, max_chars: int) -> Any:
+    """Deja los escalares como están y convierte todo lo demás a texto truncado."""
+    if isinstance(value, _SCALARS):
+        return value
+    return truncate_text(value if isinstance(value, str) else repr(value), max_chars)
+
+
+class StructuredFormatter(logging.Formatter):
+    """
+    Una línea JSON por registro: timestamp, nivel, logger, mensaje y los campos
+    pasados con `extra=`, todos con los textos truncados.
+    """
+
+    def __init__(self, max_field_chars: int = DEFAULT_MAX_FIELD_CHARS, **kwargs):
+        super().__init__(**kwargs)
+        self._max_field_chars = max_field_chars
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload: dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": truncate_text(record.getMessage(), self._max_field_chars),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                payload[key] = _compact(value, self._max_field_chars)
+        if record.exc_info:
+            payload["exception"] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class QueueLogHandler(QueueHandler):
+    """
+    Handler no bloqueante: el hilo que loguea solo arma el mensaje (ya truncado)
+    y lo encola; el formateo a JSON y la escritura al stream ocurren en un hilo
+    aparte (QueueListener). El formatter configurado se aplica en ese hilo.
+    """
+
+    def __init__(self, max_field_chars: int = DEFAULT_MAX_FIELD_CHARS, stream: Any = None):
+        super().__init__(queue.SimpleQueue())
+        self._max_field_chars = max_field_chars
+        self._target = logging.StreamHandler(stream or sys.stderr)
+        self._listener = QueueListener(self.queue, self._target, respect_handler_level=False)
+        self._listener.start()
+        self._stopped = False
+        atexit.register(self.close)
+
+    def setFormatter(self, fmt: logging.Formatter | None) -> None:
+        # dictConfig asigna el formatter al handler; se usa en el hilo de escritura
+        self._target.setFormatter(fmt)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Se resuelve el mensaje ahora (los argumentos pueden mutar después), pero
+        # truncando cada argumento para no copiar documentos completos
+        prepared = logging.makeLogRecord(record.__dict__)
+        if record.args:
+            args = record.args if isinstance(record.args, tuple) else (record.args,)
+            try:
+                prepared.msg = str(record.msg) % tuple(
+                    _compact(arg, self._max_field_chars) for arg in args
+                )
+            except (TypeError, ValueError):
+                prepared.msg = record.getMessage()
+        prepared.msg = truncate_text(str(prepared.msg), self._max_field_chars)
+        prepared.args = None
+        return prepared
+
+    def close(self) -> None:
+        if not self._stopped:
+            self._stopped = True
+            # Vacía la cola antes de cerrar el stream
+            self._listener.stop()
+            self._target.close()
+        super().close()
@@ -1,29 +1,37 @@
+import os
+
+# Nivel de los loggers de la app; el detalle por documento/hijo se loguea en DEBUG
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+# Máximo de caracteres de cada texto que llega al log
+LOG_MAX_FIELD_CHARS = int(os.getenv("LOG_MAX_FIELD_CHARS", "2000"))
+
 UVICORN_LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
     "formatters": {
-        "default": {
-            "format": "%(asctime)s - %(levelname)s - %(name)s - %(message)s",
-            "datefmt": "%Y-%m-%d %H:%M:%S",
-        },
-        "access": {
-            "format": "%(asctime)s - %(levelname)s - %(message)s",
-            "datefmt": "%Y-%m-%d %H:%M:%S"
+        "structured": {
+            "()": "infrastructure.config.structured_logging.StructuredFormatter",
+            "max_field_chars": LOG_MAX_FIELD_CHARS,
         },
-
     },
     "handlers": {
-        "default": {"class": "logging.StreamHandler", "formatter": "default"},
-        "access": {"class": "logging.StreamHandler", "formatter": "access"},
+        # Encola el registro y lo escribe desde un hilo aparte (no bloquea el event loop)
+        "default": {
+            "class": "infrastructure.config.structured_logging.QueueLogHandler",
+            "formatter": "structured",
+            "max_field_chars": LOG_MAX_FIELD_CHARS,
+        },
     },
     "loggers": {
-        "uvicorn": {"handlers": ["default"], "level": "INFO"},
+        "uvicorn": {"handlers": ["default"], "level": "INFO", "propagate": False},
         "uvicorn.error": {"level": "INFO"},
-        "uvicorn.access": {"handlers": ["access"], "level": "INFO", "propagate": False},
+        "uvicorn.access": {"handlers": ["default"], "level": "INFO", "propagate": False},
         # 👇 tus loggers de app:
-        "app": {"handlers": ["default"], "level": "INFO", "propagate": False},
-        "app.environment": {"handlers": ["default"], "level": "INFO", "propagate": False},
-        "app.workflows": {"handlers": ["default"], "level": "INFO", "propagate": False},
+        "app": {"handlers": ["default"], "level": LOG_LEVEL, "propagate": False},
+        "app.environment": {"level": LOG_LEVEL},
+        "app.workflows": {"level": LOG_LEVEL},
+        "app.notifications": {"level": LOG_LEVEL},
+        "app.adapters": {"level": LOG_LEVEL},
         "": {"handlers": ["default"], "level": "INFO"},
     },
 }
@@ -1,30 +1,54 @@
+import argparse
 import asyncio
+import logging
+import multiprocessing
 import signal
 import sys
+import time
 from logging.config import dictConfig
+from multiprocessing.sharedctypes import Synchronized
 
 import uvicorn
 
+from infrastructure.config.app_settings import get_app_settings
 from infrastructure.config.uvicorn_logging_settings import UVICORN_LOGGING
 
+app_logger = logging.getLogger("app.environment")
+
+# Un worker que corrió al menos este tiempo antes de morir vuelve a contar como primera falla
+_STABLE_UPTIME = 300.0
+_MAX_RESTART_BACKOFF = 60.0
+
 
 def run_api() -> None:
+    api_settings = get_app_settings().api_settings
     uvicorn.run(
         "presentation.controllers.http_controllers.fast_api_controller:app",
-        host="0.0.0.0",
-        port=9090,
-        reload=True,
+        host=api_settings.host,
+        port=api_settings.port,
+        reload=api_settings.reload,
+        workers=1 if api_settings.reload else api_settings.workers,
+        loop=api_settings.loop,
+        http=api_settings.http,
+        timeout_keep_alive=api_settings.timeout_keep_alive,
+        backlog=api_settings.backlog,
+        limit_concurrency=api_settings.limit_concurrency,
         log_level="info",
         log_config=UVICORN_LOGGING
     )
 
 
-async def run_worker() -> None:
+async def run_worker(heartbeat: Synchronized | None = None) -> None:
     from presentation.controllers.event_controllers.kafka_event_controller import KafkaEventController
 
-    max_conc = 8
-    controller = KafkaEventController(max_conc)
+    worker_settings = get_app_settings().worker_settings
+    controller = KafkaEventController(
+        worker_settings.max_concurrency, worker_settings.drain_timeout
+    )
     await controller.start()
+    heartbeat_task = asyncio.create_task(
+        _report_health(controller, heartbeat, worker_settings.heartbeat_interval)
+    )
     stop_event = asyncio.Event()
     loop = asyncio.get_running_loop()
 
@@ -36,13 +60,155 @@ async def run_worker() -> None:
             pass
 
     try:
-        await stop_event.wait()
+        # Termina por señal o si el loop de consumo se cae
+        stop_waiter = asyncio.create_task(stop_event.wait())
+        await asyncio.wait(
+            {stop_waiter, asyncio.create_task(controller.wait_closed())},
+            return_when=asyncio.FIRST_COMPLETED,
+        )
+        stop_waiter.cancel()
     except KeyboardInterrupt:
         pass
     finally:
+        heartbeat_task.cancel()
         await controller.stop()
 
 
+async def _report_health(controller, heartbeat: Synchronized | None, interval: float) -> None:
+    """Publica un heartbeat para el supervisor y deja en log las métricas del consumer."""
+    while True:
+        if heartbeat is not None:
+            heartbeat.value = time.time()
+        app_logger.debug(f"Worker activo - métricas: {dict(controller.metrics)}")
+        await asyncio.sleep(interval)
+
+
+async def run_backfill(argv: list[str]) -> None:
+    """
+    Reprocesa un prefijo del bucket sin mensajes de Kafka, ej:
+        python src/main.py backfill --prefix "Pólizas/" --flow POLICY --parent-id ... --session-id ...
+    """
+    from domain.models.enums.document_type import DocumentType
+    from infrastructure.bootstrap.container import build_backfill
+
+    parser = argparse.ArgumentParser(prog="main.py backfill")
+    parser.add_argument("--prefix", required=True, help="Prefijo a reprocesar, ej: 'Pólizas/'")
+    parser.add_argument("--flow", required=True, choices=[t.value for t in DocumentType])
+    parser.add_argument("--bucket", default=get_app_settings().s3_settings.bucket)
+    parser.add_argument("--session-id", required=True, help="Sesión existente a la que se asocian los documentos")
+    parser.add_argument("--parent-id", required=True, help="Registro padre existente de los documentos")
+    parser.add_argument("--limit", type=int, default=None, help="Máximo de documentos a procesar")
+    parser.add_argument(
+        "--notify",
+        action="store_true",
+        help="Envía la notificación insert-metadata de cada documento (por defecto no se notifica)",
+    )
+    args = parser.parse_args(argv)
+
+    backfill = build_backfill()
+    try:
+        report = await backfill.run(
+            args.bucket, args.prefix, DocumentType(args.flow), args.session_id, args.parent_id,
+            args.limit, notify=args.notify,
+        )
+    finally:
+        await backfill.aclose()
+    app_logger.info(f"Backfill: {report}")
+
+
+def _worker_process(heartbeat: Synchronized) -> None:
+    # Cada proceso arma su propio logging, adaptadores (clientes boto3) y consumer
+    dictConfig(UVICORN_LOGGING)
+    asyncio.run(run_worker(heartbeat))
+
+
+def run_supervisor() -> None:
+    """
+    Levanta N procesos worker en el mismo consumer group (Kafka reparte las
+    particiones entre ellos) y los reinicia si mueren o dejan de dar heartbeat.
+    Los reinicios esperan con backoff exponencial; si un worker falla más de
+    `max_restarts` veces seguidas (ej: configuración inválida o broker caído) el
+    supervisor detiene al resto y sale con error. SIGTERM/SIGINT se reenvían a
+    los workers para que drenen antes de salir.
+    """
+    worker_settings = get_app_settings().worker_settings
+    ctx = multiprocessing.get_context("spawn")
+    workers: dict[int, tuple[multiprocessing.Process, Synchronized, float]] = {}
+    failures: dict[int, int] = {}
+    restart_at: dict[int, float] = {}
+    stopping = False
+    exit_code = 0
+
+    def spawn(index: int) -> None:
+        heartbeat = ctx.Value("d", time.time())
+        process = ctx.Process(
+            target=_worker_process, args=(heartbeat,), name=f"etl-worker-{index}"
+        )
+        process.start()
+        workers[index] = (process, heartbeat, time.time())
+        app_logger.info(f"Worker {index} iniciado (pid={process.pid})")
+
+    def stop_workers() -> None:
+        nonlocal stopping
+        stopping = True
+        for process, _, _ in workers.values():
+            if process.is_alive() and process.pid is not None:
+                process.terminate()
+
+    def request_stop(signum, _frame) -> None:
+        stop_workers()
+
+    def schedule_restart(index: int, started_at: float) -> bool:
+        """Agenda el reinicio con backoff; False si el worker agotó sus reinicios."""
+        stable = time.time() - started_at >= _STABLE_UPTIME
+        failures[index] = 1 if stable else failures.get(index, 0) + 1
+        if failures[index] > worker_settings.max_restarts:
+            return False
+        delay = min(worker_settings.restart_backoff * 2 ** (failures[index] - 1), _MAX_RESTART_BACKOFF)
+        restart_at[index] = time.time() + delay
+        app_logger.warning(
+            f"Worker {index}: reinicio {failures[index]} de {worker_settings.max_restarts} en {delay:.1f}s"
+        )
+        return True
+
+    signal.signal(signal.SIGTERM, request_stop)
+    signal.signal(signal.SIGINT, request_stop)
+
+    for index in range(max(1, worker_settings.processes)):
+        spawn(index)
+
+    while not stopping:
+        time.sleep(1)
+        for index, (process, heartbeat, started_at) in list(workers.items()):
+            if stopping:
+                break
+            if not process.is_alive():
+                app_logger.error(f"Worker {index} terminó (exitcode={process.exitcode})")
+            elif time.time() - heartbeat.value > worker_settings.health_timeout:
+                app_logger.error(f"Worker {index} sin heartbeat")
+                process.kill()
+                process.join()
+            else:
+                continue
+            del workers[index]
+            if not schedule_restart(index, started_at):
+                app_logger.critical(
+                    f"Worker {index} falló {failures[index]} veces seguidas; se detiene el supervisor"
+                )
+                exit_code = 1
+                stop_workers()
+        for index, at in list(restart_at.items()):
+            if not stopping and time.time() >= at:
+                del restart_at[index]
+                spawn(index)
+
+    for index, (process, _, _) in workers.items():
+        process.join()
+        app_logger.info(f"Worker {index} detenido (exitcode={process.exitcode})")
+    if exit_code:
+        sys.exit(exit_code)
+
+
 def main() -> None:
     dictConfig(UVICORN_LOGGING)
     mode = "kafka"
@@ -53,8 +219,12 @@ def main() -> None:
         run_api()
     elif mode in ("worker", "event", "kafka"):
         asyncio.run(run_worker())
+    elif mode in ("supervisor", "workers"):
+        run_supervisor()
+    elif mode == "backfill":
+        asyncio.run(run_backfill(sys.argv[2:]))
     else:
-        sys.stderr.write(f"Modo desconocido: {mode}. Usa 'api' o 'worker'.\n")
+        sys.stderr.write(f"Modo desconocido: {mode}. Usa 'api', 'worker', 'supervisor' o 'backfill'.\n")
         sys.exit(2)
 
 
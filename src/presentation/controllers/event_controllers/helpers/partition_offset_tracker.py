@@ -0,0 +1,60 @@
+from collections import deque
+
+from aiokafka import TopicPartition
+
+
+class PartitionOffsetTracker:
+    """
+    Lleva los offsets en proceso por partición y calcula hasta dónde se puede
+    commitear: solo el prefijo contiguo de mensajes terminados (at-least-once).
+
+    Cada asignación de una partición es una generación distinta: `track` retorna
+    la generación vigente y `complete` ignora lo que llegue de una anterior, para
+    que un mensaje que terminó después de un revoke no marque como hecho el mismo
+    offset reentregado tras volver a asignarse la partición.
+    """
+
+    def __init__(self):
+        self._started: dict[TopicPartition, deque[int]] = {}
+        self._done: dict[TopicPartition, set[int]] = {}
+        self._committable: dict[TopicPartition, int] = {}
+        self._generations: dict[TopicPartition, int] = {}
+
+    def track(self, tp: TopicPartition, offset: int) -> int:
+        """Registra un mensaje despachado (en orden de offset por partición) y retorna su generación."""
+        self._started.setdefault(tp, deque()).append(offset)
+        self._done.setdefault(tp, set())
+        return self._generations.get(tp, 0)
+
+    def complete(self, tp: TopicPartition, offset: int, generation: int) -> None:
+        started = self._started.get(tp)
+        if started is None or generation != self._generations.get(tp, 0) or offset not in started:
+            # La partición fue revocada mientras el mensaje estaba en proceso
+            return
+        done = self._done[tp]
+        done.add(offset)
+        while started and started[0] in done:
+            finished = started.popleft()
+            done.discard(finished)
+            # Kafka espera el offset del próximo mensaje a leer
+            self._committable[tp] = finished + 1
+
+    def pending_commits(self) -> dict[TopicPartition, int]:
+        return dict(self._committable)
+
+    def mark_committed(self, offsets: dict[TopicPartition, int]) -> None:
+        for tp, offset in offsets.items():
+            if self._committable.get(tp) == offset:
+                del self._committable[tp]
+
+    def in_flight(self, tp: TopicPartition | None = None) -> int:
+        if tp is not None:
+            return len(self._started.get(tp, ()))
+        return sum(len(started) for started in self._started.values())
+
+    def discard(self, partitions: set[TopicPartition]) -> None:
+        for tp in partitions:
+            self._generations[tp] = self._generations.get(tp, 0) + 1
+            self._started.pop(tp, None)
+            self._done.pop(tp, None)
+            self._committable.pop(tp, None)
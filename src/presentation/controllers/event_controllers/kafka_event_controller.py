@@ -1,26 +1,62 @@
 import asyncio
-import json
 import logging
+from collections import Counter
 from typing import Any
 
-from aiokafka import AIOKafkaConsumer
+from aiokafka import (
+    AIOKafkaConsumer,
+    AIOKafkaProducer,
+    ConsumerRebalanceListener,
+    ConsumerRecord,
+    TopicPartition,
+)
 from pydantic import ValidationError
 
 from domain.models.enums.document_type import DocumentType
 from domain.models.states.document_contract_state import DocumentContractState
-from infrastructure.bootstrap.container import build_workflow
+from infrastructure.bootstrap.container import build_workflow, get_telemetry
 from infrastructure.config.app_settings import KafkaSettings, get_app_settings
+from presentation.controllers.event_controllers.helpers.partition_offset_tracker import (
+    PartitionOffsetTracker,
+)
 from presentation.dtos.requests.process_document import ProcessDocumentRequest
 
 app_logger = logging.getLogger("app.environment")
 
+# Tope de la espera entre reintentos (procesamiento y envío al DLQ)
+_MAX_BACKOFF = 60.0
+
+
+class _RebalanceListener(ConsumerRebalanceListener):
+    def __init__(self, controller: "KafkaEventController"):
+        self._controller = controller
+
+    async def on_partitions_revoked(self, revoked: set[TopicPartition]) -> None:
+        await self._controller._on_partitions_revoked(set(revoked))
+
+    async def on_partitions_assigned(self, assigned: set[TopicPartition]) -> None:
+        app_logger.info(f"Particiones asignadas: {sorted(str(tp) for tp in assigned)}")
+
 
 class KafkaEventController:
-    def __init__(self, max_concurrency: int = 8):
+    def __init__(self, max_concurrency: int = 8, drain_timeout: float = 120.0):
         self._wf = build_workflow()
+        self._drain_timeout = drain_timeout
         self._consumer: AIOKafkaConsumer | None = None
+        self._dlq_producer: AIOKafkaProducer | None = None
         self._stopping = asyncio.Event()
+        # Límite global de documentos en vuelo (todas las particiones)
         self._sem = asyncio.Semaphore(max_concurrency)
+        self._settings: KafkaSettings = get_app_settings().kafka_settings
+        self._loop_task: asyncio.Task | None = None
+        self._queues: dict[TopicPartition, asyncio.Queue[ConsumerRecord]] = {}
+        self._partition_workers: dict[TopicPartition, asyncio.Task] = {}
+        self._paused: set[TopicPartition] = set()
+        # Documentos en proceso y la partición de la que vienen
+        self._in_flight: dict[asyncio.Task, TopicPartition] = {}
+        self._offsets = PartitionOffsetTracker()
+        self.metrics: Counter[str] = Counter()
+        self._telemetry = get_telemetry()
 
     @staticmethod
     def _get_kafka_config() -> dict[str, Any]:
@@ -29,6 +65,8 @@ class KafkaEventController:
             "bootstrap_servers": k.bootstrap_servers,
             "group_id": k.group_id,
             "security_protocol": k.security_protocol,
+            # Los offsets se commitean a mano cuando el documento terminó
+            "enable_auto_commit": False,
         }
         return cfg
 
@@ -38,87 +76,319 @@ class KafkaEventController:
         return k.topic
 
     @staticmethod
-    async def create_consumer() -> AIOKafkaConsumer:
+    async def create_consumer(
+        listener: ConsumerRebalanceListener | None = None,
+    ) -> AIOKafkaConsumer:
         cfg = KafkaEventController._get_kafka_config()
         topic = KafkaEventController._get_kafka_topic()
-        consumer = AIOKafkaConsumer(topic, **cfg)
+        consumer = AIOKafkaConsumer(**cfg)
+        consumer.subscribe([topic], listener=listener)
         await consumer.start()
         return consumer
 
+    @staticmethod
+    async def create_dlq_producer() -> AIOKafkaProducer:
+        k: KafkaSettings = get_app_settings().kafka_settings
+        if not k.dlq_topic:
+            # Sin DLQ un mensaje que agotó sus reintentos solo podría descartarse (se pierde)
+            # o bloquear el commit de su partición: se exige configurarlo
+            raise RuntimeError("AWS_KAFKA_DLQ_TOPIC es obligatorio para el worker de Kafka")
+        producer = AIOKafkaProducer(
+            bootstrap_servers=k.bootstrap_servers,
+            security_protocol=k.security_protocol,
+        )
+        await producer.start()
+        return producer
+
     async def start(self) -> None:
-        self._consumer = await KafkaEventController.create_consumer()
-        asyncio.create_task(self._loop())
+        self._dlq_producer = await KafkaEventController.create_dlq_producer()
+        self._consumer = await KafkaEventController.create_consumer(
+            _RebalanceListener(self)
+        )
+        self._loop_task = asyncio.create_task(self._loop())
+        self._loop_task.add_done_callback(self._on_loop_done)
+
+    async def wait_closed(self) -> None:
+        """Espera a que termine el loop de consumo (por stop o por una falla)."""
+        if self._loop_task is not None:
+            await asyncio.wait({self._loop_task})
 
     async def stop(self) -> None:
+        """
+        Drenado: deja de hacer fetch, espera a los documentos en vuelo hasta
+        `drain_timeout`, commitea lo terminado y recién ahí cierra el consumer.
+        Lo que quedó en cola sin empezar se volverá a entregar a otro consumer.
+        """
+        if self._stopping.is_set():
+            return
         self._stopping.set()
+        if self._loop_task is not None:
+            await asyncio.wait({self._loop_task})
+
+        for worker in self._partition_workers.values():
+            worker.cancel()
+        if self._in_flight:
+            app_logger.info(f"Drenando {len(self._in_flight)} documentos en proceso")
+            _, pending = await asyncio.wait(
+                set(self._in_flight), timeout=self._drain_timeout
+            )
+            if pending:
+                app_logger.warning(
+                    f"Se agotó el tiempo de drenado; se cancelan {len(pending)} documentos"
+                )
+                for task in pending:
+                    task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+
         if self._consumer:
+            await self._commit_offsets()
             await self._consumer.stop()
+        if self._dlq_producer:
+            await self._dlq_producer.stop()
+        await self._wf.aclose()
 
     async def _loop(self) -> None:
+        """
+        Fetch continuo: los mensajes se reparten en colas por partición y el consumo
+        de una partición se pausa cuando su cola supera `partition_buffer`, sin
+        esperar a que terminen los documentos en proceso.
+        """
         c = self._consumer
         try:
             while not self._stopping.is_set():
-                batches = await c.getmany(timeout_ms=1000, max_records=10)
-                tasks = []
-                for _tp, msgs in batches.items():
-                    document_requests: list[ProcessDocumentRequest] = []
+                batches = await c.getmany(
+                    timeout_ms=1000, max_records=self._settings.max_records
+                )
+                for tp, msgs in batches.items():
+                    queue = self._get_partition_queue(tp)
                     for m in msgs:
-                        text = m.value.decode("utf-8", errors="ignore")
-                        data = json.loads(text) if text else {}
-                        print(data)
-                        process_document: ProcessDocumentRequest = (
-                            ProcessDocumentRequest.model_validate(data, by_alias=True)
-                        )
-                        document_requests.append(process_document)
-                    tasks.append(
-                        asyncio.create_task(
-                            self._handle(document_requests=document_requests)
-                        )
+                        queue.put_nowait(m)
+                    self._telemetry.adjust(
+                        "etl.kafka.queued", len(msgs), {"partition": str(tp.partition)}
                     )
-                if tasks:
-                    await asyncio.gather(*tasks, return_exceptions=True)
+                    if queue.qsize() >= self._settings.partition_buffer and tp not in self._paused:
+                        c.pause(tp)
+                        self._paused.add(tp)
+                await self._commit_offsets()
         finally:
-            await c.stop()
+            # El cierre del consumer lo hace `stop` una vez drenado
+            app_logger.info("Loop de consumo kafka detenido")
+
+    def _on_loop_done(self, task: asyncio.Task) -> None:
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is not None:
+            app_logger.critical(
+                "El loop de consumo kafka terminó por un error", exc_info=error
+            )
+
+    async def _commit_offsets(self) -> None:
+        offsets = self._offsets.pending_commits()
+        if not offsets:
+            return
+        try:
+            await self._consumer.commit(offsets)
+            self._offsets.mark_committed(offsets)
+        except Exception as e:
+            app_logger.error(f"Error commiteando offsets: {str(e)}")
+
+    async def _on_partitions_revoked(self, revoked: set[TopicPartition]) -> None:
+        # Se commitea lo terminado antes de ceder las particiones; lo que sigue en
+        # cola o en proceso se volverá a entregar al nuevo dueño, así que los
+        # documentos en vuelo de esas particiones se cancelan.
+        await self._commit_offsets()
+        cancelled = [task for task, tp in self._in_flight.items() if tp in revoked]
+        for task in cancelled:
+            task.cancel()
+        for tp in revoked:
+            worker = self._partition_workers.pop(tp, None)
+            if worker:
+                cancelled.append(worker)
+                worker.cancel()
+            queue = self._queues.pop(tp, None)
+            if queue is not None and queue.qsize():
+                self._telemetry.adjust(
+                    "etl.kafka.queued", -queue.qsize(), {"partition": str(tp.partition)}
+                )
+            self._paused.discard(tp)
+        self._offsets.discard(revoked)
+        if cancelled:
+            app_logger.info(f"Revoke: se cancelan {len(cancelled)} tareas de las particiones cedidas")
+            await asyncio.gather(*cancelled, return_exceptions=True)
 
-    async def _handle(self, document_requests: list[ProcessDocumentRequest]) -> None:
+    def _get_partition_queue(self, tp: TopicPartition) -> asyncio.Queue[ConsumerRecord]:
+        queue = self._queues.get(tp)
+        if queue is None:
+            queue = asyncio.Queue()
+            self._queues[tp] = queue
+            self._partition_workers[tp] = asyncio.create_task(
+                self._partition_worker(tp, queue)
+            )
+        return queue
+
+    async def _partition_worker(
+        self, tp: TopicPartition, queue: asyncio.Queue[ConsumerRecord]
+    ) -> None:
+        """Despacha los mensajes de una partición en orden, respetando el límite global."""
+        low_watermark = self._settings.partition_buffer // 2
+        while True:
+            m = await queue.get()
+            self._telemetry.adjust("etl.kafka.queued", -1, {"partition": str(tp.partition)})
+            process_document, error = self._decode(m)
+            if process_document is None:
+                generation = self._offsets.track(tp, m.offset)
+                if await self._dead_letter(m, f"invalid-message: {error}"):
+                    self._offsets.complete(tp, m.offset, generation)
+            else:
+                await self._sem.acquire()
+                generation = self._offsets.track(tp, m.offset)
+                task = asyncio.create_task(
+                    self._process_message(tp, m, process_document, generation)
+                )
+                self._in_flight[task] = tp
+                task.add_done_callback(self._on_message_done)
 
-        app_logger.info(f"Procesando mensajes", document_requests)
+            if tp in self._paused and queue.qsize() <= low_watermark:
+                self._consumer.resume(tp)
+                self._paused.discard(tp)
 
-        async with self._sem:
+    def _decode(
+        self, m: ConsumerRecord
+    ) -> tuple[ProcessDocumentRequest | None, str | None]:
+        """
+        Valida un mensaje de forma aislada (parser JSON de pydantic-core, sin pasar
+        por dict intermedio); uno inválido no afecta al resto.
+        """
+        try:
+            process_document = ProcessDocumentRequest.model_validate_json(
+                m.value or b"", by_alias=True
+            )
+            self._count("decoded")
+            return process_document, None
+        except ValidationError as e:
+            self._count("invalid")
+            error = f"{e.error_count()} errores - {e.errors()[0]['msg']}"
+            app_logger.warning(
+                f"Mensaje kafka inválido ({m.topic}:{m.partition}:{m.offset}): {error}"
+            )
+            return None, error
+
+    def _on_message_done(self, task: asyncio.Task) -> None:
+        self._in_flight.pop(task, None)
+        self._sem.release()
+
+    async def _process_message(
+        self,
+        tp: TopicPartition,
+        m: ConsumerRecord,
+        process_document: ProcessDocumentRequest,
+        generation: int,
+    ) -> None:
+        """
+        Procesa el mensaje con hasta `max_attempts` intentos y espera exponencial
+        entre ellos; con checkpoints cada reintento retoma desde la última etapa
+        terminada. Agotados los intentos el mensaje va al DLQ. Si el consumer se
+        detiene durante la espera, el offset queda sin commitear y el mensaje se
+        vuelve a entregar.
+        """
+        attempt = 1
+        while True:
+            with self._telemetry.timer("etl.kafka.message"):
+                success = await self._handle(document_requests=[process_document])
+            if success or attempt >= self._settings.max_attempts:
+                break
+            self._count("retried")
+            app_logger.warning(
+                f"Falló el mensaje {m.topic}:{m.partition}:{m.offset} "
+                f"(intento {attempt} de {self._settings.max_attempts}); se reintenta"
+            )
+            if not await self._backoff(attempt):
+                return
+            attempt += 1
+        self._count("processed" if success else "failed")
+        if success or await self._dead_letter(m, "processing-failed"):
+            self._offsets.complete(tp, m.offset, generation)
+
+    async def _backoff(self, attempt: int) -> bool:
+        """Espera antes del siguiente intento; retorna False si el consumer se está deteniendo."""
+        delay = min(self._settings.retry_backoff * 2 ** (attempt - 1), _MAX_BACKOFF)
+        try:
+            await asyncio.wait_for(self._stopping.wait(), timeout=delay)
+            return False
+        except asyncio.TimeoutError:
+            return True
+
+    def _count(self, outcome: str) -> None:
+        self.metrics[outcome] += 1
+        self._telemetry.increment("etl.kafka.messages", 1, {"outcome": outcome})
+
+    async def _dead_letter(self, m: ConsumerRecord, reason: str) -> bool:
+        """
+        Publica el mensaje original en el DLQ. Retorna True si su offset se puede
+        dar por terminado. Un envío fallido se reintenta con espera exponencial
+        mientras el consumer siga activo (el commit de la partición espera); si se
+        está deteniendo retorna False y el mensaje se volverá a entregar.
+        """
+        headers = [
+            ("dlq-reason", reason[:1024].encode("utf-8")),
+            ("dlq-origin", f"{m.topic}:{m.partition}:{m.offset}".encode("utf-8")),
+        ]
+        attempt = 1
+        while True:
             try:
-                documents_by_type: dict[DocumentType, list[DocumentContractState]] = (
-                    dict()
+                await self._dlq_producer.send_and_wait(
+                    self._settings.dlq_topic, value=m.value, key=m.key, headers=headers
                 )
-                for item in document_requests:
-                    document_contract_state = DocumentContractState(
-                        record_id=item.record_id,
-                        parent_id=item.parent_id,
-                        key=item.key,
-                        session_id=item.session_id,
-                        document_type=item.document_type,
-                        period_month=item.period_month,
-                        period_year=item.period_year,
-                    )
-                    if item.document_type not in documents_by_type:
-                        documents_by_type[item.document_type] = [
-                            document_contract_state
-                        ]
-                    else:
-                        documents_by_type[item.document_type].append(
-                            document_contract_state
-                        )
-
-                print(documents_by_type)
-                for [document_type, documents] in documents_by_type.items():
-                    app_logger.info(
-                        f"Ejecutando flow de: {document_type} - {len(documents)}"
-                    )
-                    result = await self._wf.execute(
-                        document_type=document_type, documents=documents
+                self._count("dead_lettered")
+                return True
+            except Exception as e:
+                app_logger.error(f"Error enviando mensaje al DLQ (intento {attempt}): {str(e)}")
+                if not await self._backoff(attempt):
+                    return False
+                attempt += 1
+
+    async def _handle(self, document_requests: list[ProcessDocumentRequest]) -> bool:
+
+        app_logger.info("Procesando %d mensajes", len(document_requests))
+
+        try:
+            documents_by_type: dict[DocumentType, list[DocumentContractState]] = (
+                dict()
+            )
+            for item in document_requests:
+                document_contract_state = DocumentContractState(
+                    record_id=item.record_id,
+                    parent_id=item.parent_id,
+                    key=item.key,
+                    session_id=item.session_id,
+                    document_type=item.document_type,
+                    period_month=item.period_month,
+                    period_year=item.period_year,
+                )
+                if item.document_type not in documents_by_type:
+                    documents_by_type[item.document_type] = [
+                        document_contract_state
+                    ]
+                else:
+                    documents_by_type[item.document_type].append(
+                        document_contract_state
                     )
-                return {"status": "success"}
 
-            except ValidationError as e:
-                app_logger.exception(f"Error de validación: {str(e)}")
-            except Exception as e:
-                app_logger.exception(f"Error procesando mensaje kafka {str(e)}")
+            completed = 0
+            for [document_type, documents] in documents_by_type.items():
+                app_logger.info(
+                    f"Ejecutando flow de: {document_type} - {len(documents)}"
+                )
+                results = await self._wf.execute(
+                    document_type=document_type, documents=documents
+                )
+                completed += len(results)
+            return completed == len(document_requests)
+
+        except ValidationError as e:
+            app_logger.exception(f"Error de validación: {str(e)}")
+            return False
+        except Exception as e:
+            app_logger.exception(f"Error procesando mensaje kafka {str(e)}")
+            return False
@@ -1,56 +1,103 @@
 import logging
-from fastapi import FastAPI, Depends
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Depends, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
+from application.use_cases.etl_job_manager import (
+    EtlJobManager,
+    JobManagerClosedError,
+    JobQueueFullError,
+)
 from application.use_cases.workflow_orchestator import WorkflowOrchestator
-from domain.models.enums.document_type import DocumentType
 from domain.models.states.document_contract_state import DocumentContractState
 
 from infrastructure.bootstrap.container import build_workflow
+from infrastructure.config.app_settings import get_app_settings
 
 from presentation.dtos.requests.process_document import (
-    ProcessDocumentRequest,
+    ProcessDocumentsRequest,
 )
 
-app = FastAPI(title="SBS ETL API")
-
 app_logger = logging.getLogger("app.environment")
 
 
-def get_factory() -> WorkflowOrchestator:
-    return build_workflow()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Adaptadores (clientes boto3 y sus pools) y grafos compilados se crean una
+    # sola vez por proceso y se comparten entre requests
+    api_settings = get_app_settings().api_settings
+    app.state.workflow = build_workflow()
+    app.state.jobs = EtlJobManager(
+        app.state.workflow,
+        max_concurrent_jobs=api_settings.max_concurrent_jobs,
+        max_retained_jobs=api_settings.max_retained_jobs,
+        max_queued_jobs=api_settings.max_queued_jobs,
+        drain_timeout=api_settings.drain_timeout,
+    )
+    app.state.jobs.start()
+    yield
+    await app.state.jobs.aclose()
+    await app.state.workflow.aclose()
 
 
-async def execute_workflows(
-    wf: WorkflowOrchestator,
-    documents_by_type: dict[DocumentType, list[DocumentContractState]],
-):
-    for [document_type, documents] in documents_by_type.items():
-        app_logger.info(f"Ejecutando flow de: {document_type} - {len(documents)}")
-        await wf.execute(document_type=document_type, documents=documents)
+app = FastAPI(title="SBS ETL API", lifespan=lifespan)
+
+
+def get_factory(request: Request) -> WorkflowOrchestator:
+    return request.app.state.workflow
+
+
+def get_jobs(request: Request) -> EtlJobManager:
+    return request.app.state.jobs
 
 
-@app.post("/start-etl")
+@app.post("/start-etl", status_code=status.HTTP_202_ACCEPTED)
 async def run_etl(
-    process_document: ProcessDocumentRequest,
-    wf: WorkflowOrchestator = Depends(get_factory),
+    process_document: ProcessDocumentsRequest,
+    jobs: EtlJobManager = Depends(get_jobs),
 ):
-    documents_by_type: dict[DocumentType, list[DocumentContractState]] = dict()
+    documents: list[DocumentContractState] = []
     for item in process_document.documents:
-        app_logger.info(f"Procesando documento", item)
-        document_contract_state = DocumentContractState(
-            record_id=item.record_id,
-            parent_id=item.parent_id,
-            key=item.key,
-            session_id=item.session_id,
-            document_type=item.document_type,
-            period_month=item.period_month,
-            period_year=item.period_year,
+        app_logger.info(f"Procesando documento {item.record_id}")
+        documents.append(
+            DocumentContractState(
+                record_id=item.record_id,
+                parent_id=item.parent_id,
+                key=item.key,
+                session_id=item.session_id,
+                document_type=item.document_type,
+                period_month=item.period_month,
+                period_year=item.period_year,
+            )
         )
-        if item.document_type not in documents_by_type:
-            documents_by_type[item.document_type] = [document_contract_state]
-        else:
-            documents_by_type[item.document_type].append(document_contract_state)
-
-    for [document_type, documents] in documents_by_type.items():
-        app_logger.info(f"Ejecutando flow de: {document_type} - {len(documents)}")
-        result = await wf.execute(document_type=document_type, documents=documents)
-    return {"status": "success"}
+
+    try:
+        job = jobs.submit(documents)
+    except JobQueueFullError as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail=str(e), headers={"Retry-After": "5"}
+        )
+    except JobManagerClosedError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
+    return {"status": job.status.value, "jobId": job.id}
+
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str, jobs: EtlJobManager = Depends(get_jobs)):
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job no encontrado")
+    return job.model_dump(mode="json", by_alias=True)
+
+
+@app.get("/jobs/{job_id}/events")
+async def stream_job(job_id: str, jobs: EtlJobManager = Depends(get_jobs)):
+    """Server-Sent Events con el estado del job en cada documento terminado."""
+    if jobs.get(job_id) is None:
+        raise HTTPException(status_code=404, detail="Job no encontrado")
+
+    async def events():
+        async for job in jobs.watch(job_id):
+            yield f"data: {job.model_dump_json(by_alias=True)}\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream")
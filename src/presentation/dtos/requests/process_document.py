@@ -10,4 +10,7 @@ class ProcessDocumentRequest(BaseModel):
     document_type: DocumentType = Field(..., alias="documentType")
     period_month: str = Field(..., alias="periodMonth")
     period_year: str = Field(..., alias="periodYear")
- 
+
+
+class ProcessDocumentsRequest(BaseModel):
+    documents: list[ProcessDocumentRequest] = Field(..., alias="documents")
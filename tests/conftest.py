@@ -0,0 +1,13 @@
+"""
+Los tests reutilizan el entorno y los fakes de los benchmarks: `src/` y
+`benchmarks/` van al path y `bench_env` completa las variables mínimas.
+"""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCHMARKS_PATH = os.path.join(ROOT, "benchmarks")
+if BENCHMARKS_PATH not in sys.path:
+    sys.path.insert(0, BENCHMARKS_PATH)
+
+import bench_env  # noqa: E402,F401
@@ -0,0 +1,94 @@
+import asyncio
+from typing import Any, Iterator
+
+from fakes import FakeExtractorDocument, FakeLoaderDocument, FakeNotification, FakeTransformerDocument
+
+from application.ports.poller_document_port import PollerDocumentPort
+from application.ports.processed_manifest_port import ProcessedManifestPort
+from application.use_cases.backfill_documents import BackfillDocuments
+from application.use_cases.workflow_orchestator import WorkflowOrchestator
+from domain.models.enums.document_type import DocumentType
+from domain.models.states.document_contract_state import DocumentContractState
+from infrastructure.adapters.content_stores.in_memory_content_store import InMemoryContentStore
+from infrastructure.adapters.loaders.dynamo_loader_document import DynamoLoaderMetadata
+
+
+class ListPoller(PollerDocumentPort):
+    def __init__(self, keys: list[str]):
+        self._keys = keys
+
+    def iter_file_names(self, bucket_name: str, prefix_path: str, flow: DocumentType,
+                        session_id: str, parent_id: str,
+                        document_type: str = "pdf") -> Iterator[DocumentContractState]:
+        for key in self._keys:
+            yield DocumentContractState(
+                record_id=f"synthetic-{key}",
+                parent_id=parent_id,
+                key=key,
+                session_id=session_id,
+                document_type=flow,
+                period_month="Mayo",
+                period_year="2024",
+            )
+
+
+class MemoryManifest(ProcessedManifestPort):
+    def __init__(self):
+        self.keys: set[str] = set()
+
+    def contains(self, key: str) -> bool:
+        return key in self.keys
+
+    def add(self, key: str) -> None:
+        self.keys.add(key)
+
+
+class SupervisedItemsTable:
+    """Tabla de supervised items con los dos GSI que usa DynamoLoaderMetadata."""
+
+    def __init__(self, items: list[dict[str, Any]]):
+        self.items = items
+        self.updates: list[dict[str, Any]] = []
+
+    def query(self, KeyConditionExpression, IndexName: str, Limit: int) -> dict[str, Any]:
+        attribute, value = KeyConditionExpression.get_expression()["values"]
+        matches = [item for item in self.items if item.get(attribute.name) == value]
+        return {"Items": matches[:Limit]}
+
+    def update_item(self, Key: dict[str, Any], **kwargs: Any) -> dict[str, Any]:
+        self.updates.append({"Key": Key, **kwargs})
+        return {}
+
+
+def test_backfill_loads_documents_into_their_existing_record():
+    table = SupervisedItemsTable([
+        {"id": "row-1", "supervisoryRecordId": "record-1", "key": "Pólizas/Mayo 2024/a.pdf", "metadata": {}},
+    ])
+    records = DynamoLoaderMetadata()
+    records.si_table = table
+    extractor = FakeExtractorDocument(pages=1)
+    orchestrator = WorkflowOrchestator(
+        extractor,
+        FakeTransformerDocument(),
+        records,
+        FakeLoaderDocument(),
+        FakeNotification(),
+        InMemoryContentStore(),
+    )
+    manifest = MemoryManifest()
+    backfill = BackfillDocuments(
+        ListPoller(["Pólizas/Mayo 2024/a.pdf", "Pólizas/Mayo 2024/sin-registro.pdf"]),
+        orchestrator,
+        manifest,
+        records,
+    )
+
+    report = asyncio.run(
+        backfill.run("bucket", "Pólizas/", DocumentType.POLICY, "session", "parent")
+    )
+
+    assert (report.discovered, report.unmatched, report.succeeded, report.failed) == (1, 1, 1, 0)
+    assert manifest.keys == {"Pólizas/Mayo 2024/a.pdf"}
+    assert [update["Key"] for update in table.updates] == [{"id": "row-1"}]
+    metadata = table.updates[0]["ExpressionAttributeValues"][":metadata"]
+    assert metadata["record_id"] == "record-1"